@@ -347,6 +347,16 @@ class GrantVotingController extends Controller
         $application = $this->votingService->getApplicationResults($applicationId);
         return response()->json($application ?: []);
     }
+    
+    /**
+     * API endpoint to get the results of several applications (?ids=1,2,3)
+     */
+    public function getApplicationsBatch(Request $request)
+    {
+        $ids = array_filter(array_map('intval', explode(',', $request->query('ids', ''))));
+        $results = $ids ? $this->votingService->getApplicationResultsBatch($ids) : [];
+        return response()->json(array_values($results ?: []));
+    }
 }
 
 // Additional Laravel Migration for local tracking (optional)
@@ -474,6 +484,7 @@ Route::prefix('admin/voting')->middleware(['auth', 'admin'])->name('voting.')->g
         Route::post('/members', [GrantVotingController::class, 'storeMember'])->name('members.store');
         Route::put('/members/{id}', [GrantVotingController::class, 'updateMember'])->name('members.update');
         Route::delete('/members/{id}', [GrantVotingController::class, 'deactivateMember'])->name('members.delete');
+        Route::get('/applications/batch', [GrantVotingController::class, 'getApplicationsBatch'])->name('applications.batch');
         Route::get('/applications/{id}', [GrantVotingController::class, 'getApplication'])->name('applications.get');
     });
 });
@@ -483,7 +494,11 @@ Route::prefix('admin/voting')->middleware(['auth', 'admin'])->name('voting.')->g
 
 return [
     'api_url' => env('VOTING_API_URL', 'http://localhost:5000'),
+    // Address browsers reach the API at, for the live tally stream (api_url may be internal)
+    'public_url' => env('VOTING_API_PUBLIC_URL', env('VOTING_API_URL', 'http://localhost:5000')),
+    'events_enabled' => env('VOTING_EVENTS_ENABLED', false), // as EVENTS_ENABLED of the API
     'timeout' => env('VOTING_API_TIMEOUT', 30),
+    'batch_size' => env('VOTING_API_BATCH_SIZE', 200), // ids per batch request, at most BATCH_MAX_IDS
     
     'grant_types' => [
         'STSM' => 'STSM',
@@ -566,7 +581,51 @@ class GrantVotingService
             return false;
         }
     }
-    
+
+    /**
+     * Import a whole call's worth of grant applications in one request
+     */
+    public function createVotingApplicationsBulk($applications)
+    {
+        try {
+            $payload = array_map(function ($data) {
+                return [
+                    'submitter_name' => $data['submitter_name'],
+                    'candidate_full_name' => $data['candidate_full_name'],
+                    'grant_type' => $data['grant_type'],
+                    'date' => $data['date'],
+                    'place' => $data['place'],
+                    'amount_requested' => floatval($data['amount_requested']),
+                    'currency' => $data['currency'] ?? 'EUR',
+                    'description' => $data['description'] ?? '',
+                    'voting_deadline' => date('Y-m-d H:i', strtotime($data['voting_deadline']))
+                ];
+            }, $applications);
+
+            $response = Http::timeout($this->timeout)->post($this->pythonApiUrl . '/api/applications/bulk', [
+                'applications' => $payload
+            ]);
+
+            if ($response->successful()) {
+                Log::info('Imported voting applications', [
+                    'count' => count($payload),
+                    'rows_per_second' => $response->json('rows_per_second')
+                ]);
+                return $response->json();
+            }
+
+            Log::error('Failed to import voting applications', [
+                'status' => $response->status(),
+                'response' => $response->body()
+            ]);
+            return false;
+
+        } catch (\Exception $e) {
+            Log::error('Error importing voting applications', ['error' => $e->getMessage()]);
+            return false;
+        }
+    }
+
     /**
      * Get application details and voting results
      */
@@ -595,6 +654,136 @@ class GrantVotingService
         }
     }
     
+    /**
+     * Get the details of many applications with one request per batch_size
+     * ids instead of one per application. Returns them keyed by id; ids the
+     * API does not know are left out.
+     */
+    public function getApplicationsBatch($applicationIds)
+    {
+        try {
+            $applications = [];
+            foreach (array_chunk(array_values(array_unique($applicationIds)), config('voting.batch_size', 200)) as $chunk) {
+                $response = Http::timeout($this->timeout)->get($this->pythonApiUrl . '/api/applications/batch', [
+                    'ids' => implode(',', $chunk)
+                ]);
+
+                if (!$response->successful()) {
+                    Log::error('Failed to get applications', ['ids' => $chunk, 'status' => $response->status()]);
+                    return false;
+                }
+
+                foreach ($response->json('applications') as $application) {
+                    $applications[$application['id']] = $application;
+                }
+            }
+            return $applications;
+
+        } catch (\Exception $e) {
+            Log::error('Error getting applications', ['error' => $e->getMessage()]);
+            return false;
+        }
+    }
+
+    /**
+     * Voting results of many applications, keyed by id. Results cached by
+     * getApplicationResults() are reused; the rest are fetched through
+     * /api/results/batch and cached the same way.
+     */
+    public function getApplicationResultsBatch($applicationIds)
+    {
+        try {
+            $applicationIds = array_values(array_unique($applicationIds));
+            $results = [];
+            $missing = [];
+            foreach ($applicationIds as $applicationId) {
+                $cached = Cache::get("voting_results_{$applicationId}");
+                if ($cached) {
+                    $results[$applicationId] = $cached;
+                } else {
+                    $missing[] = $applicationId;
+                }
+            }
+
+            foreach (array_chunk($missing, config('voting.batch_size', 200)) as $chunk) {
+                $response = Http::timeout($this->timeout)->get($this->pythonApiUrl . '/api/results/batch', [
+                    'ids' => implode(',', $chunk)
+                ]);
+
+                if (!$response->successful()) {
+                    Log::error('Failed to get application results', ['ids' => $chunk, 'status' => $response->status()]);
+                    return false;
+                }
+
+                $fetched = [];
+                foreach ($response->json('results') as $result) {
+                    $fetched["voting_results_{$result['application']['id']}"] = $result;
+                    $results[$result['application']['id']] = $result;
+                }
+                Cache::putMany($fetched, 300);
+            }
+
+            // In the order asked for
+            return array_replace(array_intersect_key(array_flip($applicationIds), $results), $results);
+
+        } catch (\Exception $e) {
+            Log::error('Error getting application results', ['error' => $e->getMessage()]);
+            return false;
+        }
+    }
+    
+    /**
+     * List applications with their vote summaries, one page at a time.
+     * Filters: grant_type, is_active, deadline_from, deadline_to, submitter,
+     * candidate (name prefix), sort (deadline|date), limit and cursor (the
+     * next_cursor of the previous page).
+     */
+    public function listApplications($filters = [])
+    {
+        try {
+            $response = Http::timeout($this->timeout)->get($this->pythonApiUrl . '/api/applications', $filters);
+
+            if ($response->successful()) {
+                return $response->json();
+            }
+
+            Log::error('Failed to list applications', [
+                'filters' => $filters,
+                'status' => $response->status()
+            ]);
+            return false;
+
+        } catch (\Exception $e) {
+            Log::error('Error listing applications', ['error' => $e->getMessage()]);
+            return false;
+        }
+    }
+
+    /**
+     * Full-text search over application texts, comments and rejection
+     * reasons. $kind restricts results to application, comment or rejection.
+     */
+    public function search($query, $kind = null)
+    {
+        try {
+            $response = Http::timeout($this->timeout)->get($this->pythonApiUrl . '/api/search', array_filter([
+                'q' => $query,
+                'kind' => $kind
+            ]));
+
+            if ($response->successful()) {
+                return $response->json()['results'];
+            }
+
+            Log::error('Search failed', ['query' => $query, 'status' => $response->status()]);
+            return false;
+
+        } catch (\Exception $e) {
+            Log::error('Error searching', ['error' => $e->getMessage()]);
+            return false;
+        }
+    }
+
     /**
      * Get all voting members with caching
      */
@@ -1009,7 +1198,7 @@ function viewResults(applicationId) {
                             <div class="col-md-3">
                                 <div class="card bg-success text-white">
                                     <div class="card-body text-center">
-                                        <h2>{{ $results['summary']['accept'] ?? 0 }}</h2>
+                                        <h2 id="summary-accept">{{ $results['summary']['accept'] ?? 0 }}</h2>
                                         <p class="mb-0">Accept Votes</p>
                                     </div>
                                 </div>
@@ -1017,7 +1206,7 @@ function viewResults(applicationId) {
                             <div class="col-md-3">
                                 <div class="card bg-danger text-white">
                                     <div class="card-body text-center">
-                                        <h2>{{ $results['summary']['reject'] ?? 0 }}</h2>
+                                        <h2 id="summary-reject">{{ $results['summary']['reject'] ?? 0 }}</h2>
                                         <p class="mb-0">Reject Votes</p>
                                     </div>
                                 </div>
@@ -1025,7 +1214,7 @@ function viewResults(applicationId) {
                             <div class="col-md-3">
                                 <div class="card bg-info text-white">
                                     <div class="card-body text-center">
-                                        <h2>{{ $results['summary']['voted'] ?? 0 }}/{{ $results['summary']['total_voters'] ?? 0 }}</h2>
+                                        <h2 id="summary-voted">{{ $results['summary']['voted'] ?? 0 }}/{{ $results['summary']['total_voters'] ?? 0 }}</h2>
                                         <p class="mb-0">Response Rate</p>
                                     </div>
                                 </div>
@@ -1155,6 +1344,19 @@ function viewResults(applicationId) {
         </div>
     </div>
 </div>
+
+@if(config('voting.events_enabled') && $results && isset($results['application']['id']))
+<script>
+// Live tally: the voting API pushes a 'tally' event after every vote
+const events = new EventSource('{{ rtrim(config('voting.public_url'), '/') }}/api/events/{{ $results['application']['id'] }}');
+events.addEventListener('tally', event => {
+    const summary = JSON.parse(event.data);
+    document.getElementById('summary-accept').textContent = summary.accept;
+    document.getElementById('summary-reject').textContent = summary.reject;
+    document.getElementById('summary-voted').textContent = summary.voted + '/' + summary.total_voters;
+});
+</script>
+@endif
 @endsection
 
 {{-- resources/views/admin/voting/members.blade.php --}}
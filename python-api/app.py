@@ -1,27 +1,387 @@
-from flask import Flask, request, jsonify, render_template_string
+from flask import (Blueprint, Flask, request, jsonify, make_response, abort, Response, stream_with_context, g,
+                   current_app, has_request_context)
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from flask_mail import Mail, Message
-from datetime import datetime
-import secrets
+import click
+from dotenv import load_dotenv
+from markupsafe import Markup
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import joinedload
+from sqlalchemy.schema import CreateTable
+from werkzeug.http import is_resource_modified
+from collections import Counter, OrderedDict, namedtuple
+from datetime import date, datetime, timedelta
+import asyncio
+import base64
+import csv
+import gzip
 import hashlib
+import html
+import heapq
+import io
+import itertools
+import json
+import math
+import operator
+import os
+import queue
+import random
+import re
+import secrets
+import smtplib
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+import zlib
 from enum import Enum
 
-app = Flask(__name__)
+# Optional speed-ups: without orjson dumps() uses the json module, without
+# brotli responses are only gzip-encoded
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+load_dotenv()
+
+def configure_app(app, config=None):
+    """Apply the defaults below (several read from the environment), then config on top"""
+    app.config['SECRET_KEY'] = 'your-secret-key-here'
+    
+    # Database: SQLite for single-worker setups, PostgreSQL (or any SQLAlchemy URL)
+    # when several Gunicorn workers write concurrently
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///voting_system.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_pre_ping': os.environ.get('DATABASE_POOL_PRE_PING', 'true').lower() == 'true'
+    }
+    app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    app.config['SQLITE_BUSY_TIMEOUT'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # milliseconds
+    
+    # Email configuration (configure according to your email service)
+    app.config['MAIL_SERVER'] = 'smtp.gmail.com'
+    app.config['MAIL_PORT'] = 587
+    app.config['MAIL_USE_TLS'] = True
+    app.config['MAIL_USERNAME'] = 'your-email@gmail.com'
+    app.config['MAIL_PASSWORD'] = 'your-email-password'
+    
+    # Link target of the voting emails
+    app.config['VOTING_BASE_URL'] = 'http://your-domain.com'
+    
+    # 'immediate' emails every ballot as it is issued; 'digest' leaves them for
+    # 'flask send-digest', which sends each member one email for all their ballots
+    app.config['NOTIFICATION_MODE'] = 'immediate'
+    
+    # Notification dispatch (0 workers sends inline, inside the request)
+    app.config['MAIL_DISPATCH_WORKERS'] = 2
+    app.config['MAIL_BATCH_SIZE'] = 50
+    app.config['MAIL_MAX_RETRIES'] = 3
+    app.config['MAIL_RETRY_BACKOFF'] = 2.0  # seconds, doubled after each failed attempt
+    
+    # Voting is closed and reminders are sent by an in-process deadline scheduler
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = True
+    app.config['REMINDER_OFFSETS_HOURS'] = [48, 6]  # reminders sent this long before the deadline
+    
+    # Rendered application-details fragments kept for the voting page
+    app.config['VOTE_PAGE_FRAGMENT_CACHE_SIZE'] = 1024
+    
+    # Application listing pagination
+    app.config['APPLICATIONS_PAGE_SIZE'] = 50
+    app.config['APPLICATIONS_MAX_PAGE_SIZE'] = 200
+    
+    # Ids accepted by one /api/applications/batch or /api/results/batch request
+    app.config['BATCH_MAX_IDS'] = 200
+    
+    # 'flask archive' moves applications finalized longer ago than this, with their
+    # ballots and comments, out of the working tables into archived_application
+    app.config['ARCHIVE_AFTER_DAYS'] = 365
+    app.config['ARCHIVE_BATCH_SIZE'] = 200  # applications moved per transaction
+    
+    # Server-Sent Events streams of tally changes and new comments (per worker).
+    # Each open stream holds a worker thread under Gunicorn, so enable them only
+    # with threaded (gthread) or ASGI workers; a sync worker would be blocked
+    app.config['EVENTS_ENABLED'] = os.environ.get('EVENTS_ENABLED', 'false').lower() == 'true'
+    app.config['EVENTS_HEARTBEAT_INTERVAL'] = 15  # seconds between keep-alive comments
+    # Open streams per worker; keep below the worker's threads (--threads) so other requests still get one
+    app.config['EVENTS_MAX_CONNECTIONS'] = int(os.environ.get('EVENTS_MAX_CONNECTIONS', 200))
+    app.config['EVENTS_QUEUE_SIZE'] = 100  # undelivered events before a slow client is dropped
+    app.config['EVENTS_POLL_INTERVAL'] = 2  # seconds; picks up writes made by other workers
+    app.config['EVENTS_ALLOW_ORIGIN'] = '*'  # dashboards served from another origin (the Laravel admin)
+    
+    # ASGI serving mode (uvicorn asgi:application): threads per worker running the
+    # synchronous Flask routes next to the natively async ones
+    app.config['ASGI_SYNC_THREADS'] = int(os.environ.get('ASGI_SYNC_THREADS', 32))
+    
+    # Full-text search results
+    app.config['SEARCH_PAGE_SIZE'] = 20
+    app.config['SEARCH_MAX_PAGE_SIZE'] = 100
+    
+    # Comments API pagination
+    app.config['COMMENTS_PAGE_SIZE'] = 20
+    app.config['COMMENTS_MAX_PAGE_SIZE'] = 100
+    
+    # Funding analytics: amounts are converted to FUNDING_BASE_CURRENCY with this
+    # local rate table (base currency units per unit); other currencies are
+    # reported but left out of the converted totals
+    app.config['FUNDING_BASE_CURRENCY'] = 'EUR'
+    app.config['FUNDING_EXCHANGE_RATES'] = {'EUR': 1.0, 'USD': 0.92, 'GBP': 1.17, 'CHF': 1.05, 'TRY': 0.028}
+    app.config['FUNDING_PERCENTILES'] = [50, 90]  # of the converted requested amounts, per group
+    
+    # Response compression: JSON and HTML bodies of at least COMPRESS_MIN_SIZE bytes
+    # are brotli- or gzip-encoded, whichever the client's Accept-Encoding prefers.
+    # Streamed responses (the export, event streams) are sent as they are.
+    app.config['COMPRESS_ENABLED'] = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    app.config['COMPRESS_MIN_SIZE'] = 1024  # bytes
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+    app.config['COMPRESS_GZIP_LEVEL'] = 6
+    app.config['COMPRESS_BROTLI_QUALITY'] = 5
+    
+    # Rows fetched per round trip by the streaming results export
+    app.config['EXPORT_BATCH_SIZE'] = 1000
+    
+    # Token -> ballot resolution cache used by the token endpoints
+    app.config['TOKEN_CACHE_SIZE'] = 10000
+    app.config['TOKEN_CACHE_TTL'] = 300  # seconds
+    
+    # Token-bucket rate limits of the public token endpoints: (burst, refills per
+    # second) per client IP and per voting token. The 'memory' backend counts in
+    # each worker, 'sqlite' shares the buckets between the workers of one host
+    app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    app.config['RATE_LIMIT_BACKEND'] = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    app.config['RATE_LIMIT_SQLITE_PATH'] = os.environ.get('RATE_LIMIT_SQLITE_PATH',
+                                                          os.path.join(app.instance_path, 'rate_limits.db'))
+    app.config['RATE_LIMIT_CLIENT_IP_HEADER'] = os.environ.get('RATE_LIMIT_CLIENT_IP_HEADER')  # X-Real-IP behind nginx
+    app.config['RATE_LIMIT_MAX_KEYS'] = 100000  # buckets kept per worker by the memory backend
+    app.config['RATE_LIMITS'] = {
+        'vote_page': {'ip': (60, 1.0), 'token': (30, 0.5)},
+        'submit_vote': {'ip': (30, 0.5), 'token': (10, 0.1)},
+        'add_comment': {'ip': (20, 0.2), 'token': (10, 0.05)}
+    }
+    
+    # Opt-in instrumentation: latency histograms, SQL and mail timings under /metrics
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    app.config['METRICS_LATENCY_BUCKETS'] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]  # seconds
+    
+    # Sampling profiler writing collapsed stacks (flamegraph.pl / speedscope input)
+    # of every request slower than the threshold
+    app.config['PROFILE_SLOW_REQUESTS'] = os.environ.get('PROFILE_SLOW_REQUESTS', 'false').lower() == 'true'
+    app.config['PROFILE_SLOW_THRESHOLD'] = float(os.environ.get('PROFILE_SLOW_THRESHOLD', 0.5))  # seconds
+    app.config['PROFILE_SAMPLE_INTERVAL'] = 0.005  # seconds
+    app.config['PROFILE_OUTPUT_DIR'] = os.environ.get('PROFILE_OUTPUT_DIR', 'profiles')
+    
+    app.config.update(config or {})
+    if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': int(os.environ.get('DATABASE_POOL_SIZE', 5)),
+            'max_overflow': int(os.environ.get('DATABASE_MAX_OVERFLOW', 10)),
+            'pool_recycle': int(os.environ.get('DATABASE_POOL_RECYCLE', 1800)),  # seconds
+            **app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        }
+
+db = SQLAlchemy()
+
+def sqlite_connection_setup(journal_mode, busy_timeout):
+    """'connect' listener for a SQLite engine: lets readers and writers from several workers proceed concurrently"""
+    def configure_sqlite_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA busy_timeout={busy_timeout}")
+        if journal_mode.upper() == 'WAL':
+            cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+    return configure_sqlite_connection
 
-# Configuration
-app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///voting_system.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+class Histogram:
+    """Cumulative Prometheus histogram, one series per label tuple"""
+    
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series = {}
+    
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+    
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self.series.items()):
+            base = ','.join(f'{k}="{v}"' for k, v in zip(self.label_names, labels))
+            sep = ',' if base else ''
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{base}}} {series[-2]}')
+            lines.append(f'{self.name}_count{{{base}}} {series[-1]}')
+        return lines
+
+class Metrics:
+    """Process-local request, SQL and mail metrics rendered in Prometheus text format.
+    
+    Every Gunicorn worker keeps its own numbers; scrape each worker or run
+    the scraper against a single-worker deployment.
+    """
+    
+    def __init__(self):
+        self.app = None  # set by init_app()
+        self.lock = threading.Lock()
+    
+    def init_app(self, app):
+        self.app = app
+        latency_buckets = app.config['METRICS_LATENCY_BUCKETS']
+        self.request_latency = Histogram('voting_http_request_duration_seconds', 'Request latency by endpoint.',
+                                         ('endpoint', 'method'), latency_buckets)
+        self.request_queries = Histogram('voting_sql_queries_per_request', 'SQL statements executed per request.',
+                                         ('endpoint',), [1, 2, 5, 10, 20, 50, 100])
+        self.mail_latency = Histogram('voting_mail_send_duration_seconds', 'Time spent sending one email.',
+                                      ('kind',), latency_buckets)
+        self.requests = Counter()  # (endpoint, method, status)
+        self.sql_queries = Counter()  # endpoint ('background' outside requests)
+        self.sql_seconds = Counter()
+        self.mail_sent = Counter()  # (kind, result)
+    
+    def observe_request(self, endpoint, method, status, seconds, queries, query_seconds):
+        with self.lock:
+            self.request_latency.observe((endpoint, method), seconds)
+            self.request_queries.observe((endpoint,), queries)
+            self.requests[(endpoint, method, status)] += 1
+            self.sql_queries[endpoint] += queries
+            self.sql_seconds[endpoint] += query_seconds
+    
+    def observe_query(self, endpoint, seconds):
+        with self.lock:
+            self.sql_queries[endpoint] += 1
+            self.sql_seconds[endpoint] += seconds
+    
+    def observe_mail(self, kind, seconds, ok):
+        with self.lock:
+            self.mail_latency.observe((kind,), seconds)
+            self.mail_sent[(kind, 'sent' if ok else 'failed')] += 1
+    
+    def render(self):
+        with self.lock:
+            lines = self.request_latency.render()
+            lines += ['# HELP voting_http_requests_total Requests by endpoint and status.',
+                      '# TYPE voting_http_requests_total counter']
+            lines += [f'voting_http_requests_total{{endpoint="{e}",method="{m}",status="{s}"}} {n}'
+                      for (e, m, s), n in sorted(self.requests.items())]
+            lines += self.request_queries.render()
+            lines += ['# HELP voting_sql_queries_total SQL statements executed.',
+                      '# TYPE voting_sql_queries_total counter']
+            lines += [f'voting_sql_queries_total{{endpoint="{e}"}} {n}' for e, n in sorted(self.sql_queries.items())]
+            lines += ['# HELP voting_sql_query_seconds_total Time spent executing SQL statements.',
+                      '# TYPE voting_sql_query_seconds_total counter']
+            lines += [f'voting_sql_query_seconds_total{{endpoint="{e}"}} {n}' for e, n in sorted(self.sql_seconds.items())]
+            lines += self.mail_latency.render()
+            lines += ['# HELP voting_mail_sent_total Emails handed to the SMTP server.',
+                      '# TYPE voting_mail_sent_total counter']
+            lines += [f'voting_mail_sent_total{{kind="{k}",result="{r}"}} {n}'
+                      for (k, r), n in sorted(self.mail_sent.items())]
+        return '\n'.join(lines) + '\n'
 
-# Email configuration (configure according to your email service)
-app.config['MAIL_SERVER'] = 'smtp.gmail.com'
-app.config['MAIL_PORT'] = 587
-app.config['MAIL_USE_TLS'] = True
-app.config['MAIL_USERNAME'] = 'your-email@gmail.com'
-app.config['MAIL_PASSWORD'] = 'your-email-password'
+metrics = Metrics()
 
-db = SQLAlchemy(app)
-mail = Mail(app)
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if metrics.app is not None and metrics.app.config['METRICS_ENABLED']:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    finish_query_timer(conn)
+
+@event.listens_for(Engine, 'handle_error')
+def stop_failed_query_timer(context):
+    # A failed statement gets no after_cursor_execute; its start time must not stay on the pooled connection
+    if context.connection is not None and context.execution_context is not None:
+        finish_query_timer(context.connection)
+
+def finish_query_timer(conn):
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if has_request_context() and 'sql_queries' in g:
+        g.sql_queries += 1
+        g.sql_seconds += elapsed
+    else:
+        metrics.observe_query('background', elapsed)
+
+class SlowRequestProfiler:
+    """Sampling profiler that dumps collapsed stacks of slow requests.
+    
+    One daemon thread samples the stack of every thread that is serving a
+    request each PROFILE_SAMPLE_INTERVAL. When a request took longer than
+    PROFILE_SLOW_THRESHOLD its samples are written to PROFILE_OUTPUT_DIR as
+    "frame;frame;frame count" lines, ready for flamegraph.pl or speedscope.
+    """
+    
+    def __init__(self):
+        self.app = None  # set by init_app()
+        self.lock = threading.Lock()
+        self.active = {}  # thread id -> Counter of collapsed stacks
+        self.thread = None
+    
+    def init_app(self, app):
+        self.app = app
+    
+    def begin(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='slow-request-profiler', daemon=True)
+                self.thread.start()
+            self.active[threading.get_ident()] = Counter()
+    
+    def end(self, label, seconds):
+        with self.lock:
+            samples = self.active.pop(threading.get_ident(), None)
+        if not samples or seconds < self.app.config['PROFILE_SLOW_THRESHOLD']:
+            return
+        
+        output_dir = self.app.config['PROFILE_OUTPUT_DIR']
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{label}-{seconds * 1000:.0f}ms.folded")
+        with open(path, 'w') as f:
+            for stack, count in samples.most_common():
+                f.write(f'{stack} {count}\n')
+    
+    @staticmethod
+    def collapse(frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(stack))
+    
+    def _run(self):
+        interval = self.app.config['PROFILE_SAMPLE_INTERVAL']
+        while True:
+            time.sleep(interval)
+            frames = sys._current_frames()
+            with self.lock:
+                for thread_id, samples in self.active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[self.collapse(frame)] += 1
+
+profiler = SlowRequestProfiler()
 
 class GrantType(Enum):
     STSM = "STSM"
@@ -33,6 +393,17 @@ class VoteType(Enum):
     ACCEPT = "Accept"
     REJECT = "Reject"
 
+class BallotState(Enum):
+    ISSUED = "Issued"  # token sent, member has not voted yet
+    CAST = "Cast"
+    EXPIRED = "Expired"  # deadline passed without a vote
+
+class Outcome(Enum):
+    ACCEPTED = "Accepted"
+    REJECTED = "Rejected"
+    TIED = "Tied"  # as many accepts as rejects, at least one of each
+    NO_VOTES = "No votes"  # nobody voted before the deadline
+
 # Database Models
 class VotingMember(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -43,6 +414,19 @@ class VotingMember(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class GrantApplication(db.Model):
+    # Back the filtered application listing: each index serves a filter and sort that
+    # would otherwise scan the table (100k applications: 50-250 ms instead of < 1 ms)
+    __table_args__ = (
+        db.Index('ix_application_active_deadline', 'is_active', 'voting_deadline'),
+        db.Index('ix_application_type_date', 'grant_type', 'date'),
+        db.Index('ix_application_type_deadline', 'grant_type', 'voting_deadline'),
+        db.Index('ix_application_deadline', 'voting_deadline'),  # no filter or a deadline range
+        db.Index('ix_application_date', 'date'),  # no filter, sorted by date; also is_active sorted by date
+        db.Index('ix_application_submitter', 'submitter_name'),
+        db.Index('ix_application_candidate_lower', db.func.lower(db.text('candidate_full_name'))),
+        db.Index('ix_application_updated', 'updated_at'),  # funding analytics cache check
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     reference_code = db.Column(db.String(20), nullable=False, unique=True)
     submitter_name = db.Column(db.String(100), nullable=False)
@@ -54,27 +438,67 @@ class GrantApplication(db.Model):
     currency = db.Column(db.String(10), default='EUR')
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     voting_deadline = db.Column(db.DateTime, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
+    reminders_sent = db.Column(db.Integer, nullable=False, default=0)  # REMINDER_OFFSETS_HOURS handled so far
+    finalized_at = db.Column(db.DateTime)
+    outcome = db.Column(db.Enum(Outcome))
     
     votes = db.relationship('Vote', backref='application', lazy=True)
 
 class Vote(db.Model):
+    # Pending-ballot lookups and per-application tallies both filter on this pair
+    __table_args__ = (db.Index('ix_vote_application_state', 'application_id', 'state'),)
+    
     id = db.Column(db.Integer, primary_key=True)
     application_id = db.Column(db.Integer, db.ForeignKey('grant_application.id'), nullable=False)
     voter_id = db.Column(db.Integer, db.ForeignKey('voting_member.id'), nullable=False)
-    vote_type = db.Column(db.Enum(VoteType), nullable=False)
+    state = db.Column(db.Enum(BallotState), nullable=False, default=BallotState.ISSUED)
+    vote_type = db.Column(db.Enum(VoteType))  # set once the ballot is cast
     rejection_reason = db.Column(db.Text)
     token = db.Column(db.String(64), nullable=False, unique=True)
-    voted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    voted_at = db.Column(db.DateTime)
+    delivery_status = db.Column(db.String(10), default='queued')  # queued, sent or failed
+    delivery_attempts = db.Column(db.Integer, default=0)
+    delivery_error = db.Column(db.Text)
+    delivered_at = db.Column(db.DateTime)
+    version = db.Column(db.Integer, nullable=False, default=0)  # bumped by every submission
     
     voter = db.relationship('VotingMember', backref='votes')
 
+class ApplicationTally(db.Model):
+    """Denormalized vote counts per application, kept current by submit_vote"""
+    application_id = db.Column(db.Integer, db.ForeignKey('grant_application.id'), primary_key=True)
+    accept = db.Column(db.Integer, nullable=False, default=0)
+    reject = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    last_vote_at = db.Column(db.DateTime, index=True)  # max() is part of the funding analytics fingerprint
+
+class VoteChange(db.Model):
+    """Audit trail: one row per accepted vote submission, including changed votes"""
+    # A retried submission with the same Idempotency-Key maps to the same row
+    __table_args__ = (db.UniqueConstraint('vote_id', 'idempotency_key', name='uq_vote_change_idempotency'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    vote_id = db.Column(db.Integer, db.ForeignKey('vote.id'), nullable=False, index=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('grant_application.id'), nullable=False)
+    previous_vote_type = db.Column(db.Enum(VoteType))  # None for the first vote on the ballot
+    vote_type = db.Column(db.Enum(VoteType), nullable=False)
+    rejection_reason = db.Column(db.Text)
+    version = db.Column(db.Integer, nullable=False)  # Vote.version after this submission
+    idempotency_key = db.Column(db.String(100))
+    changed_at = db.Column(db.DateTime, nullable=False)
+
 class Comment(db.Model):
+    # Backs keyset pagination of an application's discussion
+    __table_args__ = (db.Index('ix_comment_application_created', 'application_id', 'created_at'),)
+    
     id = db.Column(db.Integer, primary_key=True)
     application_id = db.Column(db.Integer, db.ForeignKey('grant_application.id'), nullable=False)
     voter_id = db.Column(db.Integer, db.ForeignKey('voting_member.id'), nullable=False)
-    parent_comment_id = db.Column(db.Integer, db.ForeignKey('comment.id'))
+    parent_comment_id = db.Column(db.Integer, db.ForeignKey('comment.id'), index=True)
     content = db.Column(db.Text, nullable=False)
     is_supportive = db.Column(db.Boolean)  # True for support, False for opposition
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -83,62 +507,1724 @@ class Comment(db.Model):
     application = db.relationship('GrantApplication', backref='comments')
     replies = db.relationship('Comment', backref=db.backref('parent', remote_side=[id]))
 
+class ArchivedApplication(db.Model):
+    """A finalized application moved out of the working tables by archive_applications().
+
+    payload holds the zlib-compressed JSON of every row the application
+    owned (application, tally, ballots, vote changes, comments and a
+    snapshot of the voters' names); the columns next to it are the ones
+    searched, exported and aggregated without unpacking it.
+    """
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # the application's own id
+    reference_code = db.Column(db.String(20), nullable=False, unique=True)
+    candidate_full_name = db.Column(db.String(100), nullable=False)
+    grant_type = db.Column(db.Enum(GrantType), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    place = db.Column(db.String(200), nullable=False)
+    amount_requested = db.Column(db.Float, nullable=False)
+    currency = db.Column(db.String(10))
+    outcome = db.Column(db.Enum(Outcome))
+    accept = db.Column(db.Integer, nullable=False)
+    reject = db.Column(db.Integer, nullable=False)
+    finalized_at = db.Column(db.DateTime, nullable=False)
+    last_vote_at = db.Column(db.DateTime, index=True)  # lets /api/results/export?since= skip whole archives
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    payload = db.Column(db.LargeBinary, nullable=False)
+
 # Utility Functions
+# Shape of every token generate_voting_token() has issued; anything else is
+# rejected without a database lookup
+TOKEN_PATTERN = re.compile(r'[A-Za-z0-9_-]{32,64}')
+
 def generate_voting_token():
     return secrets.token_urlsafe(32)
 
-def send_voting_notification(application_id):
-    """Send voting notification emails to all active members"""
-    application = GrantApplication.query.get(application_id)
-    members = VotingMember.query.filter_by(is_active=True).all()
-    
-    for member in members:
-        token = generate_voting_token()
-        vote = Vote(
-            application_id=application_id,
-            voter_id=member.id,
-            vote_type=VoteType.ACCEPT,  # Placeholder, will be updated when voted
-            token=token
-        )
-        db.session.add(vote)
-        
-        # Send email
-        voting_url = f"http://your-domain.com/vote/{token}"
-        
-        msg = Message(
-            subject=f'Grant Voting Required - {application.reference_code}',
-            sender=app.config['MAIL_USERNAME'],
-            recipients=[member.email]
-        )
-        
-        msg.html = f"""
-        <h2>Grant Application Voting Required</h2>
-        <p>Dear {member.name},</p>
+def generate_reference_code():
+    return f"CA{secrets.randbelow(999999):06d}"
+
+def parse_application(data):
+    """Convert an application JSON payload into GrantApplication column values"""
+    return {
+        'submitter_name': data['submitter_name'],
+        'candidate_full_name': data['candidate_full_name'],
+        'grant_type': GrantType(data['grant_type']),
+        'date': datetime.strptime(data['date'], '%Y-%m-%d').date(),
+        'place': data['place'],
+        'amount_requested': float(data['amount_requested']),
+        'currency': data.get('currency', 'EUR'),
+        'description': data.get('description', ''),
+        'voting_deadline': datetime.strptime(data['voting_deadline'], '%Y-%m-%d %H:%M')
+    }
+
+# JSON serialization: every JSON body goes through dumps(). Datetimes and dates
+# come out in ISO format and enums by value, so views hand over model values
+# as they are, picked by the Schemas below.
+def json_default(value):
+    """What the json module cannot encode itself, the way orjson encodes it"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+def dumps(data):
+    """data as compact UTF-8 JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=json_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+class APIJSONProvider(DefaultJSONProvider):
+    """jsonify(), request.json and app.json on top of dumps() and loads(); keys keep their order"""
+    
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return loads(s)
+    
+    def response(self, *args, **kwargs):
+        return self._app.response_class(dumps(self._prepare_response_obj(args, kwargs)), mimetype=self.mimetype)
+
+class Schema:
+    """The fields an API response carries for one model, read with a single precomputed attrgetter.
+
+    Positional fields keep their attribute name; keyword fields map an
+    output key to an attribute path (voter_name='voter.name'). Works on
+    archived rows too, which have the same attributes.
+    """
+    
+    def __init__(self, *fields, **renamed):
+        self.keys = fields + tuple(renamed)
+        paths = fields + tuple(renamed.values())
+        getter = operator.attrgetter(*paths)
+        self.getter = getter if len(paths) > 1 else lambda instance: (getter(instance),)
+    
+    def dump(self, instance):
+        return dict(zip(self.keys, self.getter(instance)))
+
+VOTER_SCHEMA = Schema('id', 'name', 'position', 'email')
+MEMBER_SCHEMA = Schema('id', 'name', 'position', 'email', 'is_active')
+APPLICATION_SCHEMA = Schema('id', 'reference_code', 'submitter_name', 'candidate_full_name', 'grant_type', 'date',
+                            'place', 'amount_requested', 'currency', 'voting_deadline', 'is_active', 'outcome')
+RESULTS_APPLICATION_SCHEMA = Schema('id', 'reference_code', 'candidate_full_name', 'grant_type', 'is_active',
+                                    'outcome')
+RESULTS_VOTE_SCHEMA = Schema(voter_name='voter.name', voter_position='voter.position', vote='vote_type',
+                             rejection_reason='rejection_reason', voted_at='voted_at')
+DELIVERY_SCHEMA = Schema(voter_name='voter.name', email='voter.email', status='delivery_status',
+                         attempts='delivery_attempts', error='delivery_error', delivered_at='delivered_at')
+COMMENT_SCHEMA = Schema('id', 'parent_comment_id', 'content', 'is_supportive')
+COMMENT_VOTER_SCHEMA = Schema(voter_name='name', voter_position='position')
+
+class LRUCache:
+    """Thread-safe LRU mapping with an optional time-to-live per entry.
+
+    Keeps hit, miss, eviction and expiration counters so the cache can be
+    sized from production numbers.
+    """
+    
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+    
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+    
+    def pop(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+    
+    def discard_where(self, predicate):
+        """Drop every entry whose value matches predicate"""
+        with self.lock:
+            for key in [k for k, (value, _) in self.entries.items() if predicate(value)]:
+                del self.entries[key]
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def resize(self, maxsize, ttl=None):
+        """Apply a new size and time-to-live and start empty"""
+        with self.lock:
+            self.maxsize = maxsize
+            self.ttl = ttl
+            self.entries.clear()
+    
+    def stats(self):
+        with self.lock:
+            return {
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+BallotRef = namedtuple('BallotRef', 'vote_id application_id voter_id deadline')
+
+token_cache = LRUCache(0)  # sized from TOKEN_CACHE_SIZE and TOKEN_CACHE_TTL by create_app()
+
+def resolve_token(token):
+    """Map a voting token to its ballot, aborting with 404 for unknown tokens"""
+    if not TOKEN_PATTERN.fullmatch(token):
+        abort(404)
+    ref = token_cache.get(token)
+    if ref is None:
+        row = db.session.execute(
+            db.select(Vote.id, Vote.application_id, Vote.voter_id, GrantApplication.voting_deadline)
+            .join(GrantApplication)
+            .where(Vote.token == token)
+        ).first()
+        if row is None:
+            abort(404)
+        ref = BallotRef(*row)
+        token_cache.set(token, ref)
+    return ref
+
+class MemoryRateLimitBackend:
+    """Token buckets in a bounded dict of this process (least recently used dropped first)"""
+    
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()  # key -> (tokens, monotonic time of the last update)
+        self.lock = threading.Lock()
+    
+    def take(self, key, capacity, rate):
+        """Take one token; returns 0 when granted, else the seconds until one is available"""
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            granted = tokens >= 1
+            self.buckets[key] = (tokens - 1 if granted else tokens, now)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return 0.0 if granted else (1 - tokens) / rate
+
+class SQLiteRateLimitBackend:
+    """Token buckets in a SQLite file shared by the worker processes of one host.
+    
+    A single UPSERT refills and takes a token atomically, so concurrent
+    workers never grant the same token twice. The file only holds
+    throttling state and may be deleted at any time.
+    """
+    
+    TAKE = """
+        INSERT INTO rate_limit_bucket (key, tokens, updated) VALUES (:key, :capacity - 1, :now)
+        ON CONFLICT (key) DO UPDATE SET tokens = min(:capacity, tokens + (:now - updated) * :rate) - 1, updated = :now
+        WHERE min(:capacity, tokens + (:now - updated) * :rate) >= 1
+        RETURNING tokens
+    """
+    PRUNE_EVERY = 10000  # checks per connection between deletions of idle buckets
+    IDLE_SECONDS = 3600  # long enough for any configured bucket to have refilled
+    
+    def __init__(self, path, busy_timeout):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.local = threading.local()
+    
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute(f'PRAGMA busy_timeout={self.busy_timeout}')
+            conn.execute('CREATE TABLE IF NOT EXISTS rate_limit_bucket '
+                         '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL) WITHOUT ROWID')
+            self.local.conn = conn
+            self.local.checks = 0
+        return conn
+    
+    def take(self, key, capacity, rate):
+        """Take one token; returns 0 when granted, else the seconds until one is available"""
+        conn = self.connection()
+        now = time.time()
+        self.local.checks += 1
+        if self.local.checks % self.PRUNE_EVERY == 0:
+            conn.execute('DELETE FROM rate_limit_bucket WHERE updated < ?', (now - self.IDLE_SECONDS,))
+        if conn.execute(self.TAKE, {'key': key, 'capacity': capacity, 'rate': rate, 'now': now}).fetchone():
+            return 0.0
+        tokens, updated = conn.execute('SELECT tokens, updated FROM rate_limit_bucket WHERE key = ?', (key,)).fetchone()
+        return (1 - min(capacity, tokens + (now - updated) * rate)) / rate
+
+class RateLimiter:
+    """Per-route token-bucket limits (RATE_LIMITS) by client IP and by voting token"""
+    
+    def __init__(self):
+        self.app = None  # set by init_app()
+        self.backend = None
+        self.lock = threading.Lock()
+    
+    def init_app(self, app):
+        self.app = app
+        self.backend = None
+    
+    def get_backend(self):
+        with self.lock:
+            if self.backend is None:
+                if self.app.config['RATE_LIMIT_BACKEND'] == 'sqlite':
+                    self.backend = SQLiteRateLimitBackend(self.app.config['RATE_LIMIT_SQLITE_PATH'],
+                                                          self.app.config['SQLITE_BUSY_TIMEOUT'])
+                else:
+                    self.backend = MemoryRateLimitBackend(self.app.config['RATE_LIMIT_MAX_KEYS'])
+            return self.backend
+    
+    def check(self, endpoint, ip, token=None):
+        """Seconds until a request to endpoint would be allowed, 0 if it may proceed now"""
+        limits = self.app.config['RATE_LIMITS'].get(endpoint, {})
+        backend = self.backend or self.get_backend()
+        for scope, key in (('ip', ip), ('token', token)):
+            if key is None or scope not in limits:
+                continue
+            capacity, rate = limits[scope]
+            wait = backend.take(f'{endpoint}:{scope}:{key}', capacity, rate)
+            if wait:
+                return wait
+        return 0.0
+
+rate_limiter = RateLimiter()
+
+def tally_votes(application_ids=None):
+    """Count accept, reject, pending and total ballots per application in one GROUP BY query.
+
+    Only cast ballots count towards accept and reject; pending are the
+    issued ballots that have not been used yet. This reads the Vote table
+    itself; passing None tallies every application.
+    """
+    tallies = {application_id: {'accept': 0, 'reject': 0, 'pending': 0, 'total': 0, 'last_vote_at': None}
+               for application_id in application_ids or []}
+    for row in db.session.execute(tally_query(application_ids)):
+        tallies[row.application_id] = tally_from_row(row)
+    return tallies
+
+def tally_query(application_ids=None):
+    """The GROUP BY statement behind tally_votes(), with columns named like ApplicationTally's"""
+    cast = Vote.state == BallotState.CAST
+    query = db.select(
+        Vote.application_id,
+        db.func.count(db.case((cast & (Vote.vote_type == VoteType.ACCEPT), 1))).label('accept'),
+        db.func.count(db.case((cast & (Vote.vote_type == VoteType.REJECT), 1))).label('reject'),
+        db.func.count(db.case((Vote.state == BallotState.ISSUED, 1))).label('pending'),
+        db.func.count().label('total'),
+        db.func.max(Vote.voted_at).label('last_vote_at')
+    ).group_by(Vote.application_id)
+    if application_ids is not None:
+        query = query.where(Vote.application_id.in_(application_ids))
+    return query
+
+def tally_from_row(row):
+    return {
+        'accept': row.accept,
+        'reject': row.reject,
+        'pending': row.pending,
+        'total': row.total,
+        'last_vote_at': row.last_vote_at
+    }
+
+def load_tallies(application_ids):
+    """Read tallies from the materialized ApplicationTally table.
+
+    Applications without a tally row (created before the table existed)
+    fall back to counting their votes.
+    """
+    rows = ApplicationTally.query.filter(ApplicationTally.application_id.in_(application_ids)).all()
+    tallies = {row.application_id: tally_from_row(row) for row in rows}
+    
+    missing = [application_id for application_id in application_ids if application_id not in tallies]
+    if missing:
+        tallies.update(tally_votes(missing))
+    return tallies
+
+def record_vote(application_id, previous, current, voted_at):
+    """Apply a cast (or changed) vote to the application's tally in the current transaction.
+
+    previous is the VoteType the ballot held before, or None if it was
+    still pending.
+    """
+    values = {'last_vote_at': voted_at}
+    if previous != current:
+        if previous is None:
+            values['pending'] = ApplicationTally.pending - 1
+        else:
+            column = previous.name.lower()
+            values[column] = getattr(ApplicationTally, column) - 1
+        column = current.name.lower()
+        values[column] = getattr(ApplicationTally, column) + 1
+    
+    db.session.execute(
+        db.update(ApplicationTally).where(ApplicationTally.application_id == application_id).values(**values)
+    )
+
+def rebuild_tallies():
+    """Recompute every ApplicationTally row from the Vote table"""
+    tallies = tally_votes()
+    db.session.execute(db.delete(ApplicationTally))
+    if tallies:
+        db.session.execute(db.insert(ApplicationTally), [
+            {'application_id': application_id, **tally} for application_id, tally in tallies.items()
+        ])
+    db.session.commit()
+    return len(tallies)
+
+def check_tallies():
+    """Compare the materialized tallies with the Vote table and list every mismatch"""
+    actual = tally_votes()
+    stored = {row.application_id: row for row in ApplicationTally.query.all()}
+    
+    mismatches = []
+    for application_id in sorted(set(actual) | set(stored)):
+        row = stored.get(application_id)
+        expected = actual.get(application_id)
+        if row is None or expected is None:
+            mismatches.append({'application_id': application_id,
+                               'problem': 'missing tally row' if row is None else 'tally without ballots'})
+            continue
+        for field in ('accept', 'reject', 'pending', 'total'):
+            if getattr(row, field) != expected[field]:
+                mismatches.append({'application_id': application_id, 'field': field,
+                                   'stored': getattr(row, field), 'actual': expected[field]})
+    return mismatches
+
+# Indexes earlier versions created that no query needs any more
+RETIRED_INDEXES = ['ix_application_active_date']
+
+# Columns added to tables that databases of earlier versions already have, and
+# the value their existing rows get (create_all() only creates missing tables)
+UPGRADE_COLUMNS = [
+    (GrantApplication.updated_at, GrantApplication.created_at),
+    (GrantApplication.reminders_sent, 0),
+    (GrantApplication.finalized_at, None),
+    (GrantApplication.outcome, None),
+    # Earlier versions stored a placeholder vote_type on every ballot, so those count as cast
+    (Vote.state, db.case((Vote.vote_type.is_not(None), db.literal(BallotState.CAST, Vote.state.type)),
+                         else_=db.literal(BallotState.ISSUED, Vote.state.type))),
+    # Announced by the earlier version when the application was created
+    (Vote.delivery_status, 'sent'),
+    (Vote.delivery_attempts, 1),
+    (Vote.delivery_error, None),
+    (Vote.delivered_at, None),
+    (Vote.version, 0),
+]
+
+def rebuild_sqlite_table(connection, table):
+    """Recreate table from its model, keeping the rows (SQLite cannot change a column's NULL constraint)"""
+    name = connection.dialect.identifier_preparer.format_table(table)
+    ddl = str(CreateTable(table).compile(dialect=connection.dialect)).strip()
+    assert ddl.startswith(f'CREATE TABLE {name} ')
+    columns = ', '.join(connection.dialect.identifier_preparer.quote(column.name) for column in table.columns)
+    connection.exec_driver_sql(ddl.replace(f'CREATE TABLE {name} ', f'CREATE TABLE {table.name}_upgrade ', 1))
+    connection.exec_driver_sql(f'INSERT INTO {table.name}_upgrade ({columns}) SELECT {columns} FROM {name}')
+    connection.exec_driver_sql(f'DROP TABLE {name}')
+    connection.exec_driver_sql(f'ALTER TABLE {table.name}_upgrade RENAME TO {name}')
+
+def upgrade_schema():
+    """Bring a database created by an earlier version up to the current models; running it again changes nothing.
+
+    Adds the UPGRADE_COLUMNS a table lacks and fills them in for the existing
+    rows, adds new enum values (PostgreSQL), aligns NULL constraints with the
+    models (pending ballots have no vote_type), then creates the missing
+    tables and indexes and drops the RETIRED_INDEXES. Returns a description
+    of each change.
+    """
+    connection = db.session.connection()
+    dialect = connection.dialect
+    inspector = db.inspect(connection)
+    existing = {table: {column['name']: column for column in inspector.get_columns(table)}
+                for table in inspector.get_table_names()}
+    changes = []
+    
+    for attribute, backfill in UPGRADE_COLUMNS:
+        column = attribute.expression
+        table = column.table
+        if table.name not in existing:
+            continue  # created whole by create_all() below
+        if column.name not in existing[table.name]:
+            if isinstance(column.type, db.Enum):
+                column.type.create(connection, checkfirst=True)  # PostgreSQL enum type
+            connection.exec_driver_sql(
+                f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect)}'
+            )
+            changes.append(f'added column {table.name}.{column.name}')
+        if backfill is not None:
+            # Keep updated_at as it is: filling in a column does not change the application
+            unchanged = {other.name: other for other in table.columns
+                         if other.onupdate is not None and other.name != column.name}
+            connection.execute(db.update(table).where(column.is_(None)).values({column.name: backfill, **unchanged}))
+    
+    if dialect.name == 'postgresql':
+        # Values added to an enum since its type was created, such as Outcome.NO_VOTES
+        labels = {enum['name']: enum['labels'] for enum in inspector.get_enums()}
+        enums = {column.type.name: column.type for table in db.metadata.sorted_tables for column in table.columns
+                 if isinstance(column.type, db.Enum)}
+        for name, enum in enums.items():
+            for value in enum.enums:
+                if name in labels and value not in labels[name]:
+                    connection.exec_driver_sql(f"ALTER TYPE {name} ADD VALUE '{value}'")
+                    changes.append(f'added {value} to enum {name}')
+    
+    inspector = db.inspect(connection)
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        columns = {column['name']: column for column in inspector.get_columns(table.name)}
+        mismatched = [column for column in table.columns
+                      if not column.primary_key and columns[column.name]['nullable'] != column.nullable]
+        if not mismatched:
+            continue
+        if dialect.name == 'sqlite':
+            rebuild_sqlite_table(connection, table)
+        else:
+            for column in mismatched:
+                connection.exec_driver_sql(f'ALTER TABLE {table.name} ALTER COLUMN {column.name} '
+                                           f'{"DROP" if column.nullable else "SET"} NOT NULL')
+        changes.extend(f'{table.name}.{column.name} {"allows NULL" if column.nullable else "NOT NULL"}'
+                       for column in mismatched)
+    
+    db.metadata.create_all(connection)
+    changes.extend(f'created table {table.name}' for table in db.metadata.sorted_tables
+                   if table.name not in existing)
+    if dialect.name == 'sqlite':  # the inspector skips expression indexes there
+        indexes = set(connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars())
+    else:
+        inspector = db.inspect(connection)
+        indexes = {index['name'] for table in db.metadata.sorted_tables for index in inspector.get_indexes(table.name)}
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(connection)
+                changes.append(f'created index {index.name}')
+    for name in RETIRED_INDEXES:
+        if name in indexes:
+            connection.exec_driver_sql(f'DROP INDEX {name}')
+            changes.append(f'dropped index {name}')
+    db.session.commit()
+    return changes
+
+def vote_summary(tally):
+    """Shape a tally the way the API has always reported vote summaries"""
+    return {
+        'accept': tally['accept'],
+        'reject': tally['reject'],
+        'pending': tally['pending'],
+        'total_voters': tally['total'],
+        'voted': tally['accept'] + tally['reject']
+    }
+
+VOTING_EMAIL_TEMPLATE = """
+<h2>Grant Application Voting Required</h2>
+<p>Dear {{ member.name }},</p>
+
+<p>{% if reminder %}Voting closes soon and we have not received your vote on this grant application:{% else %}A new grant application requires your vote:{% endif %}</p>
+
+<div style="background: #f5f5f5; padding: 15px; margin: 15px 0;">
+    <strong>Reference:</strong> {{ application.reference_code }}<br>
+    <strong>Candidate:</strong> {{ application.candidate_full_name }}<br>
+    <strong>Grant Type:</strong> {{ application.grant_type.value }}<br>
+    <strong>Date:</strong> {{ application.date }}<br>
+    <strong>Place:</strong> {{ application.place }}<br>
+    <strong>Amount:</strong> {{ application.amount_requested }} {{ application.currency }}
+</div>
+
+<p><a href="{{ base_url }}/vote/{{ token }}" style="background: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">VOTE NOW</a></p>
+
+<p>Voting deadline: {{ application.voting_deadline.strftime('%Y-%m-%d %H:%M') }}</p>
+
+<p>Best regards,<br>Grant Management System</p>
+"""
+
+DIGEST_EMAIL_TEMPLATE = """
+<h2>{% if reminder %}Grant Votes Closing Soon{% else %}Grant Applications Awaiting Your Vote{% endif %}</h2>
+<p>Dear {{ member_name }},</p>
+
+<p>{% if reminder %}Voting closes soon on applications you have not voted on yet.{% else %}The following grant applications are waiting for your vote.{% endif %}</p>
+
+<table style="border-collapse: collapse; width: 100%;">
+    <tr style="background: #f5f5f5;">
+        <th align="left" style="padding: 8px;">Reference</th>
+        <th align="left" style="padding: 8px;">Candidate</th>
+        <th align="left" style="padding: 8px;">Grant Type</th>
+        <th align="left" style="padding: 8px;">Amount</th>
+        <th align="left" style="padding: 8px;">Deadline</th>
+        <th style="padding: 8px;"></th>
+    </tr>
+    {% for ballot in ballots %}
+    <tr style="border-top: 1px solid #ddd;">
+        <td style="padding: 8px;">{{ ballot.reference_code }}</td>
+        <td style="padding: 8px;">{{ ballot.candidate_full_name }}</td>
+        <td style="padding: 8px;">{{ ballot.grant_type.value }}</td>
+        <td style="padding: 8px;">{{ ballot.amount_requested }} {{ ballot.currency }}</td>
+        <td style="padding: 8px;">{{ ballot.voting_deadline.strftime('%Y-%m-%d %H:%M') }}</td>
+        <td style="padding: 8px;"><a href="{{ base_url }}/vote/{{ ballot.token }}">VOTE NOW</a></td>
+    </tr>
+    {% endfor %}
+</table>
+
+<p>Best regards,<br>Grant Management System</p>
+"""
+
+def inline_template(source):
+    """source compiled by the current app's Jinja environment on first use, then reused"""
+    templates = current_app.extensions.setdefault('inline_templates', {})
+    template = templates.get(source)
+    if template is None:
+        template = templates[source] = current_app.jinja_env.from_string(source)
+    return template
+
+def build_voting_message(application, member, token, reminder=False):
+    """Build the voting invitation (or reminder) email for one member"""
+    from flask_mail import Message
+    
+    msg = Message(
+        subject=f'{"Reminder: " if reminder else ""}Grant Voting Required - {application.reference_code}',
+        sender=current_app.config['MAIL_USERNAME'],
+        recipients=[member.email]
+    )
+    msg.html = inline_template(VOTING_EMAIL_TEMPLATE).render(
+        application=application,
+        member=member,
+        token=token,
+        reminder=reminder,
+        base_url=current_app.config['VOTING_BASE_URL']
+    )
+    return msg
+
+def build_digest_message(member_name, member_email, ballots, reminder=False):
+    """Build one email listing every outstanding ballot of a member"""
+    from flask_mail import Message
+    
+    msg = Message(
+        subject=(f'Reminder: {len(ballots)} grant votes closing soon' if reminder
+                 else f'Grant Voting Required - {len(ballots)} applications'),
+        sender=current_app.config['MAIL_USERNAME'],
+        recipients=[member_email]
+    )
+    msg.html = inline_template(DIGEST_EMAIL_TEMPLATE).render(
+        member_name=member_name,
+        ballots=ballots,
+        reminder=reminder,
+        base_url=current_app.config['VOTING_BASE_URL']
+    )
+    return msg
+
+def get_mail():
+    """Flask-Mail state of the current app, imported and set up when the app sends its first email"""
+    if 'mail' not in current_app.extensions:
+        from flask_mail import Mail
+        Mail(current_app._get_current_object())
+    return current_app.extensions['mail']
+
+def send_timed(conn, msg, kind):
+    """Send msg over an open mail connection, recording its duration when metrics are enabled"""
+    if not current_app.config['METRICS_ENABLED']:
+        conn.send(msg)
+        return
+    started = time.perf_counter()
+    try:
+        conn.send(msg)
+    except Exception:
+        metrics.observe_mail(kind, time.perf_counter() - started, ok=False)
+        raise
+    metrics.observe_mail(kind, time.perf_counter() - started, ok=True)
+
+class NotificationDispatcher:
+    """Background queue delivering voting emails in batches over one SMTP connection.
+
+    Workers are started lazily on the first enqueue so that each Gunicorn
+    worker process owns its own threads. Delivery status of the latest
+    email (invitation or reminder) is written back to the Vote row of every
+    token.
+    """
+    
+    def __init__(self):
+        self.app = None  # set by init_app()
+        self.queue = queue.Queue()
+        self.workers = []
+        self.lock = threading.Lock()
+    
+    def init_app(self, app):
+        self.app = app
+    
+    def start(self):
+        with self.lock:
+            if self.workers:
+                return
+            for i in range(self.app.config['MAIL_DISPATCH_WORKERS']):
+                worker = threading.Thread(target=self._run, name=f'mail-dispatch-{i}', daemon=True)
+                worker.start()
+                self.workers.append(worker)
+    
+    def enqueue(self, vote_ids, reminder=False):
+        """Queue the invitation (or reminder) emails for the given Vote ids"""
+        items = [(vote_id, reminder) for vote_id in vote_ids]
+        if self.app.config['MAIL_DISPATCH_WORKERS'] <= 0:
+            self.deliver(items)
+            return
         
-        <p>A new grant application requires your vote:</p>
+        self.start()
+        for item in items:
+            self.queue.put(item)
+    
+    def join(self):
+        """Block until every queued message has been attempted"""
+        self.queue.join()
+    
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        while len(batch) < self.app.config['MAIL_BATCH_SIZE']:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                with self.app.app_context():
+                    self.deliver(batch)
+            except Exception:
+                self.app.logger.exception('Notification batch failed')
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+    
+    def deliver(self, items):
+        """Send one batch of (vote_id, reminder) items over a single SMTP connection, retrying with backoff.
+
+        A message the server refuses (bad recipient, rejected data) fails on
+        its own and the batch goes on. A dropped or failed connection is
+        reopened after a backoff and sending resumes at the message it broke
+        off; any other SMTP error (authentication, sender refused) fails the
+        rest of the batch at once.
+        """
+        reminders = dict(items)
+        pending = Vote.query.options(
+            joinedload(Vote.application), joinedload(Vote.voter)
+        ).filter(Vote.id.in_(list(reminders))).all()
+        max_retries = self.app.config['MAIL_MAX_RETRIES']
+        error = None
         
-        <div style="background: #f5f5f5; padding: 15px; margin: 15px 0;">
-            <strong>Reference:</strong> {application.reference_code}<br>
-            <strong>Candidate:</strong> {application.candidate_full_name}<br>
-            <strong>Grant Type:</strong> {application.grant_type.value}<br>
-            <strong>Date:</strong> {application.date}<br>
-            <strong>Place:</strong> {application.place}<br>
-            <strong>Amount:</strong> {application.amount_requested} {application.currency}
-        </div>
+        for attempt in range(max_retries + 1):
+            try:
+                with get_mail().connect() as conn:
+                    while pending:
+                        vote = pending[0]
+                        vote.delivery_attempts = (vote.delivery_attempts or 0) + 1
+                        try:
+                            send_timed(conn, build_voting_message(vote.application, vote.voter, vote.token,
+                                                                  reminder=reminders[vote.id]),
+                                       'reminder' if reminders[vote.id] else 'invitation')
+                        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                            vote.delivery_status = 'failed'
+                            vote.delivery_error = str(e)
+                        else:
+                            vote.delivery_status = 'sent'
+                            vote.delivery_error = None
+                            vote.delivered_at = datetime.utcnow()
+                        pending.pop(0)
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as e:
+                error = e
+            except smtplib.SMTPException as e:
+                error = e
+                break
+            except OSError as e:
+                error = e
+            
+            if not pending:
+                break
+            pending[0].delivery_error = str(error)
+            if attempt < max_retries:
+                db.session.commit()
+                time.sleep(self.app.config['MAIL_RETRY_BACKOFF'] * 2 ** attempt)
         
-        <p><a href="{voting_url}" style="background: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">VOTE NOW</a></p>
+        for vote in pending:
+            vote.delivery_status = 'failed'
+            vote.delivery_error = str(error)
         
-        <p>Voting deadline: {application.voting_deadline.strftime('%Y-%m-%d %H:%M')}</p>
+        db.session.commit()
+
+dispatcher = NotificationDispatcher()
+
+def finalize_application(application_id):
+    """Close voting on an application: expire unused ballots, freeze the tally and record the outcome.
+
+    Every worker process runs its own scheduler, so the application is
+    claimed with a conditional UPDATE and only the first caller does the
+    work. Returns True if this call finalized the application.
+    """
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        db.update(GrantApplication)
+        .where(GrantApplication.id == application_id, GrantApplication.finalized_at.is_(None))
+        .values(finalized_at=now, is_active=False)
+    ).rowcount
+    if not claimed:
+        db.session.rollback()
+        return False
+    
+    db.session.execute(
+        db.update(Vote)
+        .where(Vote.application_id == application_id, Vote.state == BallotState.ISSUED)
+        .values(state=BallotState.EXPIRED)
+    )
+    
+    tally = tally_votes([application_id])[application_id]
+    if tally['accept'] == tally['reject'] == 0:
+        outcome = Outcome.NO_VOTES
+    elif tally['accept'] > tally['reject']:
+        outcome = Outcome.ACCEPTED
+    elif tally['reject'] > tally['accept']:
+        outcome = Outcome.REJECTED
+    else:
+        outcome = Outcome.TIED
+    
+    db.session.execute(
+        db.update(GrantApplication).where(GrantApplication.id == application_id).values(outcome=outcome)
+    )
+    db.session.merge(ApplicationTally(application_id=application_id, **tally))
+    db.session.commit()
+    
+    token_cache.discard_where(lambda ballot: ballot.application_id == application_id)
+    return True
+
+def claim_reminder(application_id, index):
+    """Record that the reminder for REMINDER_OFFSETS_HOURS[index] goes out; False if it already went.
+
+    A conditional UPDATE, so of several workers and runs only one sends it.
+    """
+    return db.session.execute(
+        db.update(GrantApplication)
+        .where(GrantApplication.id == application_id,
+               GrantApplication.finalized_at.is_(None),
+               GrantApplication.reminders_sent <= index)
+        .values(reminders_sent=index + 1)
+    ).rowcount == 1
+
+def claim_due_reminders(now):
+    """Claim the reminder of every open application whose latest REMINDER_OFFSETS_HOURS came due; returns their ids"""
+    offsets = current_app.config['REMINDER_OFFSETS_HOURS']
+    applications = db.session.execute(
+        db.select(GrantApplication.id, GrantApplication.voting_deadline, GrantApplication.reminders_sent).where(
+            GrantApplication.finalized_at.is_(None),
+            GrantApplication.voting_deadline > now,
+            GrantApplication.voting_deadline <= now + timedelta(hours=max(offsets))
+        )
+    ).all()
+    claimed = set()
+    for application_id, deadline, reminders_sent in applications:
+        due = [index for index, hours in enumerate(offsets) if deadline - timedelta(hours=hours) <= now]
+        if due and reminders_sent <= due[-1] and claim_reminder(application_id, due[-1]):
+            claimed.add(application_id)
+    db.session.commit()
+    return claimed
+
+def send_reminders(application_id, index):
+    """Queue the reminder for REMINDER_OFFSETS_HOURS[index] to every member who has not voted yet"""
+    if current_app.config['NOTIFICATION_MODE'] == 'digest':
+        return  # covered by send_digests(reminder=True)
+    
+    if not claim_reminder(application_id, index):
+        db.session.rollback()
+        return
+    
+    vote_ids = db.session.scalars(
+        db.select(Vote.id).where(Vote.application_id == application_id, Vote.state == BallotState.ISSUED)
+    ).all()
+    db.session.commit()
+    
+    dispatcher.enqueue(vote_ids, reminder=True)
+
+def send_digests(reminder=False):
+    """Email every member one digest of all their outstanding ballots.
+
+    All open ballots are read with a single query ordered by member. A
+    member gets a digest if any of their ballots has not been announced yet.
+    Reminder runs instead claim the applications whose next
+    REMINDER_OFFSETS_HOURS came due, as the scheduler does outside digest
+    mode, and remind members of the ballots of those applications only.
+    Returns (emails sent, ballots covered).
+    """
+    now = datetime.utcnow()
+    if reminder:
+        claimed = claim_due_reminders(now)
+        if not claimed:
+            return 0, 0
+    
+    rows = db.session.execute(
+        db.select(
+            Vote.id, Vote.token, Vote.delivery_status, Vote.voter_id, Vote.application_id,
+            VotingMember.name, VotingMember.email,
+            GrantApplication.reference_code, GrantApplication.candidate_full_name, GrantApplication.grant_type,
+            GrantApplication.amount_requested, GrantApplication.currency, GrantApplication.voting_deadline
+        )
+        .join(VotingMember, Vote.voter_id == VotingMember.id)
+        .join(GrantApplication, Vote.application_id == GrantApplication.id)
+        .where(
+            Vote.state == BallotState.ISSUED,
+            VotingMember.is_active == True,
+            GrantApplication.finalized_at.is_(None),
+            GrantApplication.voting_deadline > now
+        )
+        .order_by(Vote.voter_id, GrantApplication.voting_deadline)
+    ).all()
+    
+    emails = 0
+    sent_ids = []
+    with get_mail().connect() as conn:
+        for _, group in itertools.groupby(rows, key=lambda row: row.voter_id):
+            ballots = list(group)
+            if reminder:
+                ballots = [b for b in ballots if b.application_id in claimed]
+                due = bool(ballots)
+            else:
+                due = any(b.delivery_status == 'queued' for b in ballots)
+            if not due:
+                continue
+            
+            try:
+                send_timed(conn, build_digest_message(ballots[0].name, ballots[0].email, ballots, reminder=reminder),
+                           'digest_reminder' if reminder else 'digest')
+            except (smtplib.SMTPException, OSError):
+                current_app.logger.exception('Digest to %s failed; its ballots stay queued', ballots[0].email)
+                continue
+            emails += 1
+            sent_ids.extend(b.id for b in ballots)
+    
+    for i in range(0, len(sent_ids), 500):
+        db.session.execute(
+            db.update(Vote).where(Vote.id.in_(sent_ids[i:i + 500])).values(
+                delivery_status='sent',
+                delivery_error=None,
+                delivered_at=now,
+                delivery_attempts=db.func.coalesce(Vote.delivery_attempts, 0) + 1
+            )
+        )
+    db.session.commit()
+    
+    return emails, len(sent_ids)
+
+class DeadlineScheduler:
+    """Finalizes applications at their deadline and sends reminders before it.
+
+    Upcoming events live in a heap loaded from the database when the
+    scheduler starts and extended by schedule() as applications are
+    created. The thread sleeps until the earliest event is due, so open
+    applications cost nothing between events.
+    """
+    
+    def __init__(self):
+        self.app = None  # set by init_app()
+        self.events = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+    
+    def init_app(self, app):
+        self.app = app
+    
+    def start(self):
+        if self.thread is not None or not self.app.config['DEADLINE_SCHEDULER_ENABLED']:
+            return
+        with self.condition:
+            if self.thread is not None:
+                return
+            with self.app.app_context():
+                open_applications = db.session.execute(
+                    db.select(GrantApplication.id, GrantApplication.voting_deadline, GrantApplication.reminders_sent)
+                    .where(GrantApplication.finalized_at.is_(None))
+                ).all()
+            for application_id, deadline, reminders_sent in open_applications:
+                self._push(application_id, deadline, reminders_sent)
+            self.thread = threading.Thread(target=self._run, name='deadline-scheduler', daemon=True)
+            self.thread.start()
+    
+    def schedule(self, application_id, deadline):
+        """Add a newly created application's deadline and reminders"""
+        if self.thread is None:
+            return  # picked up from the database when the scheduler starts
+        with self.condition:
+            self._push(application_id, deadline, 0)
+            self.condition.notify()
+    
+    def _push(self, application_id, deadline, reminders_sent):
+        now = datetime.utcnow()
+        heapq.heappush(self.events, (deadline, next(self.sequence), application_id, None))
+        for index, hours in enumerate(self.app.config['REMINDER_OFFSETS_HOURS']):
+            remind_at = deadline - timedelta(hours=hours)
+            if index >= reminders_sent and remind_at > now:
+                heapq.heappush(self.events, (remind_at, next(self.sequence), application_id, index))
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.events or self.events[0][0] > datetime.utcnow():
+                    timeout = (self.events[0][0] - datetime.utcnow()).total_seconds() if self.events else None
+                    self.condition.wait(timeout)
+                _, _, application_id, reminder_index = heapq.heappop(self.events)
+            
+            try:
+                with self.app.app_context():
+                    if reminder_index is None:
+                        finalize_application(application_id)
+                    else:
+                        send_reminders(application_id, reminder_index)
+            except Exception:
+                self.app.logger.exception('Deadline event for application %s failed', application_id)
+
+scheduler = DeadlineScheduler()
+
+class Subscription:
+    """Event queue of one stream served by a worker thread"""
+    
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize)
+        self.dropped = False
+    
+    def offer(self, message):
+        """Queue message without blocking; False when the stream has fallen too far behind"""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except queue.Full:
+            return False
+
+class AsyncSubscription(Subscription):
+    """Event queue of one stream served by a coroutine on loop (ASGI mode)"""
+    
+    def __init__(self, maxsize, loop):
+        self.queue = asyncio.Queue()
+        self.maxsize = maxsize
+        self.loop = loop
+        self.dropped = False
+    
+    def offer(self, message):
+        # Called from request and poller threads; the loop owns the queue
+        if self.queue.qsize() >= self.maxsize:
+            return False
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, message)
+        return True
+
+class EventBroker:
+    """In-process fan-out of application events to Server-Sent Events streams.
+
+    A change is serialized once and put on the queue of every subscriber
+    of the application; a subscriber whose queue is full is dropped and its
+    browser reconnects. Writes made by this worker are published right after
+    their commit. One poller thread per worker reads the tallies and new
+    comments of all subscribed applications every EVENTS_POLL_INTERVAL, so
+    writes handled by other Gunicorn workers reach this worker's streams
+    too, at a cost independent of the number of subscribers.
+    
+    A tally is published when its summary differs from the last one sent,
+    so changes without a new vote (finalization expiring ballots) go out
+    and unchanged polls do not. Only the poller advances the comment mark,
+    from its ordered scan; comments this worker published ahead of it are
+    remembered until the mark passes them, so none is skipped or repeated.
+    """
+    
+    def __init__(self):
+        self.app = None  # set by init_app()
+        self.lock = threading.Lock()
+        self.subscribers = {}  # application id -> set of Subscription
+        self.seen = {}  # application id -> [summary, comment mark, ids published past the mark]
+        self.count = 0
+        self.thread = None
+    
+    def init_app(self, app):
+        self.app = app
+    
+    def subscribe(self, application_id, summary, last_comment_id, loop=None):
+        """Register a stream, or return None when EVENTS_MAX_CONNECTIONS are open.
         
-        <p>Best regards,<br>Grant Management System</p>
+        Pass the event loop of a coroutine-served stream to get an
+        AsyncSubscription.
         """
-        
-        mail.send(msg)
+        with self.lock:
+            if self.count >= self.app.config['EVENTS_MAX_CONNECTIONS']:
+                return None
+            if loop is None:
+                subscription = Subscription(self.app.config['EVENTS_QUEUE_SIZE'])
+            else:
+                subscription = AsyncSubscription(self.app.config['EVENTS_QUEUE_SIZE'], loop)
+            self.subscribers.setdefault(application_id, set()).add(subscription)
+            self.seen.setdefault(application_id, [summary, last_comment_id, set()])
+            self.count += 1
+            if self.thread is None and self.app.config['EVENTS_POLL_INTERVAL'] > 0:
+                self.thread = threading.Thread(target=self._run, name='event-poller', daemon=True)
+                self.thread.start()
+        return subscription
+    
+    def unsubscribe(self, application_id, subscription):
+        with self.lock:
+            subscriptions = self.subscribers.get(application_id)
+            if subscriptions is None or subscription not in subscriptions:
+                return
+            subscriptions.discard(subscription)
+            self.count -= 1
+            if not subscriptions:
+                del self.subscribers[application_id]
+                del self.seen[application_id]
+    
+    def has_subscribers(self, application_id):
+        return application_id in self.subscribers
+    
+    def publish(self, application_id, event, data):
+        message = f'event: {event}\ndata: {dumps(data).decode()}\n\n'
+        with self.lock:
+            subscriptions = list(self.subscribers.get(application_id, ()))
+        for subscription in subscriptions:
+            if not subscription.offer(message):
+                subscription.dropped = True
+                self.unsubscribe(application_id, subscription)
+    
+    def publish_tally(self, application_id, tally):
+        summary = vote_summary(tally)
+        with self.lock:
+            seen = self.seen.get(application_id)
+            if seen is None or summary == seen[0]:
+                return
+            seen[0] = summary
+        self.publish(application_id, 'tally', summary)
+    
+    def publish_comment(self, application_id, comment_id, comment, polled=False):
+        """Publish a comment once; polled is True for the poller's scan, which alone moves the mark"""
+        with self.lock:
+            seen = self.seen.get(application_id)
+            if seen is None or comment_id <= seen[1]:
+                return
+            published = seen[2]
+            if polled:
+                seen[1] = comment_id
+                seen[2] = {other for other in published if other > comment_id}
+            if comment_id in published:
+                return
+            if not polled:
+                published.add(comment_id)
+        self.publish(application_id, 'comment', comment)
+    
+    def _run(self):
+        while True:
+            time.sleep(self.app.config['EVENTS_POLL_INTERVAL'])
+            try:
+                self.poll()
+            except Exception:
+                self.app.logger.exception('Event poller failed')
+    
+    def poll(self):
+        """Publish what changed in the database for the subscribed applications since the last poll"""
+        with self.lock:
+            seen = {application_id: list(values) for application_id, values in self.seen.items()}
+        if not seen:
+            return
+        with self.app.app_context():
+            for application_id, tally in load_tallies(list(seen)).items():
+                self.publish_tally(application_id, tally)
+            
+            comments = db.session.execute(
+                db.select(Comment, VotingMember).join(VotingMember).where(
+                    Comment.application_id.in_(list(seen)),
+                    Comment.id > min(mark for _, mark, _ in seen.values())
+                ).order_by(Comment.id)
+            ).all()
+            for comment, voter in comments:
+                self.publish_comment(comment.application_id, comment.id, serialize_comment(comment, voter),
+                                     polled=True)
+
+broker = EventBroker()
+
+def issue_ballots(application_ids):
+    """Issue a ballot token to every active member for each application.
+
+    All rows go out in a single executemany INSERT; the caller owns the
+    transaction and sends the emails separately once it has committed.
+    Returns the number of ballots written.
+    """
+    member_ids = db.session.scalars(
+        db.select(VotingMember.id).filter_by(is_active=True)
+    ).all()
+    
+    rows = [{
+        'application_id': application_id,
+        'voter_id': member_id,
+        'token': generate_voting_token()
+    } for application_id in application_ids for member_id in member_ids]
+    
+    if rows:
+        db.session.execute(db.insert(Vote), rows)
+        db.session.execute(db.insert(ApplicationTally), [
+            {'application_id': application_id, 'pending': len(member_ids), 'total': len(member_ids)}
+            for application_id in application_ids
+        ])
+    
+    return len(rows)
+
+# Full-text search over application texts, comments and rejection reasons.
+# One search_index row per document, keyed by rowid = source id * 4 + kind
+# code: an FTS5 table on SQLite, a table with a GIN-indexed tsvector on
+# PostgreSQL. Other backends are not indexed.
+SEARCH_KINDS = {'application': 1, 'comment': 2, 'rejection': 3}
+SEARCH_BACKENDS = ('sqlite', 'postgresql')
+HIGHLIGHT_START, HIGHLIGHT_END = '\x02', '\x03'  # replaced by <mark> after escaping
+
+search_index_ready = False
+
+def create_search_index(connection):
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "kind UNINDEXED, application_id UNINDEXED, body, tokenize='unicode61 remove_diacritics 2')"
+        )
+    elif connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS search_index ("
+            "rowid BIGINT PRIMARY KEY, kind VARCHAR(20) NOT NULL, application_id INTEGER NOT NULL, body TEXT NOT NULL, "
+            "document TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', body)) STORED)"
+        )
+        connection.exec_driver_sql(
+            'CREATE INDEX IF NOT EXISTS ix_search_index_document ON search_index USING GIN (document)'
+        )
+
+@event.listens_for(db.metadata, 'after_create')
+def create_search_index_table(target, connection, **kw):
+    create_search_index(connection)
+
+@event.listens_for(db.metadata, 'after_drop')
+def drop_search_index_table(target, connection, **kw):
+    connection.exec_driver_sql('DROP TABLE IF EXISTS search_index')
+
+def application_document(application):
+    return '\n'.join(filter(None, [application.candidate_full_name, application.place, application.description]))
+
+def index_documents(documents):
+    """Replace the search documents given as (kind, source_id, application_id, body) in the current transaction.
+
+    A body of None removes the document.
+    """
+    global search_index_ready
+    connection = db.session.connection()
+    if connection.dialect.name not in SEARCH_BACKENDS or not documents:
+        return
+    if not search_index_ready:
+        create_search_index(connection)
+        search_index_ready = True
+    
+    rows = [{
+        'rowid': source_id * 4 + SEARCH_KINDS[kind],
+        'kind': kind,
+        'application_id': application_id,
+        'body': body
+    } for kind, source_id, application_id, body in documents]
+    connection.execute(
+        db.text('DELETE FROM search_index WHERE rowid IN :rowids').bindparams(db.bindparam('rowids', expanding=True)),
+        {'rowids': [row['rowid'] for row in rows]}
+    )
+    rows = [row for row in rows if row['body']]
+    if rows:
+        connection.execute(
+            db.text('INSERT INTO search_index (rowid, kind, application_id, body) '
+                    'VALUES (:rowid, :kind, :application_id, :body)'),
+            rows
+        )
+
+def archived_documents(record):
+    """index_documents() input for everything an ArchiveRecord held searchable"""
+    application = record.application
+    return [('application', application.id, application.id, application_document(application))] + [
+        ('comment', comment.id, application.id, comment.content) for comment in record.comments
+    ] + [
+        ('rejection', vote.id, application.id, vote.rejection_reason) for vote in record.votes
+        if vote.vote_type == VoteType.REJECT and vote.rejection_reason
+    ]
+
+def rebuild_search_index(batch_size=1000):
+    """Drop and refill the search index from the application, comment and vote tables and the archive"""
+    global search_index_ready
+    connection = db.session.connection()
+    if connection.dialect.name not in SEARCH_BACKENDS:
+        return 0
+    connection.exec_driver_sql('DROP TABLE IF EXISTS search_index')
+    create_search_index(connection)
+    search_index_ready = True
     
+    sources = [
+        db.select(db.literal('application'), GrantApplication.id, GrantApplication.id,
+                  GrantApplication.candidate_full_name, GrantApplication.place, GrantApplication.description),
+        db.select(db.literal('comment'), Comment.id, Comment.application_id, Comment.content),
+        db.select(db.literal('rejection'), Vote.id, Vote.application_id, Vote.rejection_reason)
+        .where(Vote.vote_type == VoteType.REJECT, Vote.rejection_reason.is_not(None)),
+    ]
+    count = 0
+    for source in sources:
+        rows = db.session.execute(source.execution_options(yield_per=batch_size))
+        for batch in rows.partitions():
+            index_documents([
+                (kind, source_id, application_id, '\n'.join(filter(None, texts)))
+                for kind, source_id, application_id, *texts in batch
+            ])
+            count += len(batch)
+    archived = db.session.execute(db.select(ArchivedApplication.payload).execution_options(yield_per=batch_size))
+    for batch in archived.partitions():
+        documents = [document for (payload,) in batch for document in archived_documents(unpack_archive(payload))]
+        index_documents(documents)
+        count += len(documents)
+    db.session.commit()
+    return count
+
+# Matches keep their application once it is archived; documents of deleted ones are dropped
+SEARCH_APPLICATION_COLUMNS = ('COALESCE(grant_application.reference_code, archived_application.reference_code) '
+                              'AS reference_code, COALESCE(grant_application.candidate_full_name, '
+                              'archived_application.candidate_full_name) AS candidate_full_name')
+SEARCH_APPLICATION_JOIN = ('LEFT JOIN grant_application ON grant_application.id = {source}.application_id '
+                           'LEFT JOIN archived_application ON archived_application.id = {source}.application_id')
+SEARCH_APPLICATION_FOUND = 'COALESCE(grant_application.id, archived_application.id) IS NOT NULL'
+
+def search_documents(query, kind=None, limit=20):
+    """Best matches for query as (kind, source_id, application_id, reference_code, candidate, snippet, score).
+
+    The matches are ranked first and only the returned ones get a snippet
+    and their application joined; ranking is the cost that grows with the
+    number of matching documents.
+    """
+    connection = db.session.connection()
+    params = {'limit': limit, 'kind': kind}
+    kind_filter = 'AND kind = :kind' if kind else ''
+    
+    if connection.dialect.name == 'sqlite':
+        # Every word quoted, so user input never hits FTS5 query syntax
+        params['query'] = ' '.join('"' + word.replace('"', '""') + '"' for word in query.split())
+        scores = dict(connection.execute(db.text(f"""
+            SELECT rowid, -bm25(search_index) FROM search_index
+            WHERE search_index MATCH :query {kind_filter}
+            ORDER BY bm25(search_index) LIMIT :limit
+        """), params).all())
+        if not scores:
+            return []
+        rows = connection.execute(db.text(f"""
+            SELECT search_index.rowid, search_index.kind, search_index.application_id,
+                   {SEARCH_APPLICATION_COLUMNS},
+                   snippet(search_index, 2, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 16) AS snippet
+            FROM search_index {SEARCH_APPLICATION_JOIN.format(source='search_index')}
+            WHERE search_index MATCH :query AND search_index.rowid IN :rowids AND {SEARCH_APPLICATION_FOUND}
+        """).bindparams(db.bindparam('rowids', expanding=True)), {**params, 'rowids': list(scores)}).all()
+    else:
+        params['query'] = query
+        rows = connection.execute(db.text(f"""
+            SELECT best.rowid, best.kind, best.application_id,
+                   {SEARCH_APPLICATION_COLUMNS},
+                   ts_headline('simple', best.body, websearch_to_tsquery('simple', :query),
+                               'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxFragments=2') AS snippet,
+                   best.score
+            FROM (
+                SELECT rowid, kind, application_id, body,
+                       ts_rank(document, websearch_to_tsquery('simple', :query)) AS score
+                FROM search_index
+                WHERE document @@ websearch_to_tsquery('simple', :query) {kind_filter}
+                ORDER BY score DESC LIMIT :limit
+            ) AS best
+            {SEARCH_APPLICATION_JOIN.format(source='best')}
+            WHERE {SEARCH_APPLICATION_FOUND}
+        """), params).all()
+        scores = {row.rowid: row.score for row in rows}
+    
+    return sorted([
+        (row.kind, row.rowid // 4, row.application_id, row.reference_code, row.candidate_full_name,
+         row.snippet, scores[row.rowid])
+        for row in rows
+    ], key=lambda result: -result[-1])
+
+def highlight(snippet):
+    """HTML-escape a search snippet and turn its match markers into <mark> tags"""
+    return html.escape(snippet).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+def send_voting_notification(application_ids):
+    """Queue the voting emails for the not yet delivered ballots of the given applications.
+
+    In digest mode the ballots stay queued for the next send_digests() run.
+    """
+    if current_app.config['NOTIFICATION_MODE'] == 'digest':
+        return
+    
+    vote_ids = db.session.scalars(
+        db.select(Vote.id).where(
+            Vote.application_id.in_(application_ids),
+            Vote.delivery_status == 'queued'
+        )
+    ).all()
+    
+    dispatcher.enqueue(vote_ids)
+
+# Hot/cold archival: finalized applications leave the working tables once they
+# are old enough, and the read endpoints fall back to archived_application
+ArchiveRecord = namedtuple('ArchiveRecord', 'application tally votes comments')
+
+HOT_TABLES = (GrantApplication, ApplicationTally, Vote, VoteChange, Comment)
+
+def encode_row(instance, exclude=()):
+    """Column values of a model instance, JSON-safe: enums by name, dates in ISO format"""
+    row = {}
+    for column in instance.__table__.columns:
+        if column.key in exclude:
+            continue
+        value = getattr(instance, column.key)
+        if isinstance(value, Enum):
+            value = value.name
+        elif isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        row[column.key] = value
+    return row
+
+def archived_row_type(model):
+    """A namedtuple with model's column attributes plus voter, and the parser of each column"""
+    parsers = []
+    for column in model.__table__.columns:
+        if isinstance(column.type, db.Enum):
+            parsers.append((column.key, column.type.enum_class.__getitem__))
+        elif isinstance(column.type, db.DateTime):
+            parsers.append((column.key, datetime.fromisoformat))
+        elif isinstance(column.type, db.Date):
+            parsers.append((column.key, date.fromisoformat))
+        else:
+            parsers.append((column.key, None))
+    return namedtuple(f'Archived{model.__name__}', [key for key, _ in parsers] + ['voter']), parsers
+
+# Archived rows are read into these rather than model instances, which cost
+# several times more to build; the serializers only read their attributes
+ARCHIVED_ROW_TYPES = {model: archived_row_type(model) for model in (GrantApplication, Vote, Comment)}
+ArchivedVoter = namedtuple('ArchivedVoter', 'name position')
+
+def decode_row(model, row, voter=None):
+    """The ARCHIVED_ROW_TYPES stand-in for a model instance from its encode_row() output"""
+    row_type, parsers = ARCHIVED_ROW_TYPES[model]
+    values = []
+    for key, parse in parsers:
+        value = row.get(key)
+        values.append(parse(value) if parse and value is not None else value)
+    return row_type(*values, voter)
+
+def unpack_archive(payload):
+    """ArchiveRecord of the archived rows, shaped like the live rows the serializers take"""
+    data = loads(zlib.decompress(payload))
+    voters = {int(voter_id): ArchivedVoter(**voter) for voter_id, voter in data['voters'].items()}
+    votes = [decode_row(Vote, row, voters[row['voter_id']]) for row in data['votes']]
+    comments = [decode_row(Comment, row, voters[row['voter_id']]) for row in data['comments']]
+    tally = data['tally']
+    tally['last_vote_at'] = tally['last_vote_at'] and datetime.fromisoformat(tally['last_vote_at'])
+    return ArchiveRecord(decode_row(GrantApplication, data['application']), tally, votes, comments)
+
+def load_archived(application_ids):
+    """ArchiveRecords of the archived applications among application_ids, in one query"""
+    rows = db.session.execute(
+        db.select(ArchivedApplication.id, ArchivedApplication.payload)
+        .where(ArchivedApplication.id.in_(application_ids))
+    )
+    return {application_id: unpack_archive(payload) for application_id, payload in rows}
+
+def archive_batch(application_ids):
+    """Move one batch into archived_application in the current transaction; returns (raw, compressed) bytes.
+
+    The first statement is a write, so on SQLite the batch holds the write
+    lock before it reads anything and no ballot or comment can slip in
+    between reading and deleting. Elsewhere a late comment makes the final
+    DELETE fail its foreign key and the batch is rolled back.
+    """
+    rows = db.session.execute(
+        db.delete(ApplicationTally).where(ApplicationTally.application_id.in_(application_ids))
+        .returning(ApplicationTally).execution_options(synchronize_session=False)
+    ).scalars().all()
+    tallies = {row.application_id: tally_from_row(row) for row in rows}
+    missing = [application_id for application_id in application_ids if application_id not in tallies]
+    if missing:
+        tallies.update(tally_votes(missing))
+    
+    owned = {application_id: {'votes': [], 'vote_changes': [], 'comments': []} for application_id in application_ids}
+    for key, model in (('votes', Vote), ('vote_changes', VoteChange), ('comments', Comment)):
+        for instance in db.session.scalars(
+            db.select(model).where(model.application_id.in_(application_ids)).order_by(model.id)
+        ):
+            owned[instance.application_id][key].append(instance)
+    voter_ids = {item.voter_id for rows in owned.values() for item in rows['votes'] + rows['comments']}
+    voters = {member.id: {'name': member.name, 'position': member.position} for member in db.session.scalars(
+        db.select(VotingMember).where(VotingMember.id.in_(voter_ids))
+    )}
+    
+    archived = []
+    raw_bytes = compressed_bytes = 0
+    for application in db.session.scalars(db.select(GrantApplication).where(GrantApplication.id.in_(application_ids))):
+        tally = tallies[application.id]
+        rows = owned[application.id]
+        payload = dumps({
+            'application': encode_row(application),
+            'tally': {**tally, 'last_vote_at': tally['last_vote_at'] and tally['last_vote_at'].isoformat()},
+            # Ballot tokens only open the voting page, which a closed application no longer
+            # serves; being random they would also be most of the compressed payload
+            **{key: [encode_row(instance, exclude=('token',)) for instance in instances]
+               for key, instances in rows.items()},
+            'voters': {item.voter_id: voters[item.voter_id] for item in rows['votes'] + rows['comments']}
+        })
+        compressed = zlib.compress(payload)
+        raw_bytes += len(payload)
+        compressed_bytes += len(compressed)
+        archived.append({
+            **{column: getattr(application, column) for column in (
+                'id', 'reference_code', 'candidate_full_name', 'grant_type', 'date', 'place',
+                'amount_requested', 'currency', 'outcome', 'finalized_at'
+            )},
+            'accept': tally['accept'],
+            'reject': tally['reject'],
+            'last_vote_at': tally['last_vote_at'],
+            'payload': compressed
+        })
+    db.session.execute(db.insert(ArchivedApplication), archived)
+    
+    for key, model in (('vote_changes', VoteChange), ('comments', Comment), ('votes', Vote)):
+        ids = [instance.id for rows in owned.values() for instance in rows[key]]
+        if ids:
+            db.session.execute(db.delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+    db.session.execute(db.delete(GrantApplication).where(GrantApplication.id.in_(application_ids))
+                       .execution_options(synchronize_session=False))
+    return raw_bytes, compressed_bytes
+
+def archive_applications(finalized_before, batch_size):
+    """Move applications finalized before finalized_before, with everything they own, to archived_application.
+
+    Each batch of batch_size applications is one transaction. Returns the
+    number archived and skipped (a batch that lost a race is left for the
+    next run) and the payload bytes before and after compression.
+    """
+    # SQLite hands out max(rowid) + 1, so the applications holding the highest
+    # ids stay behind; deleting those rows would let new rows reuse archived ids
+    newest = set(db.session.execute(db.select(
+        db.select(db.func.max(GrantApplication.id)).scalar_subquery(),
+        db.select(Vote.application_id).order_by(Vote.id.desc()).limit(1).scalar_subquery(),
+        db.select(VoteChange.application_id).order_by(VoteChange.id.desc()).limit(1).scalar_subquery(),
+        db.select(Comment.application_id).order_by(Comment.id.desc()).limit(1).scalar_subquery()
+    )).one()) - {None}
+    candidates = db.session.scalars(
+        db.select(GrantApplication.id).where(
+            GrantApplication.finalized_at < finalized_before,
+            GrantApplication.id.not_in(newest)
+        ).order_by(GrantApplication.id)
+    ).all()
+    db.session.commit()
+    
+    stats = {'archived': 0, 'skipped': 0, 'raw_bytes': 0, 'compressed_bytes': 0}
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+        try:
+            raw_bytes, compressed_bytes = archive_batch(batch)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            stats['skipped'] += len(batch)
+            continue
+        db.session.expunge_all()
+        stats['archived'] += len(batch)
+        stats['raw_bytes'] += raw_bytes
+        stats['compressed_bytes'] += compressed_bytes
+        moved = set(batch)
+        token_cache.discard_where(lambda ballot: ballot.application_id in moved)
+    return stats
+
+def table_sizes(models):
+    """Bytes of each model's table plus its indexes, None where the database does not report them"""
+    connection = db.session.connection()
+    names = [model.__tablename__ for model in models]
+    if connection.dialect.name == 'postgresql':
+        return {name: connection.execute(db.text('SELECT pg_total_relation_size(:name)'), {'name': name}).scalar()
+                for name in names}
+    if connection.dialect.name == 'sqlite':
+        try:
+            sizes = dict(connection.exec_driver_sql(
+                'SELECT m.tbl_name, SUM(s.pgsize) FROM dbstat s JOIN sqlite_master m ON m.name = s.name '
+                'GROUP BY m.tbl_name'
+            ).all())
+        except OperationalError:  # SQLite built without the dbstat table
+            return dict.fromkeys(names)
+        return {name: sizes.get(name, 0) for name in names}
+    return dict.fromkeys(names)
+
+def hot_path_latency(rounds=200, scans=3):
+    """Median milliseconds of the queries behind token lookups, tallies, comment pages and the listing.
+
+    Each lookup runs against rounds randomly sampled ballots of the hot
+    tables; the full tally scan behind rebuild-tallies and check-tallies,
+    which grows with the whole vote table, runs scans times.
+    """
+    sample = db.session.execute(
+        db.select(Vote.token, Vote.application_id).order_by(db.func.random()).limit(rounds)
+    ).all()
+    probes = {
+        'token lookup': lambda token, application_id: db.select(
+            Vote.id, Vote.application_id, Vote.voter_id, GrantApplication.voting_deadline
+        ).join(GrantApplication).where(Vote.token == token),
+        'tally': lambda token, application_id: tally_query([application_id]),
+        'comment page': lambda token, application_id: comment_roots_query(
+            application_id, current_app.config['COMMENTS_PAGE_SIZE']
+        ),
+        'open applications page': lambda token, application_id: db.select(GrantApplication).where(
+            GrantApplication.is_active
+        ).order_by(GrantApplication.voting_deadline, GrantApplication.id).limit(
+            current_app.config['APPLICATIONS_PAGE_SIZE']
+        ),
+    }
+    latency = {}
+    for label, probe in probes.items():
+        timings = []
+        for token, application_id in sample:
+            started = time.perf_counter()
+            db.session.execute(probe(token, application_id)).all()
+            timings.append(time.perf_counter() - started)
+        latency[label] = round(statistics.median(timings) * 1000, 3) if timings else None
+    timings = []
+    for _ in range(scans):
+        started = time.perf_counter()
+        db.session.execute(tally_query()).all()
+        timings.append(time.perf_counter() - started)
+    latency['full tally scan'] = round(statistics.median(timings) * 1000, 3)
+    return latency
+
+def archive_report():
+    """Row counts, sizes and hot-path query latency of the working tables, plus the archive's size"""
+    counts = db.session.execute(db.select(*[
+        db.select(db.func.count()).select_from(model).scalar_subquery() for model in HOT_TABLES + (ArchivedApplication,)
+    ])).one()
+    sizes = table_sizes(HOT_TABLES + (ArchivedApplication,))
+    report = {
+        'rows': dict(zip(sizes, counts)),
+        'bytes': sizes,
+        'latency_ms': hot_path_latency()
+    }
     db.session.commit()
+    return report
+
+# Routes by area; CLI commands are registered at the top level of 'flask'
+main_bp = Blueprint('main', __name__, cli_group=None)
+members_bp = Blueprint('members', __name__, cli_group=None)
+applications_bp = Blueprint('applications', __name__, cli_group=None)
+voting_bp = Blueprint('voting', __name__, cli_group=None)
+comments_bp = Blueprint('comments', __name__, cli_group=None)
+results_bp = Blueprint('results', __name__, cli_group=None)
+
+@main_bp.before_app_request
+def start_scheduler():
+    scheduler.start()
+
+@main_bp.before_app_request
+def start_request_timer():
+    if not (current_app.config['METRICS_ENABLED'] or current_app.config['PROFILE_SLOW_REQUESTS']):
+        return
+    g.request_started = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+    if current_app.config['PROFILE_SLOW_REQUESTS']:
+        profiler.begin()
+
+@main_bp.before_app_request
+def enforce_rate_limits():
+    """Answer 429 once the client IP or the voting token has used up its bucket"""
+    view = (request.endpoint or '').rpartition('.')[2]  # RATE_LIMITS is keyed without the blueprint name
+    if not current_app.config['RATE_LIMIT_ENABLED'] or view not in current_app.config['RATE_LIMITS']:
+        return
+    header = current_app.config['RATE_LIMIT_CLIENT_IP_HEADER']
+    ip = (request.headers.get(header) if header else None) or request.remote_addr
+    token = request.view_args.get('token')
+    wait = rate_limiter.check(view, ip, token if token and TOKEN_PATTERN.fullmatch(token) else None)
+    if wait:
+        response = jsonify({'error': 'Too many requests, please retry later'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(math.ceil(wait))
+        return response
+
+def compress_response(response, accept_encodings, config):
+    """Compress response in place with the best encoding accept_encodings allows (brotli, then gzip).
+
+    Only buffered bodies of a COMPRESS_MIMETYPES type reaching COMPRESS_MIN_SIZE
+    are compressed; streamed exports and event streams pass through as they are.
+    """
+    if not config['COMPRESS_ENABLED'] or response.direct_passthrough or response.is_streamed:
+        return response
+    if response.mimetype not in config['COMPRESS_MIMETYPES'] or 'Content-Encoding' in response.headers:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = accept_encodings.best_match(['br', 'gzip'] if brotli is not None else ['gzip'])
+    if encoding is None or response.status_code < 200 or response.status_code in (204, 304):
+        return response
+    body = response.get_data()
+    if len(body) < config['COMPRESS_MIN_SIZE']:
+        return response
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY']))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=config['COMPRESS_GZIP_LEVEL'], mtime=0))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # The bytes differ from the identity body the strong tag was computed for
+        response.set_etag(etag, weak=True)
+    return response
+
+@main_bp.after_app_request
+def note_response_status(response):
+    if 'request_started' in g:
+        g.response_status = response.status_code
+    return response
+
+@main_bp.teardown_app_request
+def record_request_metrics(exception):
+    """Record latency and SQL work of the request.
+
+    Runs at teardown, after every after_request hook, so requests whose view
+    raised are recorded too, as 500 when no response was made. Exports,
+    streamed with their request context, are timed to their last row; other
+    streamed bodies (event streams) until the first byte.
+    """
+    if 'request_started' not in g:
+        return
+    elapsed = time.perf_counter() - g.request_started
+    endpoint = request.endpoint or 'unmatched'
+    if current_app.config['METRICS_ENABLED']:
+        metrics.observe_request(endpoint, request.method, g.get('response_status', 500), elapsed,
+                                g.sql_queries, g.sql_seconds)
+    if current_app.config['PROFILE_SLOW_REQUESTS']:
+        profiler.end(endpoint, elapsed)
+
+@main_bp.after_app_request
+def compress(response):
+    return compress_response(response, request.accept_encodings, current_app.config)
 
 # API Routes
-@app.route('/')
+@main_bp.route('/')
 def home():
     return '''
     <html>
@@ -162,28 +2248,52 @@ def home():
     </html>
     '''
 
-@app.route('/health')
+@main_bp.route('/health')
 def health():
-    """Health check endpoint for monitoring"""
+    """Health check endpoint for monitoring, with a timed database round trip"""
+    started = time.perf_counter()
+    try:
+        db.session.execute(db.text('SELECT 1'))
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'status': 'unhealthy',
+            'database': 'unavailable',
+            'error': str(e),
+            'timestamp': datetime.utcnow()
+        }), 503
+    
     return jsonify({
         'status': 'healthy',
         'database': 'connected',
-        'timestamp': datetime.utcnow().isoformat()
+        'database_latency_ms': round((time.perf_counter() - started) * 1000, 3),
+        'timestamp': datetime.utcnow()
+    })
+
+@main_bp.route('/metrics')
+def prometheus_metrics():
+    """Request, SQL and mail metrics of this worker in Prometheus text format"""
+    if not current_app.config['METRICS_ENABLED']:
+        abort(404)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@main_bp.route('/api/cache/stats')
+def cache_stats():
+    """Hit, miss and eviction counters of the in-process caches"""
+    return jsonify({
+        'token': token_cache.stats(),
+        'vote_page_fragment': fragment_cache.stats(),
+        'funding_analytics': funding_cache.stats(),
+        'funding_frame': funding_frame.stats()
     })
 
-@app.route('/api/members', methods=['GET'])
+@members_bp.route('/api/members', methods=['GET'])
 def get_members():
     """Get all voting members"""
     members = VotingMember.query.all()
-    return jsonify([{
-        'id': m.id,
-        'name': m.name,
-        'position': m.position,
-        'email': m.email,
-        'is_active': m.is_active
-    } for m in members])
-
-@app.route('/api/members', methods=['POST'])
+    return jsonify([MEMBER_SCHEMA.dump(m) for m in members])
+
+@members_bp.route('/api/members', methods=['POST'])
 def add_member():
     """Add new voting member"""
     data = request.json
@@ -199,7 +2309,7 @@ def add_member():
     
     return jsonify({'message': 'Member added successfully', 'id': member.id})
 
-@app.route('/api/members/<int:member_id>', methods=['PUT'])
+@members_bp.route('/api/members/<int:member_id>', methods=['PUT'])
 def update_member(member_id):
     """Update voting member"""
     member = VotingMember.query.get_or_404(member_id)
@@ -211,44 +2321,39 @@ def update_member(member_id):
     member.is_active = data.get('is_active', member.is_active)
     
     db.session.commit()
+    token_cache.discard_where(lambda ballot: ballot.voter_id == member_id)
     
     return jsonify({'message': 'Member updated successfully'})
 
-@app.route('/api/members/<int:member_id>', methods=['DELETE'])
+@members_bp.route('/api/members/<int:member_id>', methods=['DELETE'])
 def deactivate_member(member_id):
     """Deactivate voting member"""
     member = VotingMember.query.get_or_404(member_id)
     member.is_active = False
     db.session.commit()
+    token_cache.discard_where(lambda ballot: ballot.voter_id == member_id)
     
     return jsonify({'message': 'Member deactivated successfully'})
 
-@app.route('/api/applications', methods=['POST'])
+@applications_bp.route('/api/applications', methods=['POST'])
 def create_application():
     """Create new grant application"""
     data = request.json
     
     # Generate unique reference code
-    ref_code = f"CA{secrets.randbelow(999999):06d}"
-    
-    application = GrantApplication(
-        reference_code=ref_code,
-        submitter_name=data['submitter_name'],
-        candidate_full_name=data['candidate_full_name'],
-        grant_type=GrantType(data['grant_type']),
-        date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
-        place=data['place'],
-        amount_requested=float(data['amount_requested']),
-        currency=data.get('currency', 'EUR'),
-        description=data.get('description', ''),
-        voting_deadline=datetime.strptime(data['voting_deadline'], '%Y-%m-%d %H:%M')
-    )
+    ref_code = generate_reference_code()
+    
+    application = GrantApplication(reference_code=ref_code, **parse_application(data))
     
     db.session.add(application)
+    db.session.flush()
+    issue_ballots([application.id])
+    index_documents([('application', application.id, application.id, application_document(application))])
     db.session.commit()
     
-    # Send voting notifications
-    send_voting_notification(application.id)
+    # Queue the voting emails; delivery happens in the background
+    send_voting_notification([application.id])
+    scheduler.schedule(application.id, application.voting_deadline)
     
     return jsonify({
         'message': 'Application created successfully',
@@ -256,260 +2361,1191 @@ def create_application():
         'id': application.id
     })
 
-@app.route('/api/applications/<int:app_id>', methods=['GET'])
+@applications_bp.route('/api/applications/bulk', methods=['POST'])
+def create_applications_bulk():
+    """Import many grant applications and issue all their ballots in one transaction"""
+    data = request.json
+    started = time.perf_counter()
+    
+    ref_codes = set()
+    rows = []
+    for item in data['applications']:
+        ref_code = generate_reference_code()
+        while ref_code in ref_codes:
+            ref_code = generate_reference_code()
+        ref_codes.add(ref_code)
+        rows.append({'reference_code': ref_code, **parse_application(item)})
+    
+    app_ids = db.session.scalars(
+        db.insert(GrantApplication).returning(GrantApplication.id, sort_by_parameter_order=True),
+        rows
+    ).all()
+    ballots = issue_ballots(app_ids)
+    index_documents([
+        ('application', app_id, app_id,
+         '\n'.join(filter(None, [row['candidate_full_name'], row['place'], row.get('description')])))
+        for app_id, row in zip(app_ids, rows)
+    ])
+    db.session.commit()
+    
+    elapsed = time.perf_counter() - started
+    rows_written = len(rows) + ballots
+    
+    send_voting_notification(app_ids)
+    for app_id, row in zip(app_ids, rows):
+        scheduler.schedule(app_id, row['voting_deadline'])
+    
+    return jsonify({
+        'message': f'{len(app_ids)} applications created successfully',
+        'applications': [{'id': app_id, 'reference_code': row['reference_code']}
+                         for app_id, row in zip(app_ids, rows)],
+        'ballots_issued': ballots,
+        'rows_written': rows_written,
+        'rows_per_second': round(rows_written / elapsed, 1) if elapsed else None
+    })
+
+def serialize_application(application, tally):
+    return {**APPLICATION_SCHEMA.dump(application), 'vote_summary': vote_summary(tally)}
+
+# ?sort= -> (keyset column, descending, cursor value parser)
+APPLICATION_SORTS = {
+    'deadline': (GrantApplication.voting_deadline, False, datetime.fromisoformat),
+    'date': (GrantApplication.date, True, date.fromisoformat),
+}
+
+@applications_bp.route('/api/applications', methods=['GET'])
+def list_applications():
+    """List applications with their vote summaries, one keyset page at a time.
+
+    Filters: grant_type (STSM, ...), is_active (true/false), deadline_from /
+    deadline_to (ISO datetimes), submitter (exact name) and candidate (name
+    prefix). Sorted by voting deadline (sort=deadline, soonest first) or by
+    grant date (sort=date, newest first); pass next_cursor as ?cursor= for
+    the following page.
+    """
+    args = request.args
+    limit = max(1, min(args.get('limit', current_app.config['APPLICATIONS_PAGE_SIZE'], type=int),
+                       current_app.config['APPLICATIONS_MAX_PAGE_SIZE']))
+    sort = args.get('sort', 'deadline')
+    if sort not in APPLICATION_SORTS:
+        return jsonify({'error': f"sort must be one of {', '.join(APPLICATION_SORTS)}"}), 400
+    column, descending, parse = APPLICATION_SORTS[sort]
+    
+    query = db.select(GrantApplication, ApplicationTally).outerjoin(
+        ApplicationTally, ApplicationTally.application_id == GrantApplication.id
+    )
+    try:
+        if 'grant_type' in args:
+            query = query.where(GrantApplication.grant_type == GrantType[args['grant_type'].upper()])
+        if 'is_active' in args:
+            query = query.where(GrantApplication.is_active == (args['is_active'].lower() in ('true', '1')))
+        if 'deadline_from' in args:
+            query = query.where(GrantApplication.voting_deadline >= datetime.fromisoformat(args['deadline_from']))
+        if 'deadline_to' in args:
+            query = query.where(GrantApplication.voting_deadline <= datetime.fromisoformat(args['deadline_to']))
+        if 'cursor' in args:
+            key = db.tuple_(column, GrantApplication.id)
+            cursor = decode_cursor(args['cursor'], parse)
+            query = query.where(key < cursor if descending else key > cursor)
+    except KeyError:
+        return jsonify({'error': 'Unknown grant_type'}), 400
+    except ValueError:
+        return jsonify({'error': 'Invalid date or cursor'}), 400
+    if 'submitter' in args:
+        query = query.where(GrantApplication.submitter_name == args['submitter'])
+    if args.get('candidate'):
+        # Case-insensitive prefix as a range on lower(name), so the expression index applies
+        prefix = args['candidate'].lower()
+        candidate = db.func.lower(GrantApplication.candidate_full_name)
+        query = query.where(candidate >= prefix, candidate < prefix + '\U0010ffff')
+    
+    order = [column.desc(), GrantApplication.id.desc()] if descending else [column, GrantApplication.id]
+    rows = db.session.execute(query.order_by(*order).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    # Applications created before the tally table existed are counted from their votes
+    missing = [application.id for application, tally in rows if tally is None]
+    fallback = tally_votes(missing) if missing else {}
+    
+    last = rows[-1][0] if rows else None
+    return jsonify({
+        'applications': [
+            serialize_application(application, tally_from_row(tally) if tally else fallback[application.id])
+            for application, tally in rows
+        ],
+        'next_cursor': encode_cursor(getattr(last, column.key), last.id) if has_more else None
+    })
+
+def parse_batch_ids():
+    """Read ?ids=1,2,3 (repeated ids dropped, order kept); returns (ids, error response)"""
+    try:
+        ids = list(dict.fromkeys(int(value) for value in request.args.get('ids', '').split(',') if value.strip()))
+    except ValueError:
+        return None, (jsonify({'error': 'ids must be a comma-separated list of application ids'}), 400)
+    if not ids:
+        return None, (jsonify({'error': 'ids is required'}), 400)
+    if len(ids) > current_app.config['BATCH_MAX_IDS']:
+        return None, (jsonify({'error': f"At most {current_app.config['BATCH_MAX_IDS']} ids per request"}), 400)
+    return ids, None
+
+def load_batch(ids):
+    """Load the applications among ids and their tallies: one IN query, plus a grouped
+    vote count for applications without a tally row and one archive lookup for the
+    ids not in the working tables. Returns (found, missing, archived records)."""
+    rows = db.session.execute(
+        db.select(GrantApplication, ApplicationTally).outerjoin(
+            ApplicationTally, ApplicationTally.application_id == GrantApplication.id
+        ).where(GrantApplication.id.in_(ids))
+    ).all()
+    missing = [application.id for application, tally in rows if tally is None]
+    fallback = tally_votes(missing) if missing else {}
+    found = {application.id: (application, tally_from_row(tally) if tally else fallback[application.id])
+             for application, tally in rows}
+    archived = load_archived([app_id for app_id in ids if app_id not in found]) if len(found) < len(ids) else {}
+    found.update((app_id, (record.application, record.tally)) for app_id, record in archived.items())
+    return ([found[app_id] for app_id in ids if app_id in found], [app_id for app_id in ids if app_id not in found],
+            archived)
+
+@applications_bp.route('/api/applications/batch', methods=['GET'])
+def get_applications_batch():
+    """Get the details of several applications (?ids=1,2,3) in one request.
+
+    Applications come back in the order asked for; ids that do not exist
+    are listed under missing.
+    """
+    ids, error = parse_batch_ids()
+    if error:
+        return error
+    found, missing, _ = load_batch(ids)
+    
+    return jsonify({
+        'applications': [{**serialize_application(application, tally), 'description': application.description}
+                         for application, tally in found],
+        'missing': missing
+    })
+
+def get_application_or_archived(app_id):
+    """The application and its tally, plus its ArchiveRecord if it was archived; aborts with 404"""
+    application = db.session.get(GrantApplication, app_id)
+    if application is not None:
+        return application, load_tallies([app_id])[app_id], None
+    record = load_archived([app_id]).get(app_id)
+    if record is None:
+        abort(404)
+    return record.application, record.tally, record
+
+@applications_bp.route('/api/applications/<int:app_id>', methods=['GET'])
 def get_application(app_id):
     """Get application details"""
-    app_obj = GrantApplication.query.get_or_404(app_id)
-    
-    votes = Vote.query.filter_by(application_id=app_id).all()
-    vote_summary = {
-        'accept': sum(1 for v in votes if v.vote_type == VoteType.ACCEPT),
-        'reject': sum(1 for v in votes if v.vote_type == VoteType.REJECT),
-        'total_voters': VotingMember.query.filter_by(is_active=True).count(),
-        'voted': len(votes)
-    }
+    app_obj, tally, _ = get_application_or_archived(app_id)
     
     return jsonify({
-        'id': app_obj.id,
-        'reference_code': app_obj.reference_code,
-        'submitter_name': app_obj.submitter_name,
-        'candidate_full_name': app_obj.candidate_full_name,
-        'grant_type': app_obj.grant_type.value,
-        'date': app_obj.date.isoformat(),
-        'place': app_obj.place,
-        'amount_requested': app_obj.amount_requested,
-        'currency': app_obj.currency,
-        'description': app_obj.description,
-        'voting_deadline': app_obj.voting_deadline.isoformat(),
-        'vote_summary': vote_summary
+        **serialize_application(app_obj, tally),
+        'description': app_obj.description
     })
 
-@app.route('/vote/<token>')
-def vote_page(token):
-    """Display voting page"""
-    vote = Vote.query.filter_by(token=token).first_or_404()
-    application = vote.application
+@applications_bp.route('/api/applications/<int:app_id>/notifications', methods=['GET'])
+def get_notification_status(app_id):
+    """Get delivery status of the voting emails for an application"""
+    GrantApplication.query.get_or_404(app_id)
     
-    # Check if voting is still active
-    if datetime.utcnow() > application.voting_deadline:
-        return "Voting period has ended", 400
+    votes = Vote.query.options(joinedload(Vote.voter)).filter_by(application_id=app_id).all()
     
-    template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Grant Voting - {{ application.reference_code }}</title>
-        <style>
-            body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
-            .header { background: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
-            .form-group { margin-bottom: 15px; }
-            .form-group label { display: block; margin-bottom: 5px; font-weight: bold; }
-            .form-group input, .form-group textarea, .form-group select { 
-                width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px; 
-            }
-            .vote-buttons { display: flex; gap: 10px; margin: 20px 0; }
-            .vote-btn { padding: 15px 30px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; }
-            .accept-btn { background: #28a745; color: white; }
-            .reject-btn { background: #dc3545; color: white; }
-            .rejection-reason { display: none; margin-top: 15px; }
-            .comments-section { margin-top: 30px; padding: 20px; background: #f8f9fa; border-radius: 8px; }
-            .comment { background: white; padding: 15px; margin-bottom: 10px; border-radius: 5px; border-left: 4px solid #007bff; }
-            .comment.support { border-left-color: #28a745; }
-            .comment.oppose { border-left-color: #dc3545; }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>Grant Voting: {{ application.reference_code }}</h1>
-            <p><strong>Voter:</strong> {{ voter.name }} ({{ voter.position }})</p>
+    summary = {'queued': 0, 'sent': 0, 'failed': 0}
+    for v in votes:
+        summary[v.delivery_status] = summary.get(v.delivery_status, 0) + 1
+    
+    return jsonify({
+        'summary': summary,
+        'deliveries': [DELIVERY_SCHEMA.dump(v) for v in votes]
+    })
+
+@applications_bp.route('/api/applications/<int:app_id>/pending', methods=['GET'])
+def get_pending_voters(app_id):
+    """Get the members who have not voted on an application yet"""
+    GrantApplication.query.get_or_404(app_id)
+    
+    members = db.session.execute(
+        db.select(VotingMember).join(Vote).where(
+            Vote.application_id == app_id,
+            Vote.state == BallotState.ISSUED
+        )
+    ).scalars().all()
+    
+    return jsonify([VOTER_SCHEMA.dump(m) for m in members])
+
+# Voting page templates are compiled once at import; only the application
+# details fragment is cached, keyed by application id and updated_at.
+VOTE_PAGE_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Grant Voting - {{ application.reference_code }}</title>
+    <style>
+        body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
+        .header { background: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
+        .form-group { margin-bottom: 15px; }
+        .form-group label { display: block; margin-bottom: 5px; font-weight: bold; }
+        .form-group input, .form-group textarea, .form-group select { 
+            width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px; 
+        }
+        .vote-buttons { display: flex; gap: 10px; margin: 20px 0; }
+        .vote-btn { padding: 15px 30px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; }
+        .accept-btn { background: #28a745; color: white; }
+        .reject-btn { background: #dc3545; color: white; }
+        .rejection-reason { display: none; margin-top: 15px; }
+        .comments-section { margin-top: 30px; padding: 20px; background: #f8f9fa; border-radius: 8px; }
+        .comment { background: white; padding: 15px; margin-bottom: 10px; border-radius: 5px; border-left: 4px solid #007bff; }
+        .comment.support { border-left-color: #28a745; }
+        .comment.oppose { border-left-color: #dc3545; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Grant Voting: {{ application.reference_code }}</h1>
+        <p><strong>Voter:</strong> {{ voter.name }} ({{ voter.position }})</p>
+    </div>
+
+    {{ application_details }}
+
+    <form id="voteForm" action="/api/vote/{{ token }}" method="POST">
+        <h2>Your Vote</h2>
+        <div class="vote-buttons">
+            <button type="button" class="vote-btn accept-btn" onclick="selectVote('accept')">Accept</button>
+            <button type="button" class="vote-btn reject-btn" onclick="selectVote('reject')">Reject</button>
         </div>
-        
-        <div class="application-details">
-            <h2>Application Details</h2>
-            <p><strong>Candidate:</strong> {{ application.candidate_full_name }}</p>
-            <p><strong>Grant Type:</strong> {{ application.grant_type.value }}</p>
-            <p><strong>Date:</strong> {{ application.date }}</p>
-            <p><strong>Place:</strong> {{ application.place }}</p>
-            <p><strong>Amount Requested:</strong> {{ application.amount_requested }} {{ application.currency }}</p>
-            {% if application.description %}
-            <p><strong>Description:</strong> {{ application.description }}</p>
-            {% endif %}
+
+        <input type="hidden" id="voteType" name="vote_type" required>
+
+        <div id="rejectionReason" class="rejection-reason">
+            <div class="form-group">
+                <label for="reason">Rejection Reason (Required for rejection):</label>
+                <textarea id="reason" name="rejection_reason" rows="4" placeholder="Please provide detailed justification for rejection..."></textarea>
+            </div>
         </div>
-        
-        <form id="voteForm" action="/api/vote/{{ token }}" method="POST">
-            <h2>Your Vote</h2>
-            <div class="vote-buttons">
-                <button type="button" class="vote-btn accept-btn" onclick="selectVote('accept')">Accept</button>
-                <button type="button" class="vote-btn reject-btn" onclick="selectVote('reject')">Reject</button>
+
+        <button type="submit" style="background: #007bff; color: white; padding: 12px 24px; border: none; border-radius: 4px; font-size: 16px; cursor: pointer;">Submit Vote</button>
+    </form>
+
+    <div class="comments-section">
+        <h2>Discussion</h2>
+        <form id="commentForm" action="/api/comment/{{ token }}" method="POST">
+            <div class="form-group">
+                <label for="comment">Add Comment:</label>
+                <textarea id="comment" name="content" rows="3" placeholder="Share your thoughts or questions..."></textarea>
             </div>
-            
-            <input type="hidden" id="voteType" name="vote_type" required>
-            
-            <div id="rejectionReason" class="rejection-reason">
-                <div class="form-group">
-                    <label for="reason">Rejection Reason (Required for rejection):</label>
-                    <textarea id="reason" name="rejection_reason" rows="4" placeholder="Please provide detailed justification for rejection..."></textarea>
-                </div>
+            <div class="form-group">
+                <label>
+                    <input type="radio" name="is_supportive" value="true"> Support Application
+                </label>
+                <label>
+                    <input type="radio" name="is_supportive" value="false"> Oppose Application
+                </label>
+                <label>
+                    <input type="radio" name="is_supportive" value="" checked> Neutral Comment
+                </label>
             </div>
-            
-            <button type="submit" style="background: #007bff; color: white; padding: 12px 24px; border: none; border-radius: 4px; font-size: 16px; cursor: pointer;">Submit Vote</button>
+            <input type="hidden" id="parentComment" name="parent_comment_id" value="">
+            <p id="replyingTo" style="display: none;"></p>
+            <button type="submit">Add Comment</button>
         </form>
-        
-        <div class="comments-section">
-            <h2>Discussion</h2>
-            <form id="commentForm" action="/api/comment/{{ token }}" method="POST">
-                <div class="form-group">
-                    <label for="comment">Add Comment:</label>
-                    <textarea id="comment" name="content" rows="3" placeholder="Share your thoughts or questions..."></textarea>
-                </div>
-                <div class="form-group">
-                    <label>
-                        <input type="radio" name="is_supportive" value="true"> Support Application
-                    </label>
-                    <label>
-                        <input type="radio" name="is_supportive" value="false"> Oppose Application
-                    </label>
-                    <label>
-                        <input type="radio" name="is_supportive" value="" checked> Neutral Comment
-                    </label>
-                </div>
-                <button type="submit">Add Comment</button>
-            </form>
-            
-            <div id="comments">
-                <!-- Comments will be loaded here -->
-            </div>
+
+        <div id="comments">
+            <!-- Comments will be loaded here -->
         </div>
-        
-        <script>
-            function selectVote(type) {
-                document.getElementById('voteType').value = type;
-                document.querySelectorAll('.vote-btn').forEach(btn => btn.style.opacity = '0.5');
-                document.querySelector('.' + type + '-btn').style.opacity = '1';
-                
-                if (type === 'reject') {
-                    document.getElementById('rejectionReason').style.display = 'block';
-                    document.getElementById('reason').required = true;
-                } else {
-                    document.getElementById('rejectionReason').style.display = 'none';
-                    document.getElementById('reason').required = false;
-                }
+        <button type="button" id="loadMoreComments" style="display: none;" onclick="loadComments(nextCursor)">Load more comments</button>
+    </div>
+
+    <script>
+        function selectVote(type) {
+            document.getElementById('voteType').value = type;
+            document.querySelectorAll('.vote-btn').forEach(btn => btn.style.opacity = '0.5');
+            document.querySelector('.' + type + '-btn').style.opacity = '1';
+
+            if (type === 'reject') {
+                document.getElementById('rejectionReason').style.display = 'block';
+                document.getElementById('reason').required = true;
+            } else {
+                document.getElementById('rejectionReason').style.display = 'none';
+                document.getElementById('reason').required = false;
             }
-            
-            // Load comments
-            fetch('/api/comments/{{ application.id }}')
+        }
+
+        function replyTo(commentId, voterName) {
+            document.getElementById('parentComment').value = commentId;
+            document.getElementById('replyingTo').textContent = 'Replying to ' + voterName;
+            document.getElementById('replyingTo').style.display = 'block';
+            document.getElementById('comment').focus();
+        }
+
+        function renderComment(comment, container, depth) {
+            const div = document.createElement('div');
+            div.id = 'comment-' + comment.id;
+            div.dataset.depth = depth;
+            div.className = 'comment' + (comment.is_supportive === true ? ' support' : comment.is_supportive === false ? ' oppose' : '');
+            div.style.marginLeft = (depth * 30) + 'px';
+            // Names and content are set as text, never parsed as HTML or script
+            const author = document.createElement('strong');
+            author.textContent = comment.voter_name + ' (' + comment.voter_position + ')';
+            const time = document.createElement('small');
+            time.style.float = 'right';
+            time.textContent = new Date(comment.created_at).toLocaleString();
+            const content = document.createElement('p');
+            content.textContent = comment.content;
+            const reply = document.createElement('a');
+            reply.href = '#commentForm';
+            reply.textContent = 'Reply';
+            reply.addEventListener('click', () => replyTo(comment.id, comment.voter_name));
+            div.append(author, time, content, reply);
+            container.appendChild(div);
+            comment.replies.forEach(reply => renderComment(reply, container, depth + 1));
+            return div;
+        }
+
+        // Load comments one page at a time
+        let nextCursor = null;
+        function loadComments(cursor) {
+            fetch('/api/comments/{{ application.id }}' + (cursor ? '?cursor=' + encodeURIComponent(cursor) : ''))
                 .then(response => response.json())
-                .then(comments => {
+                .then(page => {
                     const commentsDiv = document.getElementById('comments');
-                    comments.forEach(comment => {
-                        const div = document.createElement('div');
-                        div.className = 'comment' + (comment.is_supportive === true ? ' support' : comment.is_supportive === false ? ' oppose' : '');
-                        div.innerHTML = `
-                            <strong>${comment.voter_name} (${comment.voter_position})</strong>
-                            <small style="float: right;">${new Date(comment.created_at).toLocaleString()}</small>
-                            <p>${comment.content}</p>
-                        `;
-                        commentsDiv.appendChild(div);
-                    });
+                    page.comments.forEach(comment => renderComment(comment, commentsDiv, 0));
+                    nextCursor = page.next_cursor;
+                    document.getElementById('loadMoreComments').style.display = nextCursor ? 'block' : 'none';
                 });
-        </script>
-    </body>
-    </html>
-    """
+        }
+        loadComments(null);
+
+        {% if events_enabled %}
+        // New comments arrive live: top-level ones on top, replies below their parent
+        const events = new EventSource('/api/events/{{ application.id }}');
+        events.addEventListener('comment', event => {
+            const comment = JSON.parse(event.data);
+            if (document.getElementById('comment-' + comment.id)) return;
+            const commentsDiv = document.getElementById('comments');
+            const parent = comment.parent_comment_id && document.getElementById('comment-' + comment.parent_comment_id);
+            if (comment.parent_comment_id && !parent) return;  // thread not loaded yet
+            const div = renderComment(comment, commentsDiv, parent ? Number(parent.dataset.depth) + 1 : 0);
+            if (parent) {
+                parent.after(div);
+            } else {
+                commentsDiv.prepend(div);
+            }
+        });
+        {% endif %}
+    </script>
+</body>
+</html>
+"""
+
+APPLICATION_DETAILS_TEMPLATE = """
+<div class="application-details">
+    <h2>Application Details</h2>
+    <p><strong>Candidate:</strong> {{ application.candidate_full_name }}</p>
+    <p><strong>Grant Type:</strong> {{ application.grant_type.value }}</p>
+    <p><strong>Date:</strong> {{ application.date }}</p>
+    <p><strong>Place:</strong> {{ application.place }}</p>
+    <p><strong>Amount Requested:</strong> {{ application.amount_requested }} {{ application.currency }}</p>
+    {% if application.description %}
+    <p><strong>Description:</strong> {{ application.description }}</p>
+    {% endif %}
+</div>
+"""
+
+
+fragment_cache = LRUCache(0)  # sized from VOTE_PAGE_FRAGMENT_CACHE_SIZE by create_app()
+
+def render_application_details(application):
+    """Render the application details fragment, reusing it until the application changes"""
+    key = (application.id, application.updated_at)
+    fragment = fragment_cache.get(key)
+    if fragment is None:
+        fragment = Markup(inline_template(APPLICATION_DETAILS_TEMPLATE).render(application=application))
+        fragment_cache.set(key, fragment)
+    return fragment
+
+@voting_bp.route('/vote/<token>')
+def vote_page(token):
+    """Display voting page"""
+    ballot = resolve_token(token)
+    
+    # Check if voting is still active
+    if datetime.utcnow() > ballot.deadline:
+        return "Voting period has ended", 400
+    
+    vote = Vote.query.options(
+        joinedload(Vote.application), joinedload(Vote.voter)
+    ).filter_by(id=ballot.vote_id).one()
+    application = vote.application
+    
+    if vote.state == BallotState.EXPIRED:
+        return "Voting period has ended", 400
+    
+    etag = hashlib.sha1(
+        f"{token}:{application.updated_at}:{vote.state.name}:{vote.version}:{vote.voter.name}:{vote.voter.position}:"
+        f"{current_app.config['EVENTS_ENABLED']}".encode()
+    ).hexdigest()
+    # The page changes with the application and with the ballot (voted_at moves with every vote)
+    last_modified = max(filter(None, [application.updated_at, application.created_at, vote.voted_at]))
     
-    return render_template_string(template, 
-                                 application=application, 
-                                 voter=vote.voter, 
-                                 token=token)
+    # Repeat visits revalidate with If-None-Match / If-Modified-Since
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = make_response('', 304)
+    else:
+        response = make_response(inline_template(VOTE_PAGE_TEMPLATE).render(
+            application=application,
+            application_details=render_application_details(application),
+            voter=vote.voter,
+            token=token,
+            events_enabled=current_app.config['EVENTS_ENABLED']
+        ))
+    
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def replay_vote_submission(vote_id, idempotency_key, vote_type, rejection_reason):
+    """Response for a submission already recorded under idempotency_key, or None if there is none"""
+    change = VoteChange.query.filter_by(vote_id=vote_id, idempotency_key=idempotency_key).first()
+    if change is None:
+        return None
+    if (change.vote_type, change.rejection_reason) != (vote_type, rejection_reason):
+        return jsonify({'error': 'Idempotency-Key was already used for a different vote'}), 422
+    response = jsonify({'message': 'Vote submitted successfully', 'vote': change.vote_type,
+                        'version': change.version})
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
 
-@app.route('/api/vote/<token>', methods=['POST'])
+@voting_bp.route('/api/vote/<token>', methods=['POST'])
 def submit_vote(token):
-    """Submit vote"""
-    vote = Vote.query.filter_by(token=token).first_or_404()
+    """Submit (or change) a vote.
+
+    The ballot is claimed with a conditional UPDATE: on ISSUED state for a
+    first vote, on the version read for a changed vote, so concurrent
+    submissions for one token are applied one at a time and counted once.
+    A client that sends the version it last saw (form field version) gets a
+    409 instead of overwriting a newer vote. A request repeated with the same
+    Idempotency-Key header returns the recorded result without voting again.
+    """
+    ballot = resolve_token(token)
     
     # Check if voting is still active
-    if datetime.utcnow() > vote.application.voting_deadline:
+    if datetime.utcnow() > ballot.deadline:
         return jsonify({'error': 'Voting period has ended'}), 400
     
     data = request.form
-    vote_type = VoteType(data['vote_type'].upper())
+    try:
+        vote_type = VoteType[data['vote_type'].upper()]
+    except KeyError:
+        return jsonify({'error': 'vote_type must be accept or reject'}), 400
+    rejection_reason = data.get('rejection_reason') if vote_type == VoteType.REJECT else None
+    if vote_type == VoteType.REJECT and not rejection_reason:
+        return jsonify({'error': 'Rejection reason is required'}), 400
+    expected_version = data.get('version', type=int)
     
-    vote.vote_type = vote_type
-    vote.voted_at = datetime.utcnow()
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if idempotency_key:
+        replay = replay_vote_submission(ballot.vote_id, idempotency_key, vote_type, rejection_reason)
+        if replay is not None:
+            return replay
+    
+    now = datetime.utcnow()
+    values = {
+        'state': BallotState.CAST,
+        'vote_type': vote_type,
+        'rejection_reason': rejection_reason,
+        'voted_at': now,
+        'version': Vote.version + 1
+    }
+    
+    # First vote: one statement claims the ballot
+    claim = db.update(Vote).where(Vote.id == ballot.vote_id)
+    first = claim.where(Vote.state == BallotState.ISSUED)
+    if expected_version is not None:
+        first = first.where(Vote.version == expected_version)
+    result = db.session.execute(first.values(**values))
+    previous, version = None, 0
+    
+    # Changed vote: compare-and-set on the version read, retried if another submission won,
+    # unless the client named the version it changes
+    for _ in range(5):
+        if result.rowcount == 1:
+            break
+        state, previous, version = db.session.execute(
+            db.select(Vote.state, Vote.vote_type, Vote.version).where(Vote.id == ballot.vote_id)
+        ).one()
+        if state == BallotState.EXPIRED:
+            db.session.rollback()
+            return jsonify({'error': 'Voting period has ended'}), 400
+        if expected_version is not None and version != expected_version:
+            db.session.rollback()
+            return jsonify({'error': 'The vote was changed since this version, please reload',
+                            'version': version}), 409
+        result = db.session.execute(claim.where(Vote.version == version).values(**values))
+    else:
+        db.session.rollback()
+        return jsonify({'error': 'The vote was changed concurrently, please retry'}), 409
+    
+    version += 1
+    db.session.add(VoteChange(
+        vote_id=ballot.vote_id,
+        application_id=ballot.application_id,
+        previous_vote_type=previous,
+        vote_type=vote_type,
+        rejection_reason=rejection_reason,
+        version=version,
+        idempotency_key=idempotency_key,
+        changed_at=now
+    ))
     
     if vote_type == VoteType.REJECT:
-        if not data.get('rejection_reason'):
-            return jsonify({'error': 'Rejection reason is required'}), 400
-        vote.rejection_reason = data['rejection_reason']
+        index_documents([('rejection', ballot.vote_id, ballot.application_id, rejection_reason)])
+    elif previous == VoteType.REJECT:
+        index_documents([('rejection', ballot.vote_id, ballot.application_id, None)])
     
-    db.session.commit()
+    record_vote(ballot.application_id, previous, vote_type, now)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request with the same Idempotency-Key committed first
+        db.session.rollback()
+        replay = replay_vote_submission(ballot.vote_id, idempotency_key, vote_type, rejection_reason) \
+            if idempotency_key else None
+        if replay is None:
+            raise
+        return replay
     
-    return jsonify({'message': 'Vote submitted successfully'})
+    if broker.has_subscribers(ballot.application_id):
+        broker.publish_tally(ballot.application_id, load_tallies([ballot.application_id])[ballot.application_id])
+    
+    return jsonify({'message': 'Vote submitted successfully', 'vote': vote_type, 'version': version})
 
-@app.route('/api/comment/<token>', methods=['POST'])
+@comments_bp.route('/api/comment/<token>', methods=['POST'])
 def add_comment(token):
-    """Add comment to application"""
-    vote = Vote.query.filter_by(token=token).first_or_404()
+    """Add comment to application, while it is open for voting"""
+    ballot = resolve_token(token)
+    if datetime.utcnow() > ballot.deadline:
+        return jsonify({'error': 'Voting period has ended'}), 400
     data = request.form
     
+    parent_comment_id = data.get('parent_comment_id', type=int)
+    if parent_comment_id is not None:
+        parent = db.session.get(Comment, parent_comment_id)
+        if parent is None or parent.application_id != ballot.application_id:
+            return jsonify({'error': 'Parent comment not found'}), 400
+    
     comment = Comment(
-        application_id=vote.application_id,
-        voter_id=vote.voter_id,
+        application_id=ballot.application_id,
+        voter_id=ballot.voter_id,
+        parent_comment_id=parent_comment_id,
         content=data['content'],
         is_supportive=None if data['is_supportive'] == '' else data['is_supportive'] == 'true'
     )
     
     db.session.add(comment)
+    db.session.flush()
+    
+    # Cached tokens outlive finalizing and archiving by other processes, so ask the database. The
+    # row lock (the write lock on SQLite) keeps the application open until this comment is committed
+    still_open = db.session.scalar(
+        db.select(GrantApplication.id)
+        .where(GrantApplication.id == ballot.application_id, GrantApplication.finalized_at.is_(None))
+        .with_for_update(read=True)
+    )
+    if still_open is None:
+        db.session.rollback()
+        return jsonify({'error': 'Voting period has ended'}), 400
+    
+    index_documents([('comment', comment.id, comment.application_id, comment.content)])
     db.session.commit()
     
+    if broker.has_subscribers(comment.application_id):
+        broker.publish_comment(comment.application_id, comment.id,
+                               serialize_comment(comment, db.session.get(VotingMember, ballot.voter_id)))
+    
     return jsonify({'message': 'Comment added successfully'})
 
-@app.route('/api/comments/<int:app_id>')
+@voting_bp.route('/api/events/<int:app_id>')
+def application_events(app_id):
+    """Server-Sent Events stream of an application's tally changes and new comments.
+
+    Sends the current tally first, then a 'tally' event after every vote and
+    a 'comment' event for every new comment, with a keep-alive comment every
+    EVENTS_HEARTBEAT_INTERVAL seconds. Not found unless EVENTS_ENABLED.
+    """
+    if not current_app.config['EVENTS_ENABLED']:
+        return jsonify({'error': 'Event streams are disabled'}), 404
+    GrantApplication.query.get_or_404(app_id)
+    tally = load_tallies([app_id])[app_id]
+    last_comment_id = db.session.scalar(
+        db.select(db.func.max(Comment.id)).where(Comment.application_id == app_id)
+    ) or 0
+    
+    subscription = broker.subscribe(app_id, vote_summary(tally), last_comment_id)
+    if subscription is None:
+        return jsonify({'error': 'Too many open event streams'}), 503
+    heartbeat = current_app.config['EVENTS_HEARTBEAT_INTERVAL']
+    snapshot = f'retry: 3000\nevent: tally\ndata: {dumps(vote_summary(tally)).decode()}\n\n'
+    
+    def stream():
+        try:
+            yield snapshot
+            while not subscription.dropped:
+                try:
+                    yield subscription.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+        finally:
+            broker.unsubscribe(app_id, subscription)
+    
+    response = Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # let nginx pass events through unbuffered
+    })
+    if current_app.config['EVENTS_ALLOW_ORIGIN']:
+        response.headers['Access-Control-Allow-Origin'] = current_app.config['EVENTS_ALLOW_ORIGIN']
+    return response
+
+@main_bp.route('/api/search')
+def search():
+    """Ranked full-text search over application texts, comments and rejection reasons.
+
+    ?q= is matched word by word (all words must occur); ?kind= restricts the
+    results to application, comment or rejection documents. Snippets are
+    HTML-escaped with the matches wrapped in <mark>.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    kind = request.args.get('kind')
+    if kind is not None and kind not in SEARCH_KINDS:
+        return jsonify({'error': f"kind must be one of {', '.join(SEARCH_KINDS)}"}), 400
+    if db.session.connection().dialect.name not in SEARCH_BACKENDS:
+        return jsonify({'error': 'Full-text search needs SQLite or PostgreSQL'}), 501
+    limit = max(1, min(request.args.get('limit', current_app.config['SEARCH_PAGE_SIZE'], type=int),
+                       current_app.config['SEARCH_MAX_PAGE_SIZE']))
+    
+    return jsonify({
+        'results': [{
+            'kind': kind,
+            'id': source_id,
+            'application_id': application_id,
+            'reference_code': reference_code,
+            'candidate_full_name': candidate,
+            'snippet': highlight(snippet),
+            'score': round(score, 4)
+        } for kind, source_id, application_id, reference_code, candidate, snippet, score
+            in search_documents(query, kind, limit)]
+    })
+
+def encode_cursor(value, row_id):
+    return base64.urlsafe_b64encode(f"{value.isoformat()}|{row_id}".encode()).decode()
+
+def decode_cursor(cursor, parse=datetime.fromisoformat):
+    value, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+    return parse(value), int(row_id)
+
+def serialize_comment(comment, voter):
+    return {**COMMENT_SCHEMA.dump(comment), **COMMENT_VOTER_SCHEMA.dump(voter), 'created_at': comment.created_at,
+            'replies': []}
+
+def comment_roots_query(app_id, limit, cursor=None):
+    """Top-level comments of one page, newest first, plus one row to detect a following page.
+
+    Raises ValueError for a malformed cursor.
+    """
+    query = db.select(Comment, VotingMember).join(VotingMember).where(
+        Comment.application_id == app_id,
+        Comment.parent_comment_id.is_(None)
+    )
+    if cursor:
+        query = query.where(db.tuple_(Comment.created_at, Comment.id) < decode_cursor(cursor))
+    return query.order_by(Comment.created_at.desc(), Comment.id.desc()).limit(limit + 1)
+
+def comment_replies_query(root_ids):
+    """Every reply below root_ids, however deep, in one recursive query"""
+    thread = db.select(Comment.id).where(
+        Comment.parent_comment_id.in_(root_ids)
+    ).cte('thread', recursive=True)
+    thread = thread.union_all(
+        db.select(Comment.id).join(thread, Comment.parent_comment_id == thread.c.id)
+    )
+    return (
+        db.select(Comment, VotingMember).join(VotingMember)
+        .join(thread, Comment.id == thread.c.id)
+        .order_by(Comment.created_at, Comment.id)
+    )
+
+def comments_page(roots, replies, has_more):
+    """Response body of get_comments from the (Comment, VotingMember) rows of both queries"""
+    comments = {comment.id: serialize_comment(comment, voter) for comment, voter in roots}
+    for comment, voter in replies:
+        comments[comment.id] = serialize_comment(comment, voter)
+    for comment, _ in replies:
+        comments[comment.parent_comment_id]['replies'].append(comments[comment.id])
+    
+    last = roots[-1][0] if roots else None
+    return {
+        'comments': [comments[comment.id] for comment, _ in roots],
+        'next_cursor': encode_cursor(last.created_at, last.id) if has_more else None
+    }
+
+def archived_comments_page(comments, limit, cursor=None):
+    """get_comments' page for an archived application, paged like comment_roots_query() in memory"""
+    key = lambda comment: (comment.created_at, comment.id)
+    roots = sorted((comment for comment in comments if comment.parent_comment_id is None), key=key, reverse=True)
+    if cursor:
+        boundary = decode_cursor(cursor)
+        roots = [comment for comment in roots if key(comment) < boundary]
+    page = roots[:limit]
+    
+    children = {}
+    for comment in comments:
+        children.setdefault(comment.parent_comment_id, []).append(comment)
+    replies, pending = [], [comment.id for comment in page]
+    while pending:
+        below = [reply for parent_id in pending for reply in children.get(parent_id, [])]
+        replies.extend(below)
+        pending = [reply.id for reply in below]
+    replies.sort(key=key)
+    return comments_page([(comment, comment.voter) for comment in page],
+                         [(comment, comment.voter) for comment in replies], len(roots) > limit)
+
+@comments_bp.route('/api/comments/<int:app_id>')
 def get_comments(app_id):
-    """Get comments for application"""
-    comments = db.session.query(Comment, VotingMember).join(VotingMember).filter(
-        Comment.application_id == app_id
-    ).order_by(Comment.created_at.desc()).all()
-    
-    return jsonify([{
-        'id': comment.id,
-        'content': comment.content,
-        'is_supportive': comment.is_supportive,
-        'voter_name': voter.name,
-        'voter_position': voter.position,
-        'created_at': comment.created_at.isoformat()
-    } for comment, voter in comments])
-
-@app.route('/api/results/<int:app_id>')
+    """Get one page of top-level comments for an application, newest first, with their reply threads.
+
+    Pages are keyed on (created_at, id); pass the returned next_cursor as
+    ?cursor= to fetch the following page.
+    """
+    limit = max(1, min(request.args.get('limit', current_app.config['COMMENTS_PAGE_SIZE'], type=int),
+                       current_app.config['COMMENTS_MAX_PAGE_SIZE']))
+    
+    try:
+        query = comment_roots_query(app_id, limit, request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    roots = db.session.execute(query).all()
+    if not roots:
+        # Archived applications have no rows left in the comment table
+        record = load_archived([app_id]).get(app_id)
+        if record is not None:
+            return jsonify(archived_comments_page(record.comments, limit, request.args.get('cursor')))
+    page = roots[:limit]
+    replies = db.session.execute(comment_replies_query([comment.id for comment, _ in page])).all() if page else []
+    return jsonify(comments_page(page, replies, len(roots) > limit))
+
+EXPORT_COLUMNS = [
+    'application_id', 'reference_code', 'candidate_full_name', 'grant_type', 'amount_requested',
+    'currency', 'voter_name', 'voter_position', 'vote', 'rejection_reason', 'voted_at'
+]
+
+@results_bp.route('/api/results/export')
+def export_results():
+    """Stream every cast vote across all applications as NDJSON or CSV.
+
+    Rows are read from a server-side cursor in EXPORT_BATCH_SIZE chunks, so
+    memory stays flat however large the vote table is; archived applications
+    are unpacked one at a time and merged in by application id. ?since= (ISO
+    date or datetime) limits the export to votes cast from that moment on.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    
+    query = db.select(
+        GrantApplication.id,
+        GrantApplication.reference_code,
+        GrantApplication.candidate_full_name,
+        GrantApplication.grant_type,
+        GrantApplication.amount_requested,
+        GrantApplication.currency,
+        VotingMember.name,
+        VotingMember.position,
+        Vote.vote_type,
+        Vote.rejection_reason,
+        Vote.voted_at,
+        Vote.id
+    ).join(Vote, Vote.application_id == GrantApplication.id).join(
+        VotingMember, Vote.voter_id == VotingMember.id
+    ).where(Vote.state == BallotState.CAST)
+    archived = db.select(ArchivedApplication.payload)
+    
+    since = None
+    if request.args.get('since'):
+        try:
+            since = datetime.fromisoformat(request.args['since'])
+        except ValueError:
+            return jsonify({'error': 'since must be an ISO date or datetime'}), 400
+        query = query.where(Vote.voted_at >= since)
+        archived = archived.where(ArchivedApplication.last_vote_at >= since)
+    
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    query = query.order_by(GrantApplication.id, Vote.id).execution_options(yield_per=batch_size)
+    archived = archived.order_by(ArchivedApplication.id).execution_options(yield_per=batch_size)
+    
+    def hot_rows():
+        for partition in db.session.execute(query).partitions():
+            yield from partition
+    
+    def archived_rows():
+        for partition in db.session.execute(archived).partitions():
+            for (payload,) in partition:
+                record = unpack_archive(payload)
+                application = record.application
+                for v in record.votes:
+                    if v.state == BallotState.CAST and (since is None or (v.voted_at and v.voted_at >= since)):
+                        yield (application.id, application.reference_code, application.candidate_full_name,
+                               application.grant_type, application.amount_requested, application.currency,
+                               v.voter.name, v.voter.position, v.vote_type, v.rejection_reason, v.voted_at, v.id)
+    
+    def rows():
+        # Both sources come ordered by (application id, vote id)
+        for row in heapq.merge(hot_rows(), archived_rows(), key=lambda row: (row[0], row[11])):
+            yield row[:11]
+    
+    def generate_ndjson():
+        for row in rows():
+            yield dumps(dict(zip(EXPORT_COLUMNS, row))) + b'\n'
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for i, row in enumerate(rows(), 1):
+            writer.writerow([json_default(value) if isinstance(value, (date, Enum)) else value for value in row])
+            if i % current_app.config['EXPORT_BATCH_SIZE'] == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    
+    if export_format == 'csv':
+        response = Response(stream_with_context(generate_csv()), mimetype='text/csv')
+    else:
+        response = Response(stream_with_context(generate_ndjson()), mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename=results.{export_format}'
+    return response
+
+def serialize_results(application, tally, votes):
+    return {
+        'application': RESULTS_APPLICATION_SCHEMA.dump(application),
+        'summary': vote_summary(tally),
+        'votes': [RESULTS_VOTE_SCHEMA.dump(v) for v in votes],
+        'rejection_reasons': [v.rejection_reason for v in votes if v.rejection_reason]
+    }
+
+@results_bp.route('/api/results/batch')
+def get_voting_results_batch():
+    """Get the voting results of several applications (?ids=1,2,3) in one request.
+
+    Results come back in the order asked for; ids that do not exist are
+    listed under missing. The cast votes of every application are read in a
+    single query.
+    """
+    ids, error = parse_batch_ids()
+    if error:
+        return error
+    found, missing, archived = load_batch(ids)
+    
+    votes = {application.id: [] for application, _ in found if application.id not in archived}
+    if votes:
+        for v in Vote.query.options(joinedload(Vote.voter)).filter(
+            Vote.application_id.in_(list(votes)), Vote.state == BallotState.CAST
+        ).order_by(Vote.id):
+            votes[v.application_id].append(v)
+    for app_id, record in archived.items():
+        votes[app_id] = [v for v in record.votes if v.state == BallotState.CAST]
+    
+    return jsonify({
+        'results': [serialize_results(application, tally, votes[application.id]) for application, tally in found],
+        'missing': missing
+    })
+
+@results_bp.route('/api/results/<int:app_id>')
 def get_voting_results(app_id):
     """Get voting results"""
-    application = GrantApplication.query.get_or_404(app_id)
-    
-    votes = Vote.query.filter_by(application_id=app_id).all()
-    
-    results = {
-        'application': {
-            'reference_code': application.reference_code,
-            'candidate_full_name': application.candidate_full_name,
-            'grant_type': application.grant_type.value
-        },
-        'summary': {
-            'accept': sum(1 for v in votes if v.vote_type == VoteType.ACCEPT),
-            'reject': sum(1 for v in votes if v.vote_type == VoteType.REJECT),
-            'total_voters': VotingMember.query.filter_by(is_active=True).count(),
-            'voted': len(votes)
-        },
-        'votes': [{
-            'voter_name': v.voter.name,
-            'voter_position': v.voter.position,
-            'vote': v.vote_type.value,
-            'rejection_reason': v.rejection_reason,
-            'voted_at': v.voted_at.isoformat() if v.voted_at else None
-        } for v in votes],
-        'rejection_reasons': [v.rejection_reason for v in votes if v.rejection_reason]
+    application, tally, record = get_application_or_archived(app_id)
+    
+    if record is not None:
+        votes = [v for v in record.votes if v.state == BallotState.CAST]
+    else:
+        votes = Vote.query.options(joinedload(Vote.voter)).filter_by(
+            application_id=app_id, state=BallotState.CAST
+        ).all()
+    
+    return jsonify(serialize_results(application, tally, votes))
+
+FUNDING_DIMENSIONS = ['grant_type', 'month', 'currency', 'place']
+
+funding_cache = LRUCache(1)
+
+def funding_fingerprint():
+    """Values that change with every application write and every vote, in any worker.
+
+    The count includes archived applications, so archiving leaves it alone.
+    """
+    return db.session.execute(db.select(
+        db.select(db.func.count(GrantApplication.id)).scalar_subquery() +
+        db.select(db.func.count(ArchivedApplication.id)).scalar_subquery(),
+        db.select(db.func.max(GrantApplication.updated_at)).scalar_subquery(),
+        db.select(db.func.max(ApplicationTally.last_vote_at)).scalar_subquery()
+    )).one()
+
+def fetch_columns(query):
+    """Run query on the session's connection and return its result as a dict of column tuples"""
+    result = db.session.connection().execute(query)
+    keys = list(result.keys())
+    columns = list(zip(*result.fetchall())) or [()] * len(keys)
+    return dict(zip(keys, columns))
+
+class FundingFrame:
+    """Columnar copy of the applications and tallies behind /api/analytics/funding.
+
+    The first refresh reads every row. Later refreshes only re-read the
+    applications whose updated_at and the tallies whose last_vote_at moved
+    past the previous high-water mark (both indexed), less REFRESH_OVERLAP
+    for transactions that committed out of order, so a vote costs an index
+    lookup instead of a scan. Archived applications never change, so only
+    full loads read them. A changed application count (deletions) forces a
+    full reload.
+    """
+    
+    REFRESH_OVERLAP = timedelta(minutes=1)
+    
+    def __init__(self):
+        self.app = None  # set by init_app()
+        self.lock = threading.Lock()
+        self.applications = self.votes = None
+        self.updated_until = self.voted_until = None
+        self.full_loads = self.refreshes = self.rows_read = 0
+    
+    def init_app(self, app):
+        self.app = app
+        self.applications = self.votes = None  # the app may use another database
+    
+    def read_applications(self, condition=None):
+        import pandas as pd
+        
+        def columns(model):
+            return db.select(
+                model.id,
+                db.cast(model.grant_type, db.String).label('grant_type'),
+                db.func.substr(db.cast(model.date, db.String), 1, 7).label('month'),
+                db.func.coalesce(model.currency, 'EUR').label('currency'),
+                model.place,
+                model.amount_requested,
+                db.cast(model.outcome, db.String).label('outcome')
+            )
+        
+        if condition is None:
+            query = db.union_all(columns(GrantApplication), columns(ArchivedApplication))
+        else:
+            query = columns(GrantApplication).where(condition)
+        frame = pd.DataFrame(fetch_columns(query)).set_index('id')
+        frame['grant_type'] = frame['grant_type'].map({t.name: t.value for t in GrantType})
+        frame['amount_requested'] = frame['amount_requested'].astype(float)
+        rates = self.app.config['FUNDING_EXCHANGE_RATES']
+        frame['requested'] = frame['amount_requested'] * frame['currency'].map(rates)
+        frame['decided'] = (frame['outcome'].notna() & (frame['outcome'] != Outcome.NO_VOTES.name)).astype(int)
+        frame['accepted'] = (frame['outcome'] == Outcome.ACCEPTED.name).astype(int)
+        frame['approved'] = frame['requested'].where(frame['accepted'] == 1, 0.0)
+        self.rows_read += len(frame)
+        return frame
+    
+    def read_votes(self, condition=None):
+        import pandas as pd
+        
+        query = db.select(ApplicationTally.application_id, ApplicationTally.accept.label('accept_votes'),
+                          ApplicationTally.reject.label('reject_votes'))
+        if condition is None:
+            query = db.union_all(query, db.select(ArchivedApplication.id, ArchivedApplication.accept,
+                                                  ArchivedApplication.reject))
+        else:
+            query = query.where(condition)
+        frame = pd.DataFrame(fetch_columns(query))
+        self.rows_read += len(frame)
+        return frame.set_index('application_id').astype(int)
+    
+    @staticmethod
+    def merge(frame, changed):
+        import pandas as pd
+        
+        if changed.empty:
+            return frame
+        return pd.concat([frame.drop(changed.index, errors='ignore'), changed])
+    
+    def refresh(self, count, updated_until, voted_until):
+        """Bring the copy up to the given funding_fingerprint() and return a frame with one row per application"""
+        with self.lock:
+            full = self.applications is None or None in (self.updated_until, self.voted_until,
+                                                         updated_until, voted_until)
+            if not full:
+                if updated_until != self.updated_until:
+                    changed = GrantApplication.updated_at >= self.updated_until - self.REFRESH_OVERLAP
+                    self.applications = self.merge(self.applications, self.read_applications(changed))
+                    # New and finalized applications come with tally rows written alongside them
+                    self.votes = self.merge(self.votes, self.read_votes(ApplicationTally.application_id.in_(
+                        db.select(GrantApplication.id).where(changed)
+                    )))
+                if voted_until != self.voted_until:
+                    self.votes = self.merge(self.votes, self.read_votes(
+                        ApplicationTally.last_vote_at >= self.voted_until - self.REFRESH_OVERLAP
+                    ))
+                full = len(self.applications) != count
+            if full:
+                self.applications, self.votes = self.read_applications(), self.read_votes()
+                self.full_loads += 1
+            else:
+                self.refreshes += 1
+            self.updated_until, self.voted_until = updated_until, voted_until
+            return self.applications.join(self.votes)
+    
+    def stats(self):
+        with self.lock:
+            return {
+                'applications': None if self.applications is None else len(self.applications),
+                'full_loads': self.full_loads,
+                'refreshes': self.refreshes,
+                'rows_read': self.rows_read
+            }
+
+funding_frame = FundingFrame()
+
+def compute_funding_analytics(frame):
+    """Requested and approved amounts, acceptance rates and percentiles per FUNDING_DIMENSIONS.
+
+    frame comes from funding_frame.refresh(); every group-by and
+    percentile is vectorized.
+    """
+    import numpy as np
+    
+    missing = frame.index[frame['accept_votes'].isna()].tolist()
+    if missing:
+        fallback = tally_votes(missing)
+        frame.loc[missing, 'accept_votes'] = [fallback[i]['accept'] for i in missing]
+        frame.loc[missing, 'reject_votes'] = [fallback[i]['reject'] for i in missing]
+    # Categories are factorized once here instead of in every group-by
+    frame = frame.assign(all='all').astype({
+        'accept_votes': int, 'reject_votes': int, **{d: 'category' for d in FUNDING_DIMENSIONS + ['all']}
+    })
+    
+    percentiles = current_app.config['FUNDING_PERCENTILES']
+    counted = ['decided', 'accepted', 'accept_votes', 'reject_votes', 'requested', 'approved']
+    
+    def summarize(dimension):
+        if frame.empty:
+            return []
+        groups = frame.groupby(dimension, sort=True, observed=True)
+        table = groups[counted].sum()
+        table.insert(0, 'applications', groups.size())
+        table['acceptance_rate'] = (table['accepted'] / table['decided'].replace(0, np.nan)).round(4)
+        if dimension == 'currency':
+            table['requested_original'] = groups['amount_requested'].sum()
+        quantiles = groups['requested'].quantile([p / 100 for p in percentiles]).unstack()
+        for p in percentiles:
+            table[f'requested_p{p}'] = quantiles[p / 100]
+        amounts = [c for c in table.columns if c.startswith(('requested', 'approved'))]
+        table[amounts] = table[amounts].round(2)
+        table = table.reset_index().astype(object)
+        return table.where(table.notna(), None).to_dict('records')
+    
+    rates = current_app.config['FUNDING_EXCHANGE_RATES']
+    totals = summarize('all')
+    return {
+        'base_currency': current_app.config['FUNDING_BASE_CURRENCY'],
+        'exchange_rates': rates,
+        'unconverted_currencies': sorted(set(frame['currency'].unique()) - set(rates)),
+        'totals': {k: v for k, v in totals[0].items() if k != 'all'} if totals else None,
+        **{f'by_{dimension}': summarize(dimension) for dimension in FUNDING_DIMENSIONS},
+        'generated_at': datetime.utcnow()
     }
+
+@results_bp.route('/api/analytics/funding')
+def funding_analytics():
+    """Funding requested and approved per grant type, month, currency and place.
+
+    The result is cached until the next application write or vote (checked
+    with one cheap query per request, so writes in other workers count);
+    recomputing it only re-reads the rows that changed.
+    """
+    fingerprint = funding_fingerprint()
+    analytics = funding_cache.get(fingerprint)
+    if analytics is None:
+        analytics = compute_funding_analytics(funding_frame.refresh(*fingerprint))
+        funding_cache.set(fingerprint, analytics)
+    return jsonify(analytics)
+
+@voting_bp.cli.command('send-digest')
+@click.option('--reminders', is_flag=True, help='Remind members about ballots closing soon.')
+def send_digest_command(reminders):
+    """Email each member one digest of their outstanding ballots."""
+    emails, ballots = send_digests(reminder=reminders)
+    print(f"✅ Sent {emails} digest emails covering {ballots} ballots.")
+
+@main_bp.cli.command('upgrade-db')
+def upgrade_db_command():
+    """Add the columns, tables and indexes of this version to a database created by an earlier one."""
+    changes = upgrade_schema()
+    for change in changes:
+        print(f"  {change}")
+    count = rebuild_tallies()
+    documents = rebuild_search_index()
+    print(f"✅ Schema is current ({len(changes)} changes); rebuilt tallies for {count} applications "
+          f"and indexed {documents} search documents.")
+
+@main_bp.cli.command('reindex-search')
+def reindex_search_command():
+    """Rebuild the full-text search index from the application, comment and vote tables."""
+    count = rebuild_search_index()
+    print(f"✅ Indexed {count} search documents.")
+
+@results_bp.cli.command('rebuild-tallies')
+def rebuild_tallies_command():
+    """Recompute the materialized vote tallies from the Vote table."""
+    count = rebuild_tallies()
+    print(f"✅ Rebuilt tallies for {count} applications.")
+
+@applications_bp.cli.command('archive')
+@click.option('--older-than-days', type=int, help='Finalized at least this long ago (default ARCHIVE_AFTER_DAYS).')
+@click.option('--batch-size', type=int, help='Applications per transaction (default ARCHIVE_BATCH_SIZE).')
+def archive_command(older_than_days, batch_size):
+    """Move long finalized applications, their ballots and comments to the archive table."""
+    config = current_app.config
+    finalized_before = datetime.utcnow() - timedelta(days=older_than_days or config['ARCHIVE_AFTER_DAYS'])
+    before = archive_report()
+    stats = archive_applications(finalized_before, batch_size or config['ARCHIVE_BATCH_SIZE'])
+    after = archive_report()
     
-    return jsonify(results)
+    print(f"{'table':22} {'rows before':>12} {'rows after':>12} {'MB before':>10} {'MB after':>10}")
+    for table in before['rows']:
+        sizes = [f"{size / 1e6:10.2f}" if size is not None else f"{'-':>10}"
+                 for size in (before['bytes'][table], after['bytes'][table])]
+        print(f"{table:22} {before['rows'][table]:12} {after['rows'][table]:12} {sizes[0]} {sizes[1]}")
+    print(f"{'hot-path query (ms)':22} {'before':>12} {'after':>12}")
+    for probe, latency in before['latency_ms'].items():
+        print(f"{probe:22} {latency or 0:12.3f} {after['latency_ms'].get(probe) or 0:12.3f}")
+    if stats['raw_bytes']:
+        print(f"Archive payloads: {stats['raw_bytes'] / 1e6:.2f} MB of JSON compressed to "
+              f"{stats['compressed_bytes'] / 1e6:.2f} MB.")
+    if stats['skipped']:
+        print(f"⚠️ {stats['skipped']} applications changed while being archived; the next run retries them.")
+    print(f"✅ Archived {stats['archived']} applications finalized before {finalized_before:%Y-%m-%d}.")
+
+@results_bp.cli.command('check-tallies')
+def check_tallies_command():
+    """Report applications whose materialized tally disagrees with their votes."""
+    mismatches = check_tallies()
+    for mismatch in mismatches:
+        print(mismatch)
+    if mismatches:
+        print(f"❌ {len(mismatches)} tally mismatches found. Run 'flask rebuild-tallies' to fix them.")
+        raise SystemExit(1)
+    print("✅ All tallies are consistent.")
 
 # Initialize database
 # @app.before_first_request
@@ -542,99 +3578,202 @@ def get_voting_results(app_id):
         
 #         db.session.commit()
 
+# Member roster inserted by 'flask seed' into an empty database
+DEFAULT_MEMBERS = [
+    {
+        'name': 'Prof Katrin SCHLUND',
+        'position': 'Action Chair',
+        'email': 'katrin.schlund@slavistik.uni-halle.de'
+    },
+    {
+        'name': 'Prof Vladimir KARABALIĆ',
+        'position': 'Action Vice Chair',
+        'email': 'vkarabalic@ffos.hr'
+    },
+    {
+        'name': 'Prof Vladimir KARABALIĆ',
+        'position': 'Grant Holder Scientific Representative',
+        'email': 'vkarabalic@ffos.hr'
+    },
+    {
+        'name': 'Dr Gokhan OZKAN',
+        'position': 'Science Communication Coordinator',
+        'email': 'Gkhnozkan57@gmail.com'
+    },
+    {
+        'name': 'Prof Hana BERGEROVA',
+        'position': 'Grant Awarding Coordinator',
+        'email': 'Hana.Bergerova@ujep.cz'
+    },
+    {
+        'name': 'Prof Carmen MELLADO BLANCO',
+        'position': 'WG1 Leader',
+        'email': 'c.mellado@usc.es'
+    },
+    {
+        'name': 'Roberta Rada',
+        'position': 'WG1 Vice Leader',
+        'email': 'rada.roberta@gmail.com'
+    },
+    {
+        'name': 'Dr Nikolche MICKOSKI',
+        'position': 'WG2 Leader',
+        'email': 'nmickoski@manu.edu.mk'
+    },
+    {
+        'name': 'Max Silbersztein',
+        'position': 'WG2 Vice Leader',
+        'email': 'max.silberztein@gmail.com'
+    },
+    {
+        'name': 'Prof Vladimir KARABALIĆ',
+        'position': 'WG3 Leader',
+        'email': 'vkarabalic@ffos.hr'
+    },
+    {
+        'name': 'Monika Hornacek-Banasova',
+        'position': 'WG3 Vice Leader',
+        'email': 'monika.hornacek.banasova@ucm.sk'
+    },
+    {
+        'name': 'Dr Tamas KISPAL',
+        'position': 'WG4 Leader',
+        'email': 'tamas.kispal@phil.uni-goettingen.de'
+    },
+    {
+        'name': 'Çiler Hatipoğlu',
+        'position': 'WG4 Vice Leader',
+        'email': 'ciler.hatipoglu@gmail.com'
+    },
+    {
+        'name': 'Dr. Hiwa Asadpour',
+        'position': 'WG5 Leader',
+        'email': 'asadpourhiwa@gmail.com'
+    },
+    {
+        'name': 'Pedro Ivorra Ordines',
+        'position': 'WG5 Vice Leader',
+        'email': 'pivorra@unizar.es'
+    }
+]
+
+def seed_members():
+    """Insert DEFAULT_MEMBERS in one statement unless there are members already; returns how many were added.
+
+    Emails are unique, so a member listed under several positions gets one
+    row (and one ballot) with the positions joined.
+    """
+    if db.session.scalar(db.select(db.func.count(VotingMember.id))):
+        return 0
+    members = {}
+    for member in DEFAULT_MEMBERS:
+        if member['email'] in members:
+            members[member['email']]['position'] += f", {member['position']}"
+        else:
+            members[member['email']] = dict(member)
+    db.session.execute(db.insert(VotingMember), list(members.values()))
+    db.session.commit()
+    return len(members)
+
+FIXTURE_PLACES = ['Halle', 'Osijek', 'Santiago de Compostela', 'Ústí nad Labem', 'Istanbul', 'Ljubljana']
+
+def seed_fixtures(applications, comments, rng):
+    """Insert synthetic open applications with ballots for every active member and comments on each.
+
+    Like /api/applications/bulk, every table gets one executemany INSERT
+    and no email is sent. The caller commits.
+    """
+    today = datetime.utcnow().replace(second=0, microsecond=0)
+    ref_codes = set()
+    while len(ref_codes) < applications:
+        ref_codes.add(generate_reference_code())
+    rows = [{
+        'reference_code': ref_code,
+        'submitter_name': f'Fixture Submitter {i}',
+        'candidate_full_name': f'Fixture Candidate {i}',
+        'grant_type': rng.choice(list(GrantType)),
+        'date': (today + timedelta(days=rng.randrange(30, 365))).date(),
+        'place': rng.choice(FIXTURE_PLACES),
+        'amount_requested': round(rng.uniform(300, 4000), 2),
+        'currency': 'EUR',
+        'description': f'Synthetic application {i} created by flask seed.',
+        'voting_deadline': today + timedelta(days=rng.randrange(7, 30))
+    } for i, ref_code in enumerate(sorted(ref_codes), 1)]
+    
+    app_ids = db.session.scalars(
+        db.insert(GrantApplication).returning(GrantApplication.id, sort_by_parameter_order=True),
+        rows
+    ).all()
+    ballots = issue_ballots(app_ids)
+    member_ids = db.session.scalars(db.select(VotingMember.id).filter_by(is_active=True)).all()
+    comment_rows = [{
+        'application_id': app_id,
+        'voter_id': rng.choice(member_ids),
+        'content': f'Synthetic comment {c} on application {app_id}.',
+        'is_supportive': rng.choice([True, False, None])
+    } for app_id in app_ids for c in range(1, comments + 1)] if member_ids else []
+    if comment_rows:
+        db.session.execute(db.insert(Comment), comment_rows)
+    return len(app_ids), ballots, len(comment_rows)
+
+@members_bp.cli.command('seed')
+@click.option('--applications', default=0, help='Synthetic open applications to add.')
+@click.option('--comments', default=0, help='Synthetic comments per synthetic application.')
+@click.option('--seed', 'seed_value', default=42, help='Random seed of the synthetic data.')
+def seed_command(applications, comments, seed_value):
+    """Create the tables, insert the member roster into an empty database and add synthetic fixtures."""
+    db.create_all()
+    members = seed_members()
+    if members:
+        print(f"✅ Added {members} voting members.")
+    if applications:
+        created, ballots, comment_count = seed_fixtures(applications, comments, random.Random(seed_value))
+        db.session.commit()
+        rebuild_search_index()
+        print(f"✅ Added {created} applications, {ballots} ballots and {comment_count} comments.")
+    print("✅ Database initialized.")
+
+def create_app(config=None):
+    """Build an app: configuration (config overrides the defaults), extensions, blueprints.
+
+    Nothing here connects to the database or the mail server or compiles a
+    template; that happens on first use. The background components and the
+    in-process caches are per process and follow the app created last.
+    """
+    global search_index_ready
+    app = Flask(__name__)
+    app.json = APIJSONProvider(app)
+    configure_app(app, config)
+    db.init_app(app)
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', sqlite_connection_setup(app.config['SQLITE_JOURNAL_MODE'],
+                                                                       app.config['SQLITE_BUSY_TIMEOUT']))
+    for component in (metrics, profiler, rate_limiter, dispatcher, scheduler, broker, funding_frame):
+        component.init_app(app)
+    token_cache.resize(app.config['TOKEN_CACHE_SIZE'], app.config['TOKEN_CACHE_TTL'])
+    fragment_cache.resize(app.config['VOTE_PAGE_FRAGMENT_CACHE_SIZE'])
+    funding_cache.clear()
+    search_index_ready = False
+    for blueprint in (main_bp, members_bp, applications_bp, voting_bp, comments_bp, results_bp):
+        app.register_blueprint(blueprint)
+    return app
+
+def __getattr__(name):
+    """Create the default app on first access to app.app (gunicorn app:app, flask run, asgi.py)"""
+    global app
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    app = create_app()
+    return app
+
 if __name__ == '__main__':
+    app = create_app()
     with app.app_context():
-        # Create all database tables
         db.create_all()
-        
-        # Add default voting members if none exist
-        if VotingMember.query.count() == 0:
-            default_members = [
-                {
-                    'name': 'Prof Katrin SCHLUND',
-                    'position': 'Action Chair',
-                    'email': 'katrin.schlund@slavistik.uni-halle.de'
-                },
-                {
-                    'name': 'Prof Vladimir KARABALIĆ',
-                    'position': 'Action Vice Chair',
-                    'email': 'vkarabalic@ffos.hr'
-                },
-                {
-                    'name': 'Prof Vladimir KARABALIĆ',
-                    'position': 'Grant Holder Scientific Representative',
-                    'email': 'vkarabalic@ffos.hr'
-                },
-                {
-                    'name': 'Dr Gokhan OZKAN',
-                    'position': 'Science Communication Coordinator',
-                    'email': 'Gkhnozkan57@gmail.com'
-                },
-                {
-                    'name': 'Prof Hana BERGEROVA',
-                    'position': 'Grant Awarding Coordinator',
-                    'email': 'Hana.Bergerova@ujep.cz'
-                },
-                {
-                    'name': 'Prof Carmen MELLADO BLANCO',
-                    'position': 'WG1 Leader',
-                    'email': 'c.mellado@usc.es'
-                },
-                {
-                    'name': 'Roberta Rada',
-                    'position': 'WG1 Vice Leader',
-                    'email': 'rada.roberta@gmail.com'
-                },
-                {
-                    'name': 'Dr Nikolche MICKOSKI',
-                    'position': 'WG2 Leader',
-                    'email': 'nmickoski@manu.edu.mk'
-                },
-                {
-                    'name': 'Max Silbersztein',
-                    'position': 'WG2 Vice Leader',
-                    'email': 'max.silberztein@gmail.com'
-                },
-                {
-                    'name': 'Prof Vladimir KARABALIĆ',
-                    'position': 'WG3 Leader',
-                    'email': 'vkarabalic@ffos.hr'
-                },
-                {
-                    'name': 'Monika Hornacek-Banasova',
-                    'position': 'WG3 Vice Leader',
-                    'email': 'monika.hornacek.banasova@ucm.sk'
-                },
-                {
-                    'name': 'Dr Tamas KISPAL',
-                    'position': 'WG4 Leader',
-                    'email': 'tamas.kispal@phil.uni-goettingen.de'
-                },
-                {
-                    'name': 'Çiler Hatipoğlu',
-                    'position': 'WG4 Vice Leader',
-                    'email': 'ciler.hatipoglu@gmail.com'
-                },
-                {
-                    'name': 'Dr. Hiwa Asadpour',
-                    'position': 'WG5 Leader',
-                    'email': 'asadpourhiwa@gmail.com'
-                },
-                {
-                    'name': 'Pedro Ivorra Ordines',
-                    'position': 'WG5 Vice Leader',
-                    'email': 'pivorra@unizar.es'
-                }
-            ]
-            
-            for member_data in default_members:
-                member = VotingMember(**member_data)
-                db.session.add(member)
-            
-            db.session.commit()
+        if seed_members():
             print("✅ Default voting members added to database.")
-        
         print("✅ Database initialized.")
 
     # Run the Flask app
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
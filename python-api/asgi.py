@@ -0,0 +1,185 @@
+"""ASGI entry point: uvicorn asgi:application --workers 4
+
+The endpoints that hold a connection open or mostly wait on the database
+(/api/events/<id> streams, /api/comments/<id> and /health) are served by
+coroutines on an async SQLAlchemy engine (aiosqlite for SQLite, asyncpg
+for PostgreSQL), so thousands of them share one event loop. Every other
+route is the unchanged Flask app, run on a pool of ASGI_SYNC_THREADS
+threads by a2wsgi. URLs, status codes, headers and JSON bodies are the
+same as under Gunicorn; request metrics cover the Flask routes only.
+
+Requires pip install uvicorn a2wsgi aiosqlite (asyncpg for PostgreSQL).
+"""
+import asyncio
+import re
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_accept_header
+
+from app import (app, db, broker, scheduler, ApplicationTally, ArchivedApplication, Comment, GrantApplication,
+                 archived_comments_page, comment_replies_query, comment_roots_query, comments_page, compress_response,
+                 dumps, sqlite_connection_setup, tally_from_row, tally_query, unpack_archive, vote_summary)
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+
+def create_engine():
+    """Async engine on the database of the Flask app, with the same pool options"""
+    with app.app_context():
+        url = db.engine.url
+    engine = create_async_engine(url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]),
+                                 **app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    if url.get_backend_name() == 'sqlite':
+        event.listen(engine.sync_engine, 'connect',
+                     sqlite_connection_setup(app.config['SQLITE_JOURNAL_MODE'], app.config['SQLITE_BUSY_TIMEOUT']))
+    return engine
+
+
+engine = create_engine()
+Session = async_sessionmaker(engine, expire_on_commit=False)
+flask_app = WSGIMiddleware(app, workers=app.config['ASGI_SYNC_THREADS'])
+
+
+def encode_headers(headers):
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+
+async def send_json(scope, send, data, status=200):
+    """Send data exactly as the Flask view's jsonify() and the compress hook would"""
+    response = app.json.response(data)
+    response.status_code = status
+    accept_encoding = dict(scope['headers']).get(b'accept-encoding', b'').decode('latin-1')
+    compress_response(response, parse_accept_header(accept_encoding), app.config)
+    await send({'type': 'http.response.start', 'status': status, 'headers': encode_headers(response.headers.items())})
+    await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+async def health(scope, receive, send):
+    """Async twin of app.health"""
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(db.text('SELECT 1'))
+    except Exception as e:
+        return await send_json(scope, send, {
+            'status': 'unhealthy',
+            'database': 'unavailable',
+            'error': str(e),
+            'timestamp': datetime.utcnow()
+        }, 503)
+
+    await send_json(scope, send, {
+        'status': 'healthy',
+        'database': 'connected',
+        'database_latency_ms': round((time.perf_counter() - started) * 1000, 3),
+        'timestamp': datetime.utcnow()
+    })
+
+
+async def get_comments(scope, receive, send, app_id):
+    """Async twin of app.get_comments"""
+    args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1')))
+    limit = max(1, min(args.get('limit', app.config['COMMENTS_PAGE_SIZE'], type=int),
+                       app.config['COMMENTS_MAX_PAGE_SIZE']))
+
+    try:
+        query = comment_roots_query(app_id, limit, args.get('cursor'))
+    except ValueError:
+        return await send_json(scope, send, {'error': 'Invalid cursor'}, 400)
+
+    async with Session() as session:
+        roots = (await session.execute(query)).all()
+        if not roots:
+            payload = await session.scalar(db.select(ArchivedApplication.payload)
+                                           .where(ArchivedApplication.id == app_id))
+            if payload is not None:
+                comments = unpack_archive(payload).comments
+                return await send_json(scope, send, archived_comments_page(comments, limit, args.get('cursor')))
+        page = roots[:limit]
+        replies = (await session.execute(comment_replies_query([c.id for c, _ in page]))).all() if page else []
+    await send_json(scope, send, comments_page(page, replies, len(roots) > limit))
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def application_events(scope, receive, send, app_id):
+    """Async twin of app.application_events; each open stream costs a queue, not a thread"""
+    if not app.config['EVENTS_ENABLED']:
+        return await flask_app(scope, receive, send)  # the Flask view's 'disabled' response
+    async with Session() as session:
+        if await session.get(GrantApplication, app_id) is None:
+            return await flask_app(scope, receive, send)  # Flask's own 404 page
+        row = await session.get(ApplicationTally, app_id) or (await session.execute(tally_query([app_id]))).first()
+        last_comment_id = await session.scalar(
+            db.select(db.func.max(Comment.id)).where(Comment.application_id == app_id)
+        ) or 0
+    tally = tally_from_row(row) if row else {'accept': 0, 'reject': 0, 'pending': 0, 'total': 0, 'last_vote_at': None}
+
+    subscription = broker.subscribe(app_id, vote_summary(tally), last_comment_id, loop=asyncio.get_running_loop())
+    if subscription is None:
+        return await send_json(scope, send, {'error': 'Too many open event streams'}, 503)
+    heartbeat = app.config['EVENTS_HEARTBEAT_INTERVAL']
+    headers = [('Content-Type', 'text/event-stream; charset=utf-8'), ('Cache-Control', 'no-cache'),
+               ('X-Accel-Buffering', 'no')]
+    if app.config['EVENTS_ALLOW_ORIGIN']:
+        headers.append(('Access-Control-Allow-Origin', app.config['EVENTS_ALLOW_ORIGIN']))
+
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': encode_headers(headers)})
+        message = f'retry: 3000\nevent: tally\ndata: {dumps(vote_summary(tally)).decode()}\n\n'
+        while not subscription.dropped:
+            await send({'type': 'http.response.body', 'body': message.encode(), 'more_body': True})
+            next_message = asyncio.ensure_future(subscription.queue.get())
+            done, _ = await asyncio.wait({next_message, disconnected}, timeout=heartbeat,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                next_message.cancel()
+                break
+            if next_message in done:
+                message = next_message.result()
+            else:
+                next_message.cancel()
+                message = ': heartbeat\n\n'
+    finally:
+        disconnected.cancel()
+        broker.unsubscribe(app_id, subscription)
+
+
+ROUTES = [
+    (re.compile(r'/health'), health),
+    (re.compile(r'/api/comments/(\d+)'), get_comments),
+    (re.compile(r'/api/events/(\d+)'), application_events),
+]
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await asyncio.get_running_loop().run_in_executor(None, scheduler.start)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await engine.dispose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] == 'http' and scope['method'] == 'GET':
+        for pattern, handler in ROUTES:
+            match = pattern.fullmatch(scope['path'])
+            if match:
+                return await handler(scope, receive, send, *map(int, match.groups()))
+    await flask_app(scope, receive, send)
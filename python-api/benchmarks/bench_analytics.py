@@ -0,0 +1,110 @@
+"""Funding analytics benchmark: one vectorized pass versus one /api/results call per application.
+
+Seeds --applications applications (see seed.py), finalizes --finalized-ratio
+of them (a day ago) with the outcome their tally implies, then times
+GET /api/analytics/funding on a cold worker (every row read), after an
+application write and after a vote (changed rows re-read), and served from
+the cache. The PHP helper's current approach, one /api/results/<id> request
+per application, is timed on --sample applications and extrapolated.
+
+    python benchmarks/bench_analytics.py --applications 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, funding_frame, ApplicationTally, GrantApplication, Outcome, Vote
+from seed import seed
+
+
+def finalize(ratio, rng):
+    """Close ratio of the applications a day ago with the outcome of their current tally, in bulk"""
+    rows = db.session.execute(db.select(ApplicationTally.application_id, ApplicationTally.accept,
+                                        ApplicationTally.reject)).all()
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    updates = [{
+        'id': application_id,
+        'is_active': False,
+        'finalized_at': yesterday,
+        'updated_at': yesterday,
+        'outcome': Outcome.ACCEPTED if accept > reject else Outcome.REJECTED if reject > accept else Outcome.TIED
+    } for application_id, accept, reject in rows if rng.random() < ratio]
+    db.session.execute(db.update(GrantApplication), updates)
+    db.session.commit()
+    return len(updates)
+
+
+def timed(client, url, rounds):
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=100000)
+    parser.add_argument('--members', type=int, default=5)
+    parser.add_argument('--finalized-ratio', type=float, default=0.7)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--sample', type=int, default=500, help='applications fetched one by one')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = False
+    rng = random.Random(args.seed)
+    with app.app_context():
+        db.create_all()
+        seed(members=args.members, applications=args.applications, comments=0, seed=args.seed)
+        finalized = finalize(args.finalized_ratio, rng)
+        tokens = db.session.scalars(db.select(Vote.token).join(GrantApplication).where(
+            GrantApplication.is_active, Vote.vote_type.is_(None)).limit(args.rounds)).all()
+    client = app.test_client()
+    print(f'{args.applications} applications, {finalized} finalized')
+
+    def write_application():
+        with app.app_context():
+            db.session.execute(db.update(GrantApplication).where(GrantApplication.id == 1)
+                               .values(place=GrantApplication.place))  # bumps updated_at
+            db.session.commit()
+
+    def forget_frame():
+        funding_frame.applications = None  # as in a freshly started worker
+
+    def vote():
+        assert client.post(f'/api/vote/{tokens.pop()}', data={'vote_type': 'accept'}).status_code == 200
+
+    for label, invalidate in (('cold worker', lambda: (write_application(), forget_frame())),
+                              ('after application write', write_application), ('after vote', vote)):
+        latencies = []
+        for _ in range(args.rounds):
+            invalidate()
+            latencies.append(timed(client, '/api/analytics/funding', 1))
+        print(f'{label + ":":26} p50 {statistics.median(latencies):8.1f} ms')
+    print(f'{"cached:":26} p50 {timed(client, "/api/analytics/funding", args.rounds * 10):8.1f} ms')
+    print(f'funding frame: {funding_frame.stats()}')
+
+    started = time.perf_counter()
+    for application_id in rng.sample(range(1, args.applications + 1), args.sample):
+        assert client.get(f'/api/results/{application_id}').status_code == 200
+    per_call = (time.perf_counter() - started) / args.sample
+    print(f'/api/results per application: {per_call * 1000:.2f} ms -> '
+          f'{per_call * args.applications:.1f} s for all {args.applications}')
+
+
+if __name__ == '__main__':
+    main()
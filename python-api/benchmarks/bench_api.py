@@ -0,0 +1,221 @@
+"""API benchmark harness: throughput, latency percentiles and queries per request.
+
+Seeds a reproducible data set (see seed.py), then drives the hot endpoints
+through the Flask test client (in process, with SQL statements counted) and
+through a local Gunicorn (real HTTP, --concurrency client threads). Results
+are written as JSON; --compare exits with status 1 when an endpoint's p95
+is more than --tolerance percent slower than in a previous run.
+
+    python benchmarks/bench_api.py --output before.json
+    python benchmarks/bench_api.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, API_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+
+from app import app, db, Vote
+from seed import seed
+
+
+def build_targets(rng, app_ids, tokens, count):
+    """(name, method, [(url, form data)]) for every benchmarked endpoint"""
+    pick_apps = [rng.choice(app_ids) for _ in range(count)]
+    pick_tokens = [rng.choice(tokens) for _ in range(count)]
+    return [
+        ('application', 'GET', [(f'/api/applications/{a}', None) for a in pick_apps]),
+        ('results', 'GET', [(f'/api/results/{a}', None) for a in pick_apps]),
+        ('vote_page', 'GET', [(f'/vote/{t}', None) for t in pick_tokens]),
+        ('submit_vote', 'POST', [(f'/api/vote/{t}', {'vote_type': 'accept'}) for t in pick_tokens]),
+        ('comments', 'GET', [(f'/api/comments/{a}', None) for a in pick_apps]),
+    ]
+
+
+def percentile(sorted_values, p):
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(latencies, elapsed, queries=None):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'queries_per_request': round(queries / len(latencies), 2) if queries is not None else None
+    }
+
+
+def run_client(targets, warmup):
+    client = app.test_client()
+    with app.app_context():
+        engine = db.engine
+    queries = []
+    listener = lambda *args: queries.append(1)
+    results = {}
+
+    for name, method, requests in targets:
+        for url, data in requests[:warmup]:
+            client.open(url, method=method, data=data)
+
+        latencies = []
+        queries.clear()
+        event.listen(engine, 'before_cursor_execute', listener)
+        started = time.perf_counter()
+        for url, data in requests:
+            request_started = time.perf_counter()
+            response = client.open(url, method=method, data=data)
+            latencies.append(time.perf_counter() - request_started)
+            assert response.status_code == 200, (url, response.status_code)
+        elapsed = time.perf_counter() - started
+        event.remove(engine, 'before_cursor_execute', listener)
+        results[name] = summarize(latencies, elapsed, len(queries))
+    return results
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def http_request(base_url, method, url, data):
+    body = urllib.parse.urlencode(data).encode() if data else None
+    started = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(base_url + url, data=body, method=method)) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def run_gunicorn(targets, warmup, workers, concurrency):
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}', 'app:app'],
+        cwd=API_DIR, env=dict(os.environ), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(base_url + '/health').read()
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if server.poll() is not None:
+                    raise SystemExit('❌ Gunicorn did not start (pip install gunicorn)')
+                time.sleep(0.1)
+
+        results = {}
+        with ThreadPoolExecutor(concurrency) as pool:
+            for name, method, requests in targets:
+                list(pool.map(lambda r: http_request(base_url, method, *r), requests[:warmup]))
+                started = time.perf_counter()
+                latencies = list(pool.map(lambda r: http_request(base_url, method, *r), requests))
+                results[name] = summarize(latencies, time.perf_counter() - started)
+        return results
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=API_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Print p95 and throughput changes against a previous run; True when nothing regressed"""
+    ok = True
+    for mode, endpoints in results['results'].items():
+        for name, current in endpoints.items():
+            before = baseline.get('results', {}).get(mode, {}).get(name)
+            if not before:
+                continue
+            p95_change = (current['p95_ms'] / before['p95_ms'] - 1) * 100
+            rps_change = (current['throughput_rps'] / before['throughput_rps'] - 1) * 100
+            regressed = p95_change > tolerance
+            ok = ok and not regressed
+            print(f"{'❌' if regressed else '✅'} {mode:9} {name:12} p95 {before['p95_ms']:8.2f} -> "
+                  f"{current['p95_ms']:8.2f} ms ({p95_change:+6.1f}%)  throughput {rps_change:+6.1f}%")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=['client', 'gunicorn', 'both'], default='client')
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--applications', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=10, help='comments per application')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=500, help='timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=4, help='Gunicorn workers')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads against Gunicorn')
+    parser.add_argument('--output', help='write the JSON results to this file')
+    parser.add_argument('--compare', help='JSON results of a previous run')
+    parser.add_argument('--tolerance', type=float, default=20.0, help='allowed p95 slowdown in percent')
+    args = parser.parse_args()
+
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = False
+    with app.app_context():
+        db.create_all()
+        scale = seed(args.members, args.applications, args.comments, seed=args.seed)
+        tokens = db.session.scalars(db.select(Vote.token).order_by(Vote.id)).all()
+
+    targets = build_targets(random.Random(args.seed), list(range(1, args.applications + 1)), tokens, args.requests)
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'scale': scale,
+            'requests': args.requests,
+            'workers': args.workers,
+            'concurrency': args.concurrency
+        },
+        'results': {}
+    }
+    if args.mode in ('client', 'both'):
+        results['results']['client'] = run_client(targets, args.warmup)
+    if args.mode in ('gunicorn', 'both'):
+        results['results']['gunicorn'] = run_gunicorn(targets, args.warmup, args.workers, args.concurrency)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
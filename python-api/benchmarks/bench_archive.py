@@ -0,0 +1,106 @@
+"""Hot/cold archival: working-table size and query latency before and after, and archived read cost.
+
+Seeds --applications applications (see seed.py), marks --archive-ratio of
+them finalized two years ago, then reports what 'flask archive' reports
+(rows, bytes and hot-path query latency of the working tables) before and
+after archive_applications(), how long archiving took and how well the
+payloads compressed. Finally it times the read endpoints for applications
+still in the working tables and for archived ones.
+
+    python benchmarks/bench_archive.py --applications 20000 --members 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, archive_applications, archive_report, ArchivedApplication, GrantApplication
+from seed import seed
+
+
+def print_report(before, after):
+    print(f'{"table":22} {"rows before":>12} {"rows after":>12} {"MB before":>10} {"MB after":>10}')
+    for table in before['rows']:
+        sizes = [f'{size / 1e6:10.2f}' if size is not None else f'{"-":>10}'
+                 for size in (before['bytes'][table], after['bytes'][table])]
+        print(f'{table:22} {before["rows"][table]:12} {after["rows"][table]:12} {sizes[0]} {sizes[1]}')
+    print(f'{"hot-path query (ms)":22} {"before":>12} {"after":>12}')
+    for probe, latency in before['latency_ms'].items():
+        print(f'{probe:22} {latency:12.3f} {after["latency_ms"][probe]:12.3f}')
+
+
+def timed(client, urls):
+    latencies = []
+    for url in urls:
+        started = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, (url, response.status_code)
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=20000)
+    parser.add_argument('--members', type=int, default=20)
+    parser.add_argument('--comments', type=int, default=5, help='comments per application')
+    parser.add_argument('--archive-ratio', type=float, default=0.8)
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--sample', type=int, default=200, help='applications read per endpoint and tier')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = False
+    rng = random.Random(args.seed)
+    with app.app_context():
+        db.create_all()
+        seed(members=args.members, applications=args.applications, comments=args.comments, seed=args.seed)
+        old = [application_id for application_id in range(1, args.applications + 1)
+               if rng.random() < args.archive_ratio]
+        long_ago = datetime.utcnow() - timedelta(days=730)
+        db.session.execute(db.update(GrantApplication).where(GrantApplication.id.in_(old)).values(
+            is_active=False, finalized_at=long_ago, updated_at=long_ago
+        ))
+        db.session.commit()
+
+        before = archive_report()
+        started = time.perf_counter()
+        stats = archive_applications(datetime.utcnow() - timedelta(days=365), args.batch_size)
+        elapsed = time.perf_counter() - started
+        after = archive_report()
+        archived = set(db.session.scalars(db.select(ArchivedApplication.id)))
+        hot = sorted(set(range(1, args.applications + 1)) - archived)
+
+    print(f'{args.applications} applications x {args.members} voters, {args.comments} comments each')
+    print_report(before, after)
+    print(f'archived {stats["archived"]} applications in {elapsed:.1f} s '
+          f'({stats["archived"] / elapsed:.0f}/s, {stats["skipped"]} skipped); payloads '
+          f'{stats["raw_bytes"] / 1e6:.1f} MB of JSON -> {stats["compressed_bytes"] / 1e6:.1f} MB '
+          f'({stats["raw_bytes"] / max(stats["compressed_bytes"], 1):.1f}x)')
+
+    client = app.test_client()
+    print(f'{"endpoint":28} {"hot p50 ms":>11} {"archived p50 ms":>16}')
+    samples = {'hot': rng.sample(hot, min(args.sample, len(hot))),
+               'archived': rng.sample(sorted(archived), min(args.sample, len(archived)))}
+    for label, pattern in (('/api/applications/<id>', '/api/applications/{}'),
+                           ('/api/results/<id>', '/api/results/{}'),
+                           ('/api/comments/<id>', '/api/comments/{}')):
+        latencies = {tier: timed(client, [pattern.format(i) for i in ids]) for tier, ids in samples.items()}
+        print(f'{label:28} {latencies["hot"]:11.2f} {latencies["archived"]:16.2f}')
+    batch = ','.join(map(str, samples['hot'][:25] + samples['archived'][:25]))
+    print(f'{"/api/results/batch (50 ids)":28} {timed(client, [f"/api/results/batch?ids={batch}"] * 20):11.2f} '
+          f'{"(25 of each)":>16}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""ASGI versus Gunicorn sync serving: concurrent connections and latency.
+
+Seeds a reproducible data set (see seed.py) and serves it in turn from
+Gunicorn sync workers and gthread workers (both as in
+documentation/deployment.md) and from uvicorn asgi:application. For each
+server it times --requests GET /api/comments/<id> and /api/applications/<id>
+requests from --concurrency client threads, then opens --streams
+Server-Sent Events connections and times --stream-requests of them again
+while the streams stay open. Requests not answered within --timeout
+seconds count as failed.
+
+    python benchmarks/bench_asgi.py --workers 4 --streams 2000
+"""
+import argparse
+import math
+import os
+import random
+import resource
+import selectors
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+os.environ['EVENTS_ENABLED'] = 'true'
+os.environ.setdefault('EVENTS_MAX_CONNECTIONS', '1000')  # past the gthread pool, as ASGI streams take no thread
+sys.path.insert(0, API_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db
+from seed import seed
+
+
+def server_commands(workers, port):
+    bind = f'127.0.0.1:{port}'
+    return {
+        'gunicorn sync': ['-m', 'gunicorn', '-w', str(workers), '-b', bind, 'app:app'],
+        'gunicorn gthread': ['-m', 'gunicorn', '-w', str(workers), '--worker-class', 'gthread', '--threads', '256',
+                             '-b', bind, 'app:app'],
+        'uvicorn asgi': ['-m', 'uvicorn', 'asgi:application', '--workers', str(workers), '--host', '127.0.0.1',
+                         '--port', str(port), '--log-level', 'warning'],
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values, p):
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def timed_get(base_url, url, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(base_url + url, timeout=timeout) as response:
+            response.read()
+    except (urllib.error.URLError, OSError):
+        return None
+    return time.perf_counter() - started
+
+
+def measure(base_url, urls, concurrency, timeout):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(lambda url: timed_get(base_url, url, timeout), urls))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(r for r in results if r is not None)
+    if not latencies:
+        return f'{"-":>9} {"-":>9} {"-":>9}  failed {len(results):5}'
+    return (f'{len(latencies) / elapsed:9.1f} {percentile(latencies, 50) * 1000:9.1f} '
+            f'{percentile(latencies, 99) * 1000:9.1f}  failed {len(results) - len(latencies):5}')
+
+
+def open_streams(port, application_ids, count, timeout):
+    """Open count event streams; returns the sockets and how many got their first event in time"""
+    selector = selectors.DefaultSelector()
+    sockets = []
+    for i in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(f'GET /api/events/{application_ids[i % len(application_ids)]} HTTP/1.1\r\n'
+                     f'Host: localhost\r\n\r\n'.encode())
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ)
+        sockets.append(sock)
+
+    connected = set()
+    deadline = time.perf_counter() + timeout
+    while len(connected) < count and time.perf_counter() < deadline:
+        for key, _ in selector.select(timeout=0.5):
+            try:
+                if b'event: tally' in key.fileobj.recv(65536):
+                    connected.add(key.fileobj)
+            except OSError:
+                pass
+    selector.close()
+    return sockets, len(connected)
+
+
+def server_rss_mb(server):
+    pids = [str(server.pid)] + subprocess.run(['ps', '-o', 'pid=', '--ppid', str(server.pid)],
+                                              capture_output=True, text=True).stdout.split()
+    rss = subprocess.run(['ps', '-o', 'rss=', '-p', ','.join(pids)], capture_output=True, text=True).stdout.split()
+    return sum(int(kb) for kb in rss) / 1024
+
+
+def run_server(label, command, port, urls, application_ids, args):
+    server = subprocess.Popen([sys.executable] + command, cwd=API_DIR, env=dict(os.environ),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    sockets = []
+    try:
+        for _ in range(100):
+            if timed_get(base_url, '/health', 1) is not None:
+                break
+            if server.poll() is not None:
+                raise SystemExit(f'❌ {label} did not start (pip install gunicorn uvicorn a2wsgi aiosqlite)')
+            time.sleep(0.1)
+        measure(base_url, urls[:args.concurrency * 2], args.concurrency, args.timeout)  # warm up
+
+        print(f'{label:17} {"no streams":>12}      {measure(base_url, urls, args.concurrency, args.timeout)}')
+        sockets, connected = open_streams(port, application_ids, args.streams, args.timeout)
+        loaded = measure(base_url, urls[:args.stream_requests], args.concurrency, args.timeout)
+        print(f'{label:17} {connected:5}/{args.streams:<6} {loaded}'
+              f'  RSS {server_rss_mb(server):6.0f} MB')
+    finally:
+        for sock in sockets:
+            sock.close()
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--streams', type=int, default=2000, help='event streams held open')
+    parser.add_argument('--requests', type=int, default=1000, help='timed requests per measurement')
+    parser.add_argument('--stream-requests', type=int, default=200, help='timed requests while streams are open')
+    parser.add_argument('--concurrency', type=int, default=32, help='client threads')
+    parser.add_argument('--timeout', type=float, default=5.0, help='seconds before a request counts as failed')
+    parser.add_argument('--applications', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    with app.app_context():
+        db.create_all()
+        seed(members=20, applications=args.applications, comments=10, seed=args.seed)
+
+    rng = random.Random(args.seed)
+    application_ids = list(range(1, args.applications + 1))
+    urls = [rng.choice([f'/api/comments/{a}', f'/api/applications/{a}']) for a in
+            (rng.choice(application_ids) for _ in range(args.requests))]
+
+    print(f'{args.workers} workers, {args.concurrency} client threads, {args.requests} requests per row')
+    print(f'{"server":17} {"streams open":>12}  {"req/s":>9} {"p50 ms":>9} {"p99 ms":>9}')
+    for label in ('gunicorn sync', 'gunicorn gthread', 'uvicorn asgi'):
+        port = free_port()
+        run_server(label, server_commands(args.workers, port)[label], port, urls, application_ids, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Ballot issuance benchmark: per-row ORM adds versus one executemany INSERT.
+
+Creates a synthetic committee and a call's worth of applications, then
+issues every member's ballot token both ways and reports rows per second.
+
+    python benchmarks/bench_ballot_issue.py --members 50 --applications 300
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, GrantApplication, GrantType, Vote, VoteType, VotingMember, generate_voting_token, issue_ballots
+
+
+def create_applications(count, offset):
+    applications = [GrantApplication(
+        reference_code=f'CA{offset + i:06d}',
+        submitter_name='Bench',
+        candidate_full_name=f'Candidate {offset + i}',
+        grant_type=GrantType.STSM,
+        date=datetime.utcnow().date(),
+        place='Nowhere',
+        amount_requested=1000.0,
+        voting_deadline=datetime.utcnow() + timedelta(days=7)
+    ) for i in range(count)]
+    db.session.add_all(applications)
+    db.session.commit()
+    return [a.id for a in applications]
+
+
+def issue_per_row(application_ids):
+    """The original approach: one ORM object and INSERT per ballot"""
+    members = VotingMember.query.filter_by(is_active=True).all()
+    for application_id in application_ids:
+        for member in members:
+            db.session.add(Vote(
+                application_id=application_id,
+                voter_id=member.id,
+                vote_type=VoteType.ACCEPT,
+                token=generate_voting_token()
+            ))
+    db.session.commit()
+
+
+def issue_bulk(application_ids):
+    issue_ballots(application_ids)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--applications', type=int, default=300)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            VotingMember(name=f'Member {i}', position='Bench', email=f'member{i}@example.com')
+            for i in range(args.members)
+        ])
+        db.session.commit()
+
+        rows = args.members * args.applications
+        for offset, (label, issue) in enumerate([('per-row add', issue_per_row), ('bulk insert', issue_bulk)]):
+            application_ids = create_applications(args.applications, offset * args.applications)
+            started = time.perf_counter()
+            issue(application_ids)
+            elapsed = time.perf_counter() - started
+            print(f'{label:12} {rows} ballots in {elapsed:.3f} s  ({rows / elapsed:,.0f} rows/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Batch reads versus one request per application, the way the Laravel index pages fetch.
+
+Seeds a reproducible data set (see seed.py) and, for each --pages size,
+fetches that many random applications once per id (/api/applications/<id>
+and /api/results/<id>, sequentially, as GrantVotingService did) and once
+through /api/applications/batch and /api/results/batch. SQL statements per
+page are counted in-process with the test client; wall-clock latency is
+measured over HTTP against a Gunicorn server (a fresh connection per
+request, like Laravel's Http client), so the round trips are included.
+
+    python benchmarks/bench_batch.py --applications 5000 --pages 10 50 200
+"""
+import argparse
+import os
+import random
+import statistics
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from sqlalchemy import event
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, API_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db
+from seed import seed
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def page_urls(resource, ids, batch):
+    if batch:
+        return [f'/api/{resource}/batch?ids={",".join(map(str, ids))}']
+    return [f'/api/{resource}/{app_id}' for app_id in ids]
+
+
+def count_queries(client, urls):
+    queries = []
+    listener = lambda *args: queries.append(1)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', listener)
+    for url in urls:
+        assert client.get(url).status_code == 200, url
+    event.remove(engine, 'before_cursor_execute', listener)
+    return len(queries)
+
+
+def fetch_page(base_url, urls):
+    started = time.perf_counter()
+    for url in urls:
+        with urllib.request.urlopen(base_url + url) as response:
+            response.read()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=5000)
+    parser.add_argument('--members', type=int, default=20)
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 50, 200], help='applications per index page')
+    parser.add_argument('--rounds', type=int, default=10, help='pages fetched per size and pattern')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = False
+    with app.app_context():
+        db.create_all()
+        seed(members=args.members, applications=args.applications, comments=0, seed=args.seed)
+    app.config['BATCH_MAX_IDS'] = max(args.pages)
+    client = app.test_client()
+    rng = random.Random(args.seed)
+
+    port = free_port()
+    factory = f"app:create_app({{'BATCH_MAX_IDS': {max(args.pages)}, 'DEADLINE_SCHEDULER_ENABLED': False}})"
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-w', str(args.workers), '-b', f'127.0.0.1:{port}',
+                               factory], cwd=API_DIR, env=dict(os.environ),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(base_url + '/health', timeout=1).read()
+                break
+            except OSError:
+                if server.poll() is not None:
+                    raise SystemExit('❌ Gunicorn did not start (pip install gunicorn)')
+                time.sleep(0.1)
+
+        print(f'{args.applications} applications x {args.members} voters, median of {args.rounds} pages')
+        print(f'{"endpoint":14} {"page":>5} {"pattern":>8} {"requests":>9} {"queries":>8} {"ms/page":>9}')
+        for resource in ('applications', 'results'):
+            for size in args.pages:
+                pages = [rng.sample(range(1, args.applications + 1), size) for _ in range(args.rounds)]
+                for batch in (False, True):
+                    urls = page_urls(resource, pages[0], batch)
+                    queries = count_queries(client, urls)
+                    fetch_page(base_url, urls)  # warm up both workers
+                    latency = statistics.median(fetch_page(base_url, page_urls(resource, ids, batch))
+                                                for ids in pages)
+                    print(f'{resource:14} {size:5} {"batch" if batch else "per id":>8} {len(urls):9} '
+                          f'{queries:8} {latency * 1000:9.1f}')
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
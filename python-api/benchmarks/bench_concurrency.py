@@ -0,0 +1,131 @@
+"""Concurrent vote submission benchmark across database backends.
+
+Spawns --workers processes (each with its own app and connection pool, like
+Gunicorn workers) that submit votes at the same moment, then reports p50/p99
+latency and "database is locked" errors per backend. SQLite runs in both
+rollback-journal and WAL mode; pass --postgres-url to include a throwaway
+local PostgreSQL database (its tables are dropped and recreated).
+
+    python benchmarks/bench_concurrency.py --workers 8 --votes 100
+    python benchmarks/bench_concurrency.py --postgres-url postgresql://localhost/voting_bench
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(members):
+    from app import app, db, GrantApplication, GrantType, Vote, VotingMember, issue_ballots
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(db.insert(VotingMember), [
+            {'name': f'Member {i}', 'position': 'Bench', 'email': f'member{i}@example.com'}
+            for i in range(members)
+        ])
+        application = GrantApplication(
+            reference_code='CA000001',
+            submitter_name='Bench',
+            candidate_full_name='Bench Candidate',
+            grant_type=GrantType.STSM,
+            date=datetime.utcnow().date(),
+            place='Nowhere',
+            amount_requested=1000.0,
+            voting_deadline=datetime.utcnow() + timedelta(days=7)
+        )
+        db.session.add(application)
+        db.session.flush()
+        issue_ballots([application.id])
+        db.session.commit()
+        return [v.token for v in Vote.query.order_by(Vote.id)]
+
+
+def submit_votes(env, tokens, barrier, results):
+    os.environ.update(env)
+    from sqlalchemy.exc import OperationalError
+    from app import app
+
+    app.config['PROPAGATE_EXCEPTIONS'] = True
+    client = app.test_client()
+    latencies, locked, failed = [], 0, 0
+
+    barrier.wait()
+    for token in tokens:
+        started = time.perf_counter()
+        try:
+            response = client.post(f'/api/vote/{token}', data={'vote_type': 'accept'})
+            if response.status_code != 200:
+                failed += 1
+        except OperationalError as e:
+            if 'locked' in str(e):
+                locked += 1
+            else:
+                failed += 1
+        latencies.append(time.perf_counter() - started)
+    results.put((latencies, locked, failed))
+
+
+def run(label, env, workers, votes):
+    os.environ.update(env)
+    tokens = seed(workers * votes)
+
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=submit_votes, args=(env, tokens[i::workers], barrier, results))
+        for i in range(workers)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for worker_latencies, _, _ in collected for l in worker_latencies)
+    locked = sum(r[1] for r in collected)
+    failed = sum(r[2] for r in collected)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f'{label:16} {len(latencies):6} votes  p50 {p50:7.2f} ms  p99 {p99:8.2f} ms  '
+          f'locked {locked:5}  other errors {failed:4}  ({len(latencies) / elapsed:,.0f} votes/s incl. startup)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--votes', type=int, default=100, help='votes submitted per worker')
+    parser.add_argument('--postgres-url', help='throwaway PostgreSQL database URL')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix='voting-bench-')
+    backends = [
+        ('sqlite (journal)', {'DATABASE_URL': f"sqlite:///{os.path.join(tmp_dir, 'journal.db')}",
+                              'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_BUSY_TIMEOUT': '0'}),
+        ('sqlite (WAL)', {'DATABASE_URL': f"sqlite:///{os.path.join(tmp_dir, 'wal.db')}",
+                          'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_BUSY_TIMEOUT': '5000'}),
+    ]
+    if args.postgres_url:
+        backends.append(('postgresql', {'DATABASE_URL': args.postgres_url}))
+
+    print(f'{args.workers} workers x {args.votes} votes')
+    for label, env in backends:
+        # Each backend is seeded from a fresh interpreter so the app picks up its URL
+        process = multiprocessing.get_context('spawn').Process(target=run, args=(label, env, args.workers, args.votes))
+        process.start()
+        process.join()
+
+
+if __name__ == '__main__':
+    main()
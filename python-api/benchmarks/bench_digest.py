@@ -0,0 +1,90 @@
+"""Notification benchmark: one email per ballot versus one digest per member.
+
+Seeds --members members and --applications open applications, then renders
+and "sends" (MAIL_SUPPRESS_SEND) every invitation once through the immediate
+dispatcher and once through send_digests(). Reports emails sent, SQL
+queries and time spent.
+
+    python benchmarks/bench_digest.py --members 1000 --applications 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_mail import email_dispatched
+from sqlalchemy import event
+
+from app import app, db, dispatcher, GrantApplication, GrantType, Vote, VotingMember, issue_ballots, send_digests
+
+
+def seed(applications, members):
+    db.session.execute(db.insert(VotingMember), [
+        {'name': f'Member {i}', 'position': 'Bench', 'email': f'member{i}@example.com'}
+        for i in range(members)
+    ])
+    deadline = datetime.utcnow() + timedelta(days=7)
+    db.session.execute(db.insert(GrantApplication), [{
+        'reference_code': f'CA{i:06d}',
+        'submitter_name': 'Bench',
+        'candidate_full_name': f'Candidate {i}',
+        'grant_type': GrantType.STSM,
+        'date': deadline.date(),
+        'place': 'Nowhere',
+        'amount_requested': 1000.0,
+        'voting_deadline': deadline
+    } for i in range(applications)])
+    issue_ballots(range(1, applications + 1))
+    db.session.commit()
+
+
+def reset_delivery():
+    db.session.execute(db.update(Vote).values(delivery_status='queued', delivery_attempts=0, delivered_at=None))
+    db.session.commit()
+
+
+def measure(label, send):
+    emails, queries = [], []
+    receiver = lambda app, message: emails.append(message)
+    listener = lambda *args: queries.append(1)
+    email_dispatched.connect(receiver)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    started = time.perf_counter()
+    send()
+    elapsed = time.perf_counter() - started
+    event.remove(db.engine, 'before_cursor_execute', listener)
+    email_dispatched.disconnect(receiver)
+    size = sum(len(m.html) for m in emails)
+    print(f'{label:10} {len(emails):7} emails  {len(queries):6} queries  {elapsed:7.2f} s  '
+          f'{elapsed * 1000 / max(len(emails), 1):6.2f} ms/email  {size / 1e6:6.1f} MB html')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', type=int, default=1000)
+    parser.add_argument('--applications', type=int, default=100)
+    args = parser.parse_args()
+
+    app.config['MAIL_SUPPRESS_SEND'] = True
+
+    with app.app_context():
+        db.create_all()
+        seed(args.applications, args.members)
+        vote_ids = [vote_id for (vote_id,) in db.session.execute(db.select(Vote.id).order_by(Vote.id))]
+
+        print(f'{args.members} members x {args.applications} applications')
+        batch = app.config['MAIL_BATCH_SIZE']
+        measure('immediate', lambda: [dispatcher.deliver([(vote_id, False) for vote_id in vote_ids[i:i + batch]])
+                                      for i in range(0, len(vote_ids), batch)])
+        reset_delivery()
+        measure('digest', send_digests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Live events load test: one vote fanned out to many Server-Sent Events streams.
+
+Serves the app from a threaded local server, opens --subscribers streams on
+one application, then casts --votes votes and measures how long each vote
+takes to reach every subscriber. Also reports the SQL statements a vote
+costs and what the event poller reads while idle, versus the same number of
+dashboards polling /api/results every --poll-every seconds.
+
+    python benchmarks/bench_events.py --subscribers 1000 --votes 20
+"""
+import argparse
+import logging
+import os
+import resource
+import selectors
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from werkzeug.serving import make_server
+
+from app import app, db, GrantApplication, GrantType, Vote, VotingMember, issue_ballots
+
+
+def seed(members):
+    db.session.execute(db.insert(VotingMember), [
+        {'name': f'Member {i}', 'position': 'Bench', 'email': f'member{i}@example.com'}
+        for i in range(members)
+    ])
+    application = GrantApplication(
+        reference_code='CA000001',
+        submitter_name='Bench',
+        candidate_full_name='Bench Candidate',
+        grant_type=GrantType.STSM,
+        date=datetime.utcnow().date(),
+        place='Nowhere',
+        amount_requested=1000.0,
+        voting_deadline=datetime.utcnow() + timedelta(days=7)
+    )
+    db.session.add(application)
+    db.session.flush()
+    issue_ballots([application.id])
+    db.session.commit()
+    return application.id, [v.token for v in Vote.query.order_by(Vote.id)]
+
+
+def open_streams(port, application_id, count):
+    sockets = []
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(f'GET /api/events/{application_id} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+        sock.setblocking(False)
+        sockets.append(sock)
+    return sockets
+
+
+def wait_for_events(selector, received, expected, timeout=30):
+    """Read every stream until each has seen `expected` tally events; return arrival times"""
+    arrivals = {}
+    deadline = time.perf_counter() + timeout
+    while len(arrivals) < len(received) and time.perf_counter() < deadline:
+        for key, _ in selector.select(timeout=1):
+            sock = key.fileobj
+            chunk = sock.recv(65536)
+            received[sock] += chunk.count(b'event: tally')
+            if received[sock] >= expected and sock not in arrivals:
+                arrivals[sock] = time.perf_counter()
+    return arrivals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=1000)
+    parser.add_argument('--votes', type=int, default=20)
+    parser.add_argument('--poll-every', type=float, default=5.0, help='seconds between dashboard polls')
+    args = parser.parse_args()
+
+    app.config.update(DEADLINE_SCHEDULER_ENABLED=False, EVENTS_ENABLED=True, EVENTS_MAX_CONNECTIONS=args.subscribers)
+    with app.app_context():
+        db.create_all()
+        application_id, tokens = seed(args.votes)
+        engine = db.engine
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    server.request_queue_size = args.subscribers
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    started = time.perf_counter()
+    sockets = open_streams(server.server_port, application_id, args.subscribers)
+    selector = selectors.DefaultSelector()
+    for sock in sockets:
+        selector.register(sock, selectors.EVENT_READ)
+    received = {sock: 0 for sock in sockets}
+    connected = wait_for_events(selector, received, 1)
+    print(f'{len(connected)}/{args.subscribers} streams open in {time.perf_counter() - started:.2f} s')
+
+    queries = []
+    listener = lambda *args: queries.append(1)
+    event.listen(engine, 'before_cursor_execute', listener)
+    client = app.test_client()
+    latencies = []
+    for i, token in enumerate(tokens, start=2):
+        cast = time.perf_counter()
+        assert client.post(f'/api/vote/{token}', data={'vote_type': 'accept'}).status_code == 200
+        arrivals = wait_for_events(selector, received, i)
+        latencies += [arrival - cast for arrival in arrivals.values()]
+        missing = args.subscribers - len(arrivals)
+        if missing:
+            print(f'vote {i - 1}: {missing} subscribers did not receive the tally')
+    vote_queries = len(queries) / len(tokens)
+
+    queries.clear()
+    time.sleep(10)
+    idle_queries = len(queries) / 10
+    event.remove(engine, 'before_cursor_execute', listener)
+
+    latencies.sort()
+    print(f'fan-out per vote: p50 {statistics.median(latencies) * 1000:.1f} ms  '
+          f'p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms  max {latencies[-1] * 1000:.1f} ms')
+    print(f'SQL per vote: {vote_queries:.1f} statements; event poller while idle: {idle_queries:.1f} statements/s')
+    print(f'{args.subscribers} dashboards polling /api/results every {args.poll_every:g} s: '
+          f'{args.subscribers / args.poll_every:.0f} requests/s')
+    print(f'peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB')
+
+    for sock in sockets:
+        sock.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
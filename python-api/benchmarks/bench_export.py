@@ -0,0 +1,109 @@
+"""Results export benchmark: peak RSS and rows/sec of the streaming export.
+
+Builds a fixture of --applications x --members cast votes (1M by default),
+then runs each export in a fresh subprocess so its peak RSS is measured on
+its own. The "buffered" mode loads every row at once and serializes the
+same row dicts, with the same dumps(), into one JSON document, the way a
+jsonify response is built.
+
+    python benchmarks/bench_export.py --applications 20000 --members 50
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(applications, members):
+    from app import app, db, BallotState, GrantApplication, GrantType, Vote, VoteType, VotingMember
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(VotingMember), [
+            {'name': f'Member {i}', 'position': 'Bench', 'email': f'member{i}@example.com'}
+            for i in range(members)
+        ])
+        now = datetime.utcnow()
+        db.session.execute(db.insert(GrantApplication), [{
+            'reference_code': f'CA{i:06d}',
+            'submitter_name': 'Bench',
+            'candidate_full_name': f'Candidate {i}',
+            'grant_type': GrantType.STSM,
+            'date': now.date(),
+            'place': 'Nowhere',
+            'amount_requested': 1000.0,
+            'voting_deadline': now + timedelta(days=7)
+        } for i in range(applications)])
+        for first in range(1, applications + 1, 1000):
+            db.session.execute(db.insert(Vote), [{
+                'application_id': a,
+                'voter_id': m,
+                'state': BallotState.CAST,
+                'vote_type': random.choice([VoteType.ACCEPT, VoteType.REJECT]),
+                'token': f'{a}-{m}',
+                'voted_at': now
+            } for a in range(first, min(first + 1000, applications + 1)) for m in range(1, members + 1)])
+        db.session.commit()
+
+
+def run_export(mode):
+    from app import app, db, dumps, BallotState, GrantApplication, Vote, VotingMember, EXPORT_COLUMNS
+
+    client = app.test_client()
+    started = time.perf_counter()
+    if mode == 'buffered':
+        with app.app_context():
+            rows = db.session.execute(
+                db.select(GrantApplication.id, GrantApplication.reference_code, GrantApplication.candidate_full_name,
+                          GrantApplication.grant_type, GrantApplication.amount_requested, GrantApplication.currency,
+                          VotingMember.name, VotingMember.position, Vote.vote_type, Vote.rejection_reason,
+                          Vote.voted_at)
+                .join(Vote, Vote.application_id == GrantApplication.id)
+                .join(VotingMember, Vote.voter_id == VotingMember.id)
+                .where(Vote.state == BallotState.CAST)
+                .order_by(GrantApplication.id, Vote.id)
+            ).all()
+            body = dumps([dict(zip(EXPORT_COLUMNS, row)) for row in rows])
+            count, size = len(rows), len(body)
+    else:
+        response = client.get(f'/api/results/export?format={mode}')
+        count = size = 0
+        for chunk in response.response:
+            count += chunk.count(b'\n') if isinstance(chunk, bytes) else chunk.count('\n')
+            size += len(chunk)
+        if mode == 'csv':
+            count -= 1
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{mode:9} {count:>9} rows  {count / elapsed:>10,.0f} rows/s  {size / 1e6:8.1f} MB out  peak RSS {peak_mb:7.1f} MB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=20000)
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--run', choices=['ndjson', 'csv', 'buffered'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_export(args.run)
+        return
+
+    tmp_dir = tempfile.mkdtemp(prefix='voting-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    seed(args.applications, args.members)
+    print(f'{args.applications * args.members} votes')
+
+    for mode in ['ndjson', 'csv', 'buffered']:
+        subprocess.run([sys.executable, '-W', 'ignore', __file__, '--run', mode], check=True)
+
+
+if __name__ == '__main__':
+    main()
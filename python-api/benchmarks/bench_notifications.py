@@ -0,0 +1,87 @@
+"""Throughput benchmark for the background notification dispatcher.
+
+Starts a local aiosmtpd sink, issues ballots for a synthetic committee and
+reports how many voting emails per second the dispatcher delivers.
+
+    pip install aiosmtpd
+    python benchmarks/bench_notifications.py --members 500 --workers 4 --batch-size 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, dispatcher, GrantApplication, GrantType, Vote, VotingMember, issue_ballots, send_voting_notification
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--port', type=int, default=8025)
+    args = parser.parse_args()
+
+    controller = Controller(Sink(), hostname='127.0.0.1', port=args.port)
+    controller.start()
+
+    app.config.update(
+        MAIL_SERVER='127.0.0.1',
+        MAIL_PORT=args.port,
+        MAIL_USE_TLS=False,
+        MAIL_PASSWORD=None,
+        MAIL_DISPATCH_WORKERS=args.workers,
+        MAIL_BATCH_SIZE=args.batch_size,
+    )
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            VotingMember(name=f'Member {i}', position='Bench', email=f'member{i}@example.com')
+            for i in range(args.members)
+        ])
+        application = GrantApplication(
+            reference_code='CA000001',
+            submitter_name='Bench',
+            candidate_full_name='Bench Candidate',
+            grant_type=GrantType.STSM,
+            date=datetime.utcnow().date(),
+            place='Nowhere',
+            amount_requested=1000.0,
+            voting_deadline=datetime.utcnow() + timedelta(days=7)
+        )
+        db.session.add(application)
+        db.session.flush()
+        issue_ballots([application.id])
+        db.session.commit()
+
+        started = time.perf_counter()
+        send_voting_notification([application.id])
+        enqueued = time.perf_counter()
+        dispatcher.join()
+        finished = time.perf_counter()
+
+        sent = Vote.query.filter_by(delivery_status='sent').count()
+        failed = Vote.query.filter_by(delivery_status='failed').count()
+
+    controller.stop()
+
+    print(f'members:           {args.members}')
+    print(f'workers x batch:   {args.workers} x {args.batch_size}')
+    print(f'request time:      {(enqueued - started) * 1000:.1f} ms')
+    print(f'delivery time:     {finished - started:.2f} s')
+    print(f'sent / failed:     {sent} / {failed}')
+    print(f'throughput:        {sent / (finished - started):.1f} msg/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Rate limiter overhead: cost per check, shared-bucket accuracy and request latency.
+
+Times --checks bucket checks against the in-process and the SQLite backend,
+lets --workers processes drain one shared SQLite bucket at once (exactly its
+burst must be granted), then requests /vote/<token> through the test client
+with the limiter off and on (limits raised so nothing is throttled; best
+p50 of --rounds) and malformed tokens, which must be answered without a database query.
+
+    python benchmarks/bench_rate_limit.py --checks 100000 --requests 2000
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+
+from app import app, db, rate_limiter, MemoryRateLimitBackend, SQLiteRateLimitBackend, Vote
+from seed import seed
+
+
+def time_checks(backend, checks, keys):
+    started = time.perf_counter()
+    for i in range(checks):
+        backend.take(f'vote_page:ip:10.0.{i % keys // 256}.{i % 256}', 1e9, 1.0)
+    return (time.perf_counter() - started) / checks * 1e6
+
+
+def drain(path, attempts, barrier, results):
+    backend = SQLiteRateLimitBackend(path, 5000)
+    backend.connection()
+    barrier.wait()
+    results.put(sum(not backend.take('submit_vote:token:shared', 100, 1e-9) for _ in range(attempts)))
+
+
+def shared_bucket(workers, attempts):
+    path = os.path.join(TMP_DIR, 'shared.db')
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=drain, args=(path, attempts, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    granted = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return granted
+
+
+def time_requests(client, urls):
+    latencies = []
+    for url in urls:
+        started = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code in (200, 404), (url, response.status_code)
+    return statistics.median(latencies) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--checks', type=int, default=100000)
+    parser.add_argument('--keys', type=int, default=1000, help='distinct client IPs')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000, help='timed /vote/<token> requests per run')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    print('backend   us/check')
+    print(f"memory    {time_checks(MemoryRateLimitBackend(100000), args.checks, args.keys):8.2f}")
+    sqlite_backend = SQLiteRateLimitBackend(os.path.join(TMP_DIR, 'checks.db'), 5000)
+    print(f"sqlite    {time_checks(sqlite_backend, args.checks, args.keys):8.2f}")
+
+    granted = shared_bucket(args.workers, 50)
+    print(f'\n{args.workers} processes x 50 checks on one shared bucket of 100: {granted} granted '
+          f"{'✅' if granted == 100 else '❌'}")
+
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = False
+    app.config['RATE_LIMITS'] = {endpoint: {scope: (1e9, 1.0) for scope in limits}
+                                 for endpoint, limits in app.config['RATE_LIMITS'].items()}
+    app.config['RATE_LIMIT_SQLITE_PATH'] = os.path.join(TMP_DIR, 'requests.db')
+    with app.app_context():
+        db.create_all()
+        seed(members=20, applications=50, comments=2)
+        tokens = db.session.scalars(db.select(Vote.token).order_by(Vote.id)).all()
+        engine = db.engine
+    urls = [f'/vote/{tokens[i % len(tokens)]}' for i in range(args.requests)]
+    client = app.test_client()
+    time_requests(client, urls)  # warm the token and fragment caches
+
+    # Configurations alternate over --rounds so drift does not favour one of them
+    p50s = {'off': [], 'memory': [], 'sqlite': []}
+    for _ in range(args.rounds):
+        for backend in p50s:
+            app.config['RATE_LIMIT_ENABLED'] = backend != 'off'
+            app.config['RATE_LIMIT_BACKEND'] = backend
+            rate_limiter.backend = None
+            p50s[backend].append(time_requests(client, urls))
+    baseline = min(p50s['off'])
+    print('\n/vote/<token>   p50 us   overhead')
+    for backend, values in p50s.items():
+        print(f'{backend:13} {min(values):8.1f}   {min(values) - baseline:+7.1f}')
+
+    queries = []
+    listener = lambda *args: queries.append(1)
+    event.listen(engine, 'before_cursor_execute', listener)
+    p50 = time_requests(client, [f'/vote/{i}%27%20OR%201=1' for i in range(args.requests)])
+    event.remove(engine, 'before_cursor_execute', listener)
+    print(f'\nmalformed token -> 404 in {p50:.1f} us p50, {len(queries)} SQL statements')
+
+
+if __name__ == '__main__':
+    main()
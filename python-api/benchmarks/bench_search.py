@@ -0,0 +1,72 @@
+"""Search benchmark: full-text index versus LIKE scans over the text columns.
+
+Seeds --applications applications with --members ballots and --comments
+comments each (see seed.py), then answers the same queries through
+/api/search and through the LIKE scan over descriptions, comments and
+rejection reasons it replaces. Reports milliseconds per query.
+
+    python benchmarks/bench_search.py --applications 20000 --members 20 --comments 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, Comment, GrantApplication, Vote
+from seed import seed
+
+QUERIES = ['Candidate 1234', 'Santiago', 'lexicography translation', 'phraseology']
+
+
+def like_search(query):
+    """Every word must occur, like the full-text query. Ranking needs every
+    match, so each table is scanned to the end (counted, not fetched)."""
+    words = query.split()
+    total = 0
+    for column in [GrantApplication.description, Comment.content, Vote.rejection_reason,
+                   GrantApplication.candidate_full_name + ' ' + GrantApplication.place]:
+        total += db.session.scalar(
+            db.select(db.func.count()).where(*[column.ilike(f'%{word}%') for word in words])
+        )
+    return total
+
+
+def measure(search, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        search()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=20000)
+    parser.add_argument('--members', type=int, default=20)
+    parser.add_argument('--comments', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = False
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        scale = seed(args.members, args.applications, args.comments)
+        print(f"{scale['applications']} applications, {scale['comments']} comments, {scale['votes']} ballots "
+              f"(seeded and indexed in {time.perf_counter() - started:.1f} s)")
+
+        for query in QUERIES:
+            hits = len(client.get('/api/search', query_string={'q': query}).json['results'])
+            fts = measure(lambda: client.get('/api/search', query_string={'q': query}), args.repeat)
+            like = measure(lambda: like_search(query), args.repeat)
+            print(f'{query!r:28} {hits:3} hits  full-text {fts:8.2f} ms  LIKE scan {like:9.2f} ms  ({like / fts:6.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""JSON serialization and compression: CPU time and bytes on the wire for the largest responses.
+
+Seeds a reproducible data set (see seed.py), requests the biggest JSON
+responses the API sends and keeps the object each view hands to jsonify().
+For each it times the encoding into a response the way Flask's default
+provider did it (stdlib json, sorted keys, values converted by the views),
+through dumps() with orjson and through its stdlib fallback, then the body
+sizes and compression times with gzip and brotli at the configured levels.
+Last, whole requests through the test client with and without orjson.
+
+    python benchmarks/bench_serialization.py --applications 2000 --members 60 --comments 100
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask.json.provider import DefaultJSONProvider
+
+import app as module
+from app import app, db, dumps, APIJSONProvider
+from seed import seed
+
+
+class CapturingJSONProvider(APIJSONProvider):
+    """APIJSONProvider that keeps the last object a view passed to jsonify()"""
+    captured = None
+
+    def response(self, *args, **kwargs):
+        CapturingJSONProvider.captured = self._prepare_response_obj(args, kwargs)
+        return super().response(*args, **kwargs)
+
+
+def per_call(function, rounds):
+    """Median wall time of function() in milliseconds"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=2000)
+    parser.add_argument('--members', type=int, default=60)
+    parser.add_argument('--comments', type=int, default=100, help='comments per application')
+    parser.add_argument('--batch', type=int, default=200, help='ids per batch request')
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if module.orjson is None:
+        raise SystemExit('❌ orjson is not installed (pip install orjson brotli)')
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = False
+    app.config['BATCH_MAX_IDS'] = args.batch
+    with app.app_context():
+        db.create_all()
+        seed(members=args.members, applications=args.applications, comments=args.comments, seed=args.seed)
+    app.json = CapturingJSONProvider(app)
+    client = app.test_client()
+    ids = ','.join(map(str, range(1, args.batch + 1)))
+    urls = {
+        'results/<id>': '/api/results/1',
+        'comments/<id>?limit=100': '/api/comments/1?limit=100',
+        'members': '/api/members',
+        f'applications?limit={app.config["APPLICATIONS_MAX_PAGE_SIZE"]}':
+            f'/api/applications?limit={app.config["APPLICATIONS_MAX_PAGE_SIZE"]}',
+        f'applications/batch ({args.batch})': f'/api/applications/batch?ids={ids}',
+        f'results/batch ({args.batch})': f'/api/results/batch?ids={ids}',
+        'analytics/funding': '/api/analytics/funding',
+    }
+    captured = {}
+    for label, url in urls.items():
+        assert client.get(url).status_code == 200, url
+        captured[label] = CapturingJSONProvider.captured
+
+    stdlib_provider = DefaultJSONProvider(app)
+    provider = APIJSONProvider(app)
+    print(f'{args.applications} applications x {args.members} voters, {args.comments} comments each; '
+          f'median of {args.rounds} rounds, ms')
+    print(f'{"response":28} {"jsonify":>8} {"orjson":>8} {"fallback":>8} {"bytes":>9} '
+          f'{"gzip":>8} {"gzip ms":>8} {"br":>8} {"br ms":>8}')
+    orjson = module.orjson
+    for label, data in captured.items():
+        # What the views used to hand to jsonify(): ISO strings and enum values already in place
+        converted = json.loads(dumps(data))
+        before = per_call(lambda: stdlib_provider.response(converted), args.rounds)
+        after = per_call(lambda: provider.response(data), args.rounds)
+        module.orjson = None
+        fallback = per_call(lambda: provider.response(data), args.rounds)
+        module.orjson = orjson
+        body = dumps(data)
+        gzipped = gzip.compress(body, compresslevel=app.config['COMPRESS_GZIP_LEVEL'], mtime=0)
+        gzip_ms = per_call(lambda: gzip.compress(body, compresslevel=app.config['COMPRESS_GZIP_LEVEL'], mtime=0),
+                           args.rounds)
+        if module.brotli is not None:
+            brotli_quality = app.config['COMPRESS_BROTLI_QUALITY']
+            br = f'{len(module.brotli.compress(body, quality=brotli_quality)):8}'
+            br_ms = f'{per_call(lambda: module.brotli.compress(body, quality=brotli_quality), args.rounds):8.2f}'
+        else:
+            br = br_ms = f'{"-":>8}'
+        print(f'{label:28} {before:8.2f} {after:8.2f} {fallback:8.2f} {len(body):9} '
+              f'{len(gzipped):8} {gzip_ms:8.2f} {br} {br_ms}')
+
+    print(f'{"whole request, identity":28} {"orjson":>8} {"fallback":>8}')
+    app.json = provider
+    for label, url in urls.items():
+        with_orjson = per_call(lambda: client.get(url), args.rounds)
+        module.orjson = None
+        without = per_call(lambda: client.get(url), args.rounds)
+        module.orjson = orjson
+        print(f'{label:28} {with_orjson:8.2f} {without:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
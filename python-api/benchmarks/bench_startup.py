@@ -0,0 +1,91 @@
+"""Worker cold start: import, app creation and first responses in fresh processes.
+
+Each of --runs fresh interpreters imports app.py from --api-dir (point it at
+a checkout of another commit to compare), takes the module's app the way
+Gunicorn's app:app does, answers /health and renders one voting page; every
+step is timed from the start of the import. Where app.py has a create_app()
+factory, each run also times --apps isolated create_app() + create_all()
+cycles on in-memory databases, the set-up cost of one test.
+
+    python benchmarks/bench_startup.py --runs 10 --api-dir ../other-checkout/python-api
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, API_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, Vote
+from seed import seed
+
+CHILD = '''
+import json, resource, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import app as module
+imported = time.perf_counter()
+application = module.app
+created = time.perf_counter()
+client = application.test_client()
+assert client.get('/health').status_code == 200
+health = time.perf_counter()
+assert client.get('/vote/' + sys.argv[2]).status_code == 200
+vote_page = time.perf_counter()
+isolated = None
+if hasattr(module, 'create_app'):
+    apps = int(sys.argv[3])
+    for _ in range(apps):
+        test_app = module.create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'DEADLINE_SCHEDULER_ENABLED': False})
+        with test_app.app_context():
+            module.db.create_all()
+    isolated = (time.perf_counter() - vote_page) / apps
+print(json.dumps({
+    'import': imported - started,
+    'app': created - started,
+    'health': health - started,
+    'vote_page': vote_page - started,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'isolated_app': isolated
+}))
+'''
+
+
+def run_child(api_dir, token, apps):
+    result = subprocess.run([sys.executable, '-W', 'ignore', '-c', CHILD, api_dir, token, str(apps)], cwd=api_dir,
+                            env=dict(os.environ), capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--apps', type=int, default=20, help='isolated apps created per run')
+    parser.add_argument('--api-dir', default=API_DIR, help='directory holding the app.py to measure')
+    args = parser.parse_args()
+
+    app.config['DEADLINE_SCHEDULER_ENABLED'] = False
+    with app.app_context():
+        db.create_all()
+        seed(members=20, applications=50, comments=2)
+        token = db.session.scalar(db.select(Vote.token).where(Vote.vote_type.is_(None)).limit(1))
+
+    samples = [run_child(os.path.abspath(args.api_dir), token, args.apps) for _ in range(args.runs)]
+    print(f'{args.api_dir}: median of {args.runs} fresh processes, ms since the import started')
+    for key, label in (('import', 'import app'), ('app', 'app:app ready'), ('health', 'first /health'),
+                       ('vote_page', 'first /vote/<token>'), ('isolated_app', 'isolated app + tables')):
+        values = [s[key] for s in samples if s[key] is not None]
+        print(f'{label:22} {statistics.median(values) * 1000:8.1f}' if values else f'{label:22} {"-":>8}')
+    print(f'{"peak RSS (MB)":22} {statistics.median(s["rss_mb"] for s in samples):8.1f}')
+
+
+if __name__ == '__main__':
+    main()
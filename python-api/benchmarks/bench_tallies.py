@@ -0,0 +1,135 @@
+"""Tally benchmark: Python-side vote counting versus the SQL GROUP BY layer.
+
+Seeds a database with --applications x --members ballots, then requests
+/api/applications/<id> and /api/results/<id> for a sample of applications,
+both through the original implementations (re-registered under /legacy) and
+the current ones. Reports SQL queries per request and mean latency.
+
+    python benchmarks/bench_tallies.py --applications 10000 --members 50
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify
+from sqlalchemy import event
+
+from app import app, db, BallotState, GrantApplication, GrantType, Vote, VoteType, VotingMember, generate_voting_token
+
+
+def legacy_get_application(app_id):
+    app_obj = GrantApplication.query.get_or_404(app_id)
+    votes = Vote.query.filter_by(application_id=app_id).all()
+    return jsonify({
+        'id': app_obj.id,
+        'reference_code': app_obj.reference_code,
+        'vote_summary': {
+            'accept': sum(1 for v in votes if v.vote_type == VoteType.ACCEPT),
+            'reject': sum(1 for v in votes if v.vote_type == VoteType.REJECT),
+            'total_voters': VotingMember.query.filter_by(is_active=True).count(),
+            'voted': len(votes)
+        }
+    })
+
+
+def legacy_get_voting_results(app_id):
+    application = GrantApplication.query.get_or_404(app_id)
+    votes = Vote.query.filter_by(application_id=app_id).all()
+    return jsonify({
+        'application': {'reference_code': application.reference_code},
+        'summary': {
+            'accept': sum(1 for v in votes if v.vote_type == VoteType.ACCEPT),
+            'reject': sum(1 for v in votes if v.vote_type == VoteType.REJECT),
+            'total_voters': VotingMember.query.filter_by(is_active=True).count(),
+            'voted': len(votes)
+        },
+        'votes': [{
+            'voter_name': v.voter.name,
+            'voter_position': v.voter.position,
+            'vote': v.vote_type.value if v.vote_type else None
+        } for v in votes]
+    })
+
+
+def seed(applications, members):
+    db.session.execute(db.insert(VotingMember), [
+        {'name': f'Member {i}', 'position': 'Bench', 'email': f'member{i}@example.com'}
+        for i in range(members)
+    ])
+    deadline = datetime.utcnow() + timedelta(days=7)
+    db.session.execute(db.insert(GrantApplication), [{
+        'reference_code': f'CA{i:06d}',
+        'submitter_name': 'Bench',
+        'candidate_full_name': f'Candidate {i}',
+        'grant_type': GrantType.STSM,
+        'date': deadline.date(),
+        'place': 'Nowhere',
+        'amount_requested': 1000.0,
+        'voting_deadline': deadline
+    } for i in range(applications)])
+    for app_id in range(1, applications + 1, 1000):
+        rows = []
+        for a in range(app_id, min(app_id + 1000, applications + 1)):
+            for m in range(1, members + 1):
+                vote_type = random.choice([VoteType.ACCEPT, VoteType.REJECT, None])
+                rows.append({
+                    'application_id': a,
+                    'voter_id': m,
+                    'state': BallotState.CAST if vote_type else BallotState.ISSUED,
+                    'vote_type': vote_type,
+                    'token': generate_voting_token()
+                })
+        db.session.execute(db.insert(Vote), rows)
+    db.session.commit()
+
+
+def measure(client, url_pattern, app_ids):
+    queries = []
+    listener = lambda *args: queries.append(1)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    started = time.perf_counter()
+    for app_id in app_ids:
+        assert client.get(url_pattern.format(app_id)).status_code == 200
+    elapsed = time.perf_counter() - started
+    event.remove(db.engine, 'before_cursor_execute', listener)
+    return len(queries) / len(app_ids), elapsed * 1000 / len(app_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=10000)
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--samples', type=int, default=200)
+    args = parser.parse_args()
+
+    app.add_url_rule('/legacy/applications/<int:app_id>', view_func=legacy_get_application)
+    app.add_url_rule('/legacy/results/<int:app_id>', view_func=legacy_get_voting_results)
+
+    client = app.test_client()
+    app_ids = random.sample(range(1, args.applications + 1), args.samples)
+
+    with app.app_context():
+        db.create_all()
+        seed(args.applications, args.members)
+
+        print(f'{args.applications} applications x {args.members} voters, {args.samples} requests each')
+        for label, url in [
+            ('legacy application', '/legacy/applications/{}'),
+            ('application', '/api/applications/{}'),
+            ('legacy results', '/legacy/results/{}'),
+            ('results', '/api/results/{}'),
+        ]:
+            queries, latency = measure(client, url, app_ids)
+            print(f'{label:20} {queries:6.1f} queries/request  {latency:8.2f} ms/request')
+
+
+if __name__ == '__main__':
+    main()
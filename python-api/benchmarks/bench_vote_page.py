@@ -0,0 +1,87 @@
+"""Voting page benchmark: per-request template compilation versus the cached page.
+
+Requests /vote/<token> for every ballot of one application through the
+original implementation (the inline template passed to
+render_template_string, re-registered under /legacy), the current one,
+and the current one revalidated with If-None-Match. Reports requests/sec.
+
+    python benchmarks/bench_vote_page.py --members 50 --rounds 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import render_template_string
+
+from app import (app, db, APPLICATION_DETAILS_TEMPLATE, VOTE_PAGE_TEMPLATE, GrantApplication, GrantType,
+                 Vote, VotingMember, issue_ballots)
+
+LEGACY_TEMPLATE = VOTE_PAGE_TEMPLATE.replace('{{ application_details }}', APPLICATION_DETAILS_TEMPLATE)
+
+
+def legacy_vote_page(token):
+    vote = Vote.query.filter_by(token=token).first_or_404()
+    return render_template_string(LEGACY_TEMPLATE, application=vote.application, voter=vote.voter, token=token)
+
+
+def measure(client, urls, headers=None):
+    started = time.perf_counter()
+    for url in urls:
+        response = client.get(url, headers=(headers or {}).get(url))
+        assert response.status_code in (200, 304)
+    return len(urls) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    app.add_url_rule('/legacy/vote/<token>', view_func=legacy_vote_page)
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            VotingMember(name=f'Member {i}', position='Bench', email=f'member{i}@example.com')
+            for i in range(args.members)
+        ])
+        application = GrantApplication(
+            reference_code='CA000001',
+            submitter_name='Bench',
+            candidate_full_name='Bench Candidate',
+            grant_type=GrantType.STSM,
+            date=datetime.utcnow().date(),
+            place='Nowhere',
+            amount_requested=1000.0,
+            description='A description long enough to make the details fragment non-trivial. ' * 10,
+            voting_deadline=datetime.utcnow() + timedelta(days=7)
+        )
+        db.session.add(application)
+        db.session.flush()
+        issue_ballots([application.id])
+        db.session.commit()
+        tokens = [v.token for v in Vote.query.all()] * args.rounds
+
+    etags = {f'/vote/{t}': {'If-None-Match': client.get(f'/vote/{t}').headers['ETag']} for t in set(tokens)}
+
+    print(f'{len(tokens)} requests per mode')
+    for label, urls, headers in [
+        ('legacy render', [f'/legacy/vote/{t}' for t in tokens], None),
+        ('compiled + cache', [f'/vote/{t}' for t in tokens], None),
+        ('conditional 304', [f'/vote/{t}' for t in tokens], etags),
+    ]:
+        print(f'{label:18} {measure(client, urls, headers):8.1f} req/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""Concurrent vote submission stress test: no lost or double-counted votes.
+
+Spawns --workers processes (each with its own app and connection pool, like
+Gunicorn workers) that all submit and change votes on the same small set of
+ballots at once, with random accept/reject choices and --retry-ratio of the
+requests sent twice with the same Idempotency-Key (a client retrying after a
+timeout). Afterwards the tallies, ballot versions and the vote change audit
+trail are checked against each other; any mismatch exits with status 1.
+
+    python benchmarks/bench_vote_races.py --workers 8 --ballots 20 --requests 200
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix='voting-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TMP_DIR, 'races.db')}"
+os.environ.setdefault('SQLITE_JOURNAL_MODE', 'WAL')
+os.environ.setdefault('SQLITE_BUSY_TIMEOUT', '5000')
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')  # one client IP sends every request
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(ballots):
+    from app import app, db, GrantApplication, GrantType, Vote, VotingMember, issue_ballots
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(VotingMember), [
+            {'name': f'Member {i}', 'position': 'Bench', 'email': f'member{i}@example.com'}
+            for i in range(ballots)
+        ])
+        application = GrantApplication(
+            reference_code='CA000001',
+            submitter_name='Bench',
+            candidate_full_name='Bench Candidate',
+            grant_type=GrantType.STSM,
+            date=datetime.utcnow().date(),
+            place='Nowhere',
+            amount_requested=1000.0,
+            voting_deadline=datetime.utcnow() + timedelta(days=7)
+        )
+        db.session.add(application)
+        db.session.flush()
+        issue_ballots([application.id])
+        db.session.commit()
+        return [v.token for v in Vote.query.order_by(Vote.id)]
+
+
+def hammer(worker, env, tokens, requests, retry_ratio, barrier, results):
+    os.environ.update(env)
+    from app import app
+
+    app.config['PROPAGATE_EXCEPTIONS'] = True
+    client = app.test_client()
+    rng = random.Random(worker)
+    latencies, statuses = [], {'applied': 0, 'replayed': 0, 'conflict': 0, 'error': 0}
+
+    barrier.wait()
+    for _ in range(requests):
+        token = rng.choice(tokens)
+        data = rng.choice([{'vote_type': 'accept'}, {'vote_type': 'reject', 'rejection_reason': f'reason {worker}'}])
+        headers = {'Idempotency-Key': str(uuid.uuid4())}
+        for _ in range(2 if rng.random() < retry_ratio else 1):
+            started = time.perf_counter()
+            try:
+                response = client.post(f'/api/vote/{token}', data=data, headers=headers)
+            except Exception:
+                statuses['error'] += 1
+                continue
+            finally:
+                latencies.append(time.perf_counter() - started)
+            if response.status_code == 200:
+                statuses['replayed' if response.headers.get('Idempotent-Replayed') else 'applied'] += 1
+            elif response.status_code == 409:
+                statuses['conflict'] += 1
+            else:
+                statuses['error'] += 1
+    results.put((latencies, statuses))
+
+
+def verify(applied):
+    """Problems found in the final state, as human readable strings"""
+    from app import app, db, check_tallies, Vote, VoteChange, VoteType
+
+    problems = []
+    with app.app_context():
+        problems += [f'tally mismatch: {m}' for m in check_tallies()]
+        changes = db.session.scalar(db.select(db.func.count(VoteChange.id)))
+        if changes != applied:
+            problems.append(f'{changes} audit rows for {applied} applied submissions')
+        for vote in Vote.query.all():
+            history = VoteChange.query.filter_by(vote_id=vote.id).order_by(VoteChange.version).all()
+            if vote.version != len(history) or [c.version for c in history] != list(range(1, len(history) + 1)):
+                problems.append(f'ballot {vote.id}: version {vote.version}, {len(history)} audit rows')
+            elif history and (vote.vote_type, vote.rejection_reason) != (history[-1].vote_type,
+                                                                         history[-1].rejection_reason):
+                problems.append(f'ballot {vote.id}: final vote differs from its last audit row')
+            if vote.vote_type == VoteType.ACCEPT and vote.rejection_reason is not None:
+                problems.append(f'ballot {vote.id}: accepted with a stale rejection reason')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--ballots', type=int, default=20, help='ballots shared by all workers')
+    parser.add_argument('--requests', type=int, default=200, help='submissions per worker')
+    parser.add_argument('--retry-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+
+    tokens = seed(args.ballots)
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(args.workers)
+    results = ctx.Queue()
+    env = {'DATABASE_URL': os.environ['DATABASE_URL']}
+    processes = [
+        ctx.Process(target=hammer, args=(i, env, tokens, args.requests, args.retry_ratio, barrier, results))
+        for i in range(args.workers)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for worker_latencies, _ in collected for l in worker_latencies)
+    statuses = {key: sum(s[key] for _, s in collected) for key in collected[0][1]}
+    print(f'{args.workers} workers x {args.requests} submissions on {args.ballots} ballots '
+          f'({len(latencies) / elapsed:,.0f} requests/s incl. startup)')
+    print(f"p50 {statistics.median(latencies) * 1000:.2f} ms  p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms  "
+          + '  '.join(f'{key} {value}' for key, value in statuses.items()))
+
+    problems = verify(statuses['applied'])
+    for problem in problems:
+        print(f'❌ {problem}')
+    if problems or statuses['error']:
+        raise SystemExit(1)
+    print('✅ Tallies, ballot versions and audit trail agree')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Reproducible synthetic data for benchmarks and load tests.
+
+Fills an empty database with --members members, --applications open
+applications, one ballot per member and application (--cast-ratio of them
+cast, the rest still issued) and --comments comments per application, a
+third of them replies. The same --seed always produces the same rows, so
+numbers measured on two commits are comparable.
+
+    python benchmarks/seed.py --database-url sqlite:///bench.db --members 50 --applications 1000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PLACES = ['Halle', 'Osijek', 'Santiago de Compostela', 'Ústí nad Labem', 'Istanbul', 'Ljubljana', 'Vilnius', 'Porto']
+CURRENCIES = ['EUR', 'EUR', 'EUR', 'USD', 'GBP']
+WORDS = ('phraseology corpus research network mobility conference workshop training school dissemination '
+         'lexicography translation comparative analysis dataset young researchers results publication').split()
+CHUNK_SIZE = 10000
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def insert_chunked(db, model, rows):
+    for i in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(db.insert(model), rows[i:i + CHUNK_SIZE])
+
+
+def seed(members=50, applications=1000, comments=10, cast_ratio=0.6, seed=42):
+    """Insert the synthetic data set into the (empty) database of the current app context"""
+    from app import (db, BallotState, Comment, GrantApplication, GrantType, Vote, VoteType, VotingMember,
+                     rebuild_search_index, rebuild_tallies)
+
+    if db.session.scalar(db.select(db.func.count(VotingMember.id))):
+        raise SystemExit('❌ The database already contains members; seed an empty database.')
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    epoch = datetime(2024, 1, 1)
+
+    insert_chunked(db, VotingMember, [{
+        'id': m,
+        'name': f'Member {m}',
+        'position': rng.choice(['WG1 Leader', 'WG2 Leader', 'MC Member', 'Grant Awarding Coordinator']),
+        'email': f'member{m}@example.com',
+        'created_at': epoch
+    } for m in range(1, members + 1)])
+
+    insert_chunked(db, GrantApplication, [{
+        'id': a,
+        'reference_code': f'CA{a:06d}',
+        'submitter_name': f'Submitter {rng.randrange(100)}',
+        'candidate_full_name': f'Candidate {a}',
+        'grant_type': rng.choice(list(GrantType)),
+        'date': (epoch + timedelta(days=rng.randrange(730))).date(),
+        'place': rng.choice(PLACES),
+        'amount_requested': round(rng.uniform(300, 4000), 2),
+        'currency': rng.choice(CURRENCIES),
+        'description': sentence(rng, rng.randrange(20, 120)),
+        'created_at': epoch + timedelta(minutes=a),
+        'updated_at': epoch + timedelta(minutes=a),
+        'voting_deadline': now + timedelta(days=rng.randrange(7, 60))
+    } for a in range(1, applications + 1)])
+
+    votes = []
+    for a in range(1, applications + 1):
+        for m in range(1, members + 1):
+            vote = {
+                'application_id': a,
+                'voter_id': m,
+                'state': BallotState.ISSUED,
+                'vote_type': None,
+                'rejection_reason': None,
+                'voted_at': None,
+                'token': f'{rng.getrandbits(192):048x}',
+                'delivery_status': 'sent',
+                'delivery_attempts': 1
+            }
+            if rng.random() < cast_ratio:
+                vote_type = rng.choice([VoteType.ACCEPT, VoteType.ACCEPT, VoteType.REJECT])
+                vote.update(state=BallotState.CAST, vote_type=vote_type,
+                            voted_at=epoch + timedelta(minutes=a, seconds=m))
+                if vote_type == VoteType.REJECT:
+                    vote['rejection_reason'] = sentence(rng, rng.randrange(5, 30))
+            votes.append(vote)
+    insert_chunked(db, Vote, votes)
+
+    rows, comment_id = [], 0
+    for a in range(1, applications + 1):
+        first = comment_id + 1
+        for c in range(comments):
+            comment_id += 1
+            rows.append({
+                'id': comment_id,
+                'application_id': a,
+                'voter_id': rng.randrange(1, members + 1),
+                'parent_comment_id': rng.randrange(first, comment_id) if c and rng.random() < 1 / 3 else None,
+                'content': sentence(rng, rng.randrange(5, 60)),
+                'is_supportive': rng.choice([True, False, None]),
+                'created_at': epoch + timedelta(minutes=a, seconds=c)
+            })
+    insert_chunked(db, Comment, rows)
+
+    db.session.commit()
+    rebuild_tallies()
+    rebuild_search_index()
+    return {'members': members, 'applications': applications, 'votes': len(votes), 'comments': len(rows)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--applications', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=10, help='comments per application')
+    parser.add_argument('--cast-ratio', type=float, default=0.6)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+    from app import app, db
+
+    with app.app_context():
+        db.create_all()
+        print(json.dumps(seed(args.members, args.applications, args.comments, args.cast_ratio, args.seed)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db, Vote
+
+
+@pytest.fixture
+def app(tmp_path):
+    """An isolated app on its own SQLite file; emails are recorded by Flask-Mail, not sent"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'voting.db'}",
+        'DEADLINE_SCHEDULER_ENABLED': False,
+        'RATE_LIMIT_ENABLED': False,
+        'MAIL_DISPATCH_WORKERS': 0,
+        'MAIL_RETRY_BACKOFF': 0
+    })
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def create_application(client, members=3, deadline=None, **fields):
+    """Add members (first call only) and one application through the API; returns (id, tokens by member id)"""
+    if not client.get('/api/members').json:
+        for i in range(members):
+            client.post('/api/members', json={'name': f'Member {i}', 'position': 'MC Member',
+                                              'email': f'member{i}@example.com'})
+    deadline = deadline or datetime.utcnow() + timedelta(days=7)
+    response = client.post('/api/applications', json={
+        'submitter_name': 'Submitter',
+        'candidate_full_name': 'Candidate',
+        'grant_type': 'STSM',
+        'date': '2025-06-01',
+        'place': 'Ljubljana',
+        'amount_requested': 1500,
+        'voting_deadline': deadline.strftime('%Y-%m-%d %H:%M'),
+        **fields
+    })
+    assert response.status_code == 200, response.json
+    application_id = response.json['id']
+    with client.application.app_context():
+        tokens = dict(db.session.execute(
+            db.select(Vote.voter_id, Vote.token).where(Vote.application_id == application_id)
+        ).all())
+    return application_id, tokens
+
+
+@pytest.fixture
+def application(client):
+    return create_application(client)
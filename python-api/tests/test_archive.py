@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import (db, archive_applications, finalize_application, resolve_token, ArchivedApplication, Comment,
+                 GrantApplication, Vote)
+from conftest import create_application
+
+CUTOFF = timedelta(days=365)
+
+
+@pytest.fixture
+def applications(app, client):
+    """Four applications: two finalized long ago, one finalized recently, one still open.
+
+    The open one is created and used last, as archive_applications() leaves the
+    application holding the newest ids in place.
+    """
+    ids = []
+    for _ in range(4):
+        application_id, tokens = create_application(client)
+        ids.append((application_id, list(tokens.values())))
+    for application_id, tokens in ids:
+        client.post(f'/api/vote/{tokens[0]}', data={'vote_type': 'reject', 'rejection_reason': 'Zebra budget'})
+        client.post(f'/api/vote/{tokens[1]}', data={'vote_type': 'accept'})
+        client.post(f'/api/comment/{tokens[1]}', data={'content': f'Comment on {application_id}',
+                                                       'is_supportive': 'true'})
+        client.post(f'/api/comment/{tokens[0]}', data={'content': 'Reply', 'is_supportive': 'false',
+                                                       'parent_comment_id': application_id * 2 - 1})
+
+    now = datetime.utcnow()
+    with app.app_context():
+        for (application_id, _), finalized_at in zip(ids, [now - CUTOFF * 2, now - CUTOFF - timedelta(days=1),
+                                                           now - timedelta(days=10)]):
+            assert finalize_application(application_id)
+            db.session.execute(db.update(GrantApplication).where(GrantApplication.id == application_id)
+                               .values(finalized_at=finalized_at))
+        db.session.commit()
+    return [application_id for application_id, _ in ids]
+
+
+def archive(app):
+    with app.app_context():
+        return archive_applications(datetime.utcnow() - CUTOFF, batch_size=1)
+
+
+def responses(client, application_ids):
+    """Everything the API shows of the applications, as the clients read it"""
+    shown = {'export': client.get('/api/results/export').get_data(as_text=True),
+             'search': client.get('/api/search?q=zebra').get_json()}
+    for application_id in application_ids:
+        shown[application_id] = (client.get(f'/api/applications/{application_id}').get_json(),
+                                 client.get(f'/api/results/{application_id}').get_json(),
+                                 client.get(f'/api/comments/{application_id}').get_json())
+    return shown
+
+
+def test_archived_applications_read_the_same(app, client, applications):
+    before = responses(client, applications)
+    assert len(before['search']['results']) == 4 and len(before['export'].splitlines()) == 8
+
+    assert archive(app)['archived'] == 2
+    assert responses(client, applications) == before
+
+    assert archive(app)['archived'] == 0
+    assert responses(client, applications) == before
+
+
+def test_only_applications_finalized_before_the_cutoff_move(app, applications):
+    archive(app)
+    with app.app_context():
+        assert db.session.scalars(db.select(ArchivedApplication.id).order_by(ArchivedApplication.id)).all() == \
+            applications[:2]
+        assert db.session.scalars(db.select(GrantApplication.id).order_by(GrantApplication.id)).all() == \
+            applications[2:]
+
+
+def test_no_comments_once_finalized_or_archived(app, client, monkeypatch, applications):
+    with app.test_request_context():
+        tokens = dict(db.session.execute(db.select(Vote.application_id, Vote.token)).all())
+        for token in tokens.values():
+            resolve_token(token)
+    # Workers other than the one archiving keep the tokens they have cached
+    monkeypatch.setattr('app.token_cache.discard_where', lambda predicate: None)
+    archive(app)
+
+    for application_id in applications[:3]:
+        response = client.post(f'/api/comment/{tokens[application_id]}', data={'content': 'Late', 'is_supportive': ''})
+        assert response.status_code == 400
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count()).select_from(Comment).where(Comment.content == 'Late')) == 0
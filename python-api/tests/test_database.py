@@ -0,0 +1,13 @@
+from sqlalchemy import create_engine
+
+from app import db
+
+
+def test_pragmas_apply_to_the_app_engine_only(app, tmp_path):
+    with app.app_context():
+        assert db.session.execute(db.text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert db.session.execute(db.text('PRAGMA busy_timeout')).scalar() == app.config['SQLITE_BUSY_TIMEOUT']
+
+    # Other engines in the process connect outside any app context, with their own settings
+    with create_engine(f"sqlite:///{tmp_path / 'other.db'}").connect() as conn:
+        assert conn.execute(db.text('PRAGMA journal_mode')).scalar() == 'delete'
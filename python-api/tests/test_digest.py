@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db, get_mail, send_digests, GrantApplication
+from conftest import create_application
+
+
+@pytest.fixture
+def digest_app(app):
+    app.config['NOTIFICATION_MODE'] = 'digest'
+    return app
+
+
+def remind(app):
+    with app.app_context(), get_mail().record_messages() as outbox:
+        send_digests(reminder=True)
+        return [message.recipients[0] for message in outbox]
+
+
+def test_each_reminder_offset_is_sent_once(digest_app, client):
+    application_id, tokens = create_application(client, deadline=datetime.utcnow() + timedelta(hours=30))
+    create_application(client, deadline=datetime.utcnow() + timedelta(days=7))  # no offset due yet
+    client.post(f'/api/vote/{next(iter(tokens.values()))}', data={'vote_type': 'accept'})
+
+    assert remind(digest_app) == ['member1@example.com', 'member2@example.com']  # 48 hours before
+    assert remind(digest_app) == []
+
+    with digest_app.app_context():
+        db.session.execute(db.update(GrantApplication).where(GrantApplication.id == application_id)
+                           .values(voting_deadline=datetime.utcnow() + timedelta(hours=5)))
+        db.session.commit()
+    assert len(remind(digest_app)) == 2  # 6 hours before
+    assert remind(digest_app) == []
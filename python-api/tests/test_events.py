@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from app import db, broker, finalize_application, load_tallies, vote_summary, Comment
+
+
+def test_streams_are_off_by_default(app, client, application):
+    application_id, tokens = application
+    assert client.get(f'/api/events/{application_id}').status_code == 404
+    assert 'EventSource' not in client.get(f'/vote/{next(iter(tokens.values()))}').get_data(as_text=True)
+
+
+def test_vote_page_follows_comments_when_enabled(app, client, application):
+    application_id, tokens = application
+    app.config['EVENTS_ENABLED'] = True
+    page = client.get(f'/vote/{next(iter(tokens.values()))}').get_data(as_text=True)
+    assert f"new EventSource('/api/events/{application_id}')" in page
+
+
+@pytest.fixture
+def subscription(app, application):
+    """A stream of the application, fed by broker.poll() instead of the poller thread"""
+    application_id, _ = application
+    app.config['EVENTS_POLL_INTERVAL'] = 0
+    with app.app_context():
+        summary = vote_summary(load_tallies([application_id])[application_id])
+    subscription = broker.subscribe(application_id, summary, 0)
+    yield subscription
+    broker.unsubscribe(application_id, subscription)
+
+
+def received(subscription):
+    events = []
+    while not subscription.queue.empty():
+        event, data = subscription.queue.get_nowait().splitlines()[:2]
+        events.append((event.removeprefix('event: '), json.loads(data.removeprefix('data: '))))
+    return events
+
+
+def test_unchanged_tally_is_not_repeated(app, application, subscription):
+    application_id, _ = application
+    broker.poll()
+    broker.poll()
+    assert received(subscription) == []
+
+    with app.app_context():
+        finalize_application(application_id)
+    broker.poll()
+    broker.poll()
+    assert received(subscription) == [('tally', {'accept': 0, 'reject': 0, 'pending': 0, 'total_voters': 3,
+                                                 'voted': 0})]
+
+
+def test_comments_of_other_workers_are_not_skipped(app, client, application, subscription):
+    application_id, tokens = application
+    first, second, _ = tokens
+    with app.app_context():
+        # Committed by another worker, which this worker learns of at the next poll
+        db.session.add(Comment(application_id=application_id, voter_id=first, content='Elsewhere'))
+        db.session.commit()
+    client.post(f'/api/comment/{tokens[second]}', data={'content': 'Here', 'is_supportive': ''})
+    broker.poll()
+    broker.poll()
+
+    assert [(event, data['content']) for event, data in received(subscription)] == [
+        ('comment', 'Here'), ('comment', 'Elsewhere')
+    ]
@@ -0,0 +1,23 @@
+import pytest
+
+from app import db, finalize_application, BallotState, GrantApplication, Outcome, Vote
+
+
+@pytest.mark.parametrize('votes, outcome', [
+    ([], Outcome.NO_VOTES),
+    ([{'vote_type': 'accept'}, {'vote_type': 'reject', 'rejection_reason': 'Budget'}], Outcome.TIED),
+    ([{'vote_type': 'accept'}, {'vote_type': 'accept'}, {'vote_type': 'reject', 'rejection_reason': 'Budget'}],
+     Outcome.ACCEPTED),
+])
+def test_outcome(app, client, application, votes, outcome):
+    application_id, tokens = application
+    for token, form in zip(tokens.values(), votes):
+        assert client.post(f'/api/vote/{token}', data=form).status_code == 200
+
+    with app.app_context():
+        assert finalize_application(application_id)
+        assert db.session.get(GrantApplication, application_id).outcome == outcome
+        assert not finalize_application(application_id)
+        states = db.session.scalars(db.select(Vote.state).where(Vote.application_id == application_id)).all()
+        assert states.count(BallotState.EXPIRED) == len(tokens) - len(votes)
+    assert client.get(f'/api/applications/{application_id}').json['outcome'] == outcome.value
@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import db, metrics, profiler
+
+
+@pytest.fixture
+def instrumented(app):
+    app.config.update(METRICS_ENABLED=True, PROFILE_SLOW_REQUESTS=True)
+
+    @app.route('/api/failing')
+    def failing():
+        raise RuntimeError('view failed')
+
+    return app
+
+
+def test_failed_request_is_recorded(instrumented, client):
+    with pytest.raises(RuntimeError):
+        client.get('/api/failing')
+
+    assert metrics.requests[('failing', 'GET', 500)] == 1
+    assert profiler.active == {}
+
+
+def test_failed_statement_leaves_no_query_timer(instrumented):
+    with instrumented.app_context():
+        connection = db.session.connection()
+        with pytest.raises(OperationalError):
+            db.session.execute(db.text('SELECT * FROM missing_table'))
+        assert connection.info['query_started'] == []
+        db.session.rollback()
@@ -0,0 +1,82 @@
+import smtplib
+
+import pytest
+
+from app import db, dispatcher, Vote
+from conftest import create_application
+
+
+class FakeMail:
+    """Stands in for Flask-Mail: refuses some recipients, drops the connection or fails to log in on cue"""
+
+    def __init__(self, refused=(), disconnect_after=None, login_error=False):
+        self.refused = set(refused)
+        self.disconnect_after = disconnect_after
+        self.login_error = login_error
+        self.connections = 0
+        self.sent = []
+
+    def connect(self):
+        self.connections += 1
+        if self.login_error:
+            raise smtplib.SMTPAuthenticationError(535, b'Authentication failed')
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def send(self, msg):
+        recipient = msg.recipients[0]
+        if recipient in self.refused:
+            raise smtplib.SMTPRecipientsRefused({recipient: (550, b'No such user')})
+        if self.disconnect_after is not None and len(self.sent) == self.disconnect_after:
+            self.disconnect_after = None
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        self.sent.append(recipient)
+
+
+@pytest.fixture
+def votes(app, client):
+    application_id, _ = create_application(client, members=13)
+    with app.app_context():
+        return db.session.scalars(db.select(Vote.id).where(Vote.application_id == application_id)
+                                  .order_by(Vote.id)).all()
+
+
+def deliver(app, monkeypatch, mail, vote_ids):
+    monkeypatch.setattr('app.get_mail', lambda: mail)
+    with app.app_context():
+        dispatcher.deliver([(vote_id, False) for vote_id in vote_ids])
+        return {vote.voter.email: vote for vote in db.session.scalars(db.select(Vote).where(Vote.id.in_(vote_ids)))}
+
+
+def test_refused_recipient_fails_alone(app, monkeypatch, votes):
+    mail = FakeMail(refused={'member2@example.com'})
+    delivered = deliver(app, monkeypatch, mail, votes)
+
+    failed = [email for email, vote in delivered.items() if vote.delivery_status == 'failed']
+    assert failed == ['member2@example.com']
+    assert 'No such user' in delivered['member2@example.com'].delivery_error
+    assert len(mail.sent) == 12 and mail.connections == 1
+
+
+def test_dropped_connection_resumes_at_the_failed_message(app, monkeypatch, votes):
+    mail = FakeMail(disconnect_after=5)
+    delivered = deliver(app, monkeypatch, mail, votes)
+
+    assert all(vote.delivery_status == 'sent' and vote.delivery_error is None for vote in delivered.values())
+    assert len(mail.sent) == 13 and mail.connections == 2
+    # One attempt each when the application was created, then this batch
+    assert sorted(vote.delivery_attempts for vote in delivered.values()) == [2] * 12 + [3]
+
+
+def test_login_failure_fails_the_batch_without_retrying(app, monkeypatch, votes):
+    mail = FakeMail(login_error=True)
+    delivered = deliver(app, monkeypatch, mail, votes)
+
+    assert all(vote.delivery_status == 'failed' for vote in delivered.values())
+    assert 'Authentication failed' in delivered['member0@example.com'].delivery_error
+    assert mail.connections == 1
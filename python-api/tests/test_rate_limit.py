@@ -0,0 +1,55 @@
+import pytest
+
+from app import MemoryRateLimitBackend, SQLiteRateLimitBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Time of both backends, moved by hand"""
+    now = [1000.0]
+    monkeypatch.setattr('app.time.monotonic', lambda: now[0])
+    monkeypatch.setattr('app.time.time', lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryRateLimitBackend(max_keys=100)
+    return SQLiteRateLimitBackend(str(tmp_path / 'rate_limits.db'), busy_timeout=5000)
+
+
+def test_burst_then_refill(backend, clock):
+    assert [backend.take('k', capacity=3, rate=0.5) for _ in range(3)] == [0, 0, 0]
+    assert backend.take('k', 3, 0.5) == pytest.approx(2.0)  # one token every 2 seconds
+
+    clock[0] += 1.5
+    assert backend.take('k', 3, 0.5) == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert backend.take('k', 3, 0.5) == 0
+    assert backend.take('k', 3, 0.5) == pytest.approx(2.0)
+    assert backend.take('other', 3, 0.5) == 0  # buckets are per key
+
+
+def test_refill_stops_at_capacity(backend, clock):
+    for _ in range(3):
+        backend.take('k', 3, 0.5)
+    clock[0] += 3600
+    assert [backend.take('k', 3, 0.5) for _ in range(4)][-1] == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize('backend_name', ['memory', 'sqlite'])
+def test_token_gets_429_past_its_burst(app, client, application, clock, tmp_path, backend_name):
+    app.config.update(RATE_LIMIT_ENABLED=True, RATE_LIMIT_BACKEND=backend_name,
+                      RATE_LIMIT_SQLITE_PATH=str(tmp_path / 'rate_limits.db'),
+                      RATE_LIMITS={'vote_page': {'ip': (100, 1.0), 'token': (2, 0.1)}})
+    _, tokens = application
+    first, second, _ = tokens.values()
+
+    assert [client.get(f'/vote/{first}').status_code for _ in range(3)] == [200, 200, 429]
+    limited = client.get(f'/vote/{first}')
+    assert limited.status_code == 429 and limited.headers['Retry-After'] == '10'
+    assert client.get(f'/vote/{second}').status_code == 200
+
+    clock[0] += 10
+    assert client.get(f'/vote/{first}').status_code == 200
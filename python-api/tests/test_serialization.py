@@ -0,0 +1,66 @@
+import gzip
+from datetime import date, datetime
+
+import pytest
+
+import app as module
+from app import dumps, GrantType
+from conftest import create_application
+
+
+def test_fallback_encodes_like_orjson(monkeypatch):
+    pytest.importorskip('orjson')
+    data = {'at': datetime(2024, 5, 1, 12, 0, 0, 123456), 'on': date(2024, 5, 1), 'grant': GrantType.STSM,
+            'name': 'Đurđica Šarić', 'amount': 1500.0, 'count': 3, 'none': None, 7: [True, {'nested': 0.5}]}
+    with_orjson = dumps(data)
+    monkeypatch.setattr(module, 'orjson', None)
+    assert dumps(data) == with_orjson
+
+
+def test_responses_are_identical_under_both_serializers(app, client, monkeypatch):
+    pytest.importorskip('orjson')
+    application_id, tokens = create_application(client, candidate_full_name='Đurđica Šarić')
+    token = next(iter(tokens.values()))
+    client.post(f'/api/vote/{token}', data={'vote_type': 'reject', 'rejection_reason': 'Budget: €2000'})
+    client.post(f'/api/comment/{token}', data={'content': 'Prijedlog je dobar', 'is_supportive': 'true'})
+    urls = ['/api/members', '/api/applications', f'/api/applications/{application_id}',
+            f'/api/results/{application_id}', f'/api/comments/{application_id}', '/api/search?q=budget']
+
+    with_orjson = [client.get(url).data for url in urls]
+    monkeypatch.setattr(module, 'orjson', None)
+    assert [client.get(url).data for url in urls] == with_orjson
+
+
+def test_compressed_page_gets_a_weak_etag(app, client, application):
+    _, tokens = application
+    url = f'/vote/{next(iter(tokens.values()))}'
+    identity = client.get(url)
+    assert 'Content-Encoding' not in identity.headers
+    etag = identity.headers['ETag']
+    assert not etag.startswith('W/')
+
+    compressed = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['ETag'] == f'W/{etag}'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == identity.data
+
+    # Either tag revalidates the page
+    assert client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': compressed.headers['ETag']}) \
+        .status_code == 304
+
+
+def test_brotli_is_preferred_when_installed(app, client, application):
+    brotli = pytest.importorskip('brotli')
+    _, tokens = application
+    url = f'/vote/{next(iter(tokens.values()))}'
+    response = client.get(url, headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == client.get(url).data
+    assert client.get(url, headers={'Accept-Encoding': 'br;q=0.5, gzip'}).headers['Content-Encoding'] == 'gzip'
+
+
+def test_small_and_streamed_bodies_are_sent_as_they_are(app, client, application):
+    headers = {'Accept-Encoding': 'gzip, br'}
+    assert 'Content-Encoding' not in client.get('/health', headers=headers).headers
+    assert 'Content-Encoding' not in client.get('/api/results/export', headers=headers).headers
@@ -0,0 +1,96 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app, db, upgrade_schema, BallotState, GrantApplication, Vote
+
+# The tables as the first release created them: every ballot carried a placeholder vote_type
+LEGACY_SCHEMA = """
+CREATE TABLE voting_member (
+    id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, position VARCHAR(100) NOT NULL,
+    email VARCHAR(120) NOT NULL, is_active BOOLEAN, created_at DATETIME,
+    PRIMARY KEY (id), UNIQUE (email)
+);
+CREATE TABLE grant_application (
+    id INTEGER NOT NULL, reference_code VARCHAR(20) NOT NULL, submitter_name VARCHAR(100) NOT NULL,
+    candidate_full_name VARCHAR(100) NOT NULL, grant_type VARCHAR(24) NOT NULL, date DATE NOT NULL,
+    place VARCHAR(200) NOT NULL, amount_requested FLOAT NOT NULL, currency VARCHAR(10), description TEXT,
+    created_at DATETIME, voting_deadline DATETIME NOT NULL, is_active BOOLEAN,
+    PRIMARY KEY (id), UNIQUE (reference_code)
+);
+CREATE TABLE vote (
+    id INTEGER NOT NULL, application_id INTEGER NOT NULL, voter_id INTEGER NOT NULL,
+    vote_type VARCHAR(6) NOT NULL, rejection_reason TEXT, token VARCHAR(64) NOT NULL, voted_at DATETIME,
+    PRIMARY KEY (id), FOREIGN KEY(application_id) REFERENCES grant_application (id),
+    FOREIGN KEY(voter_id) REFERENCES voting_member (id), UNIQUE (token)
+);
+CREATE TABLE comment (
+    id INTEGER NOT NULL, application_id INTEGER NOT NULL, voter_id INTEGER NOT NULL,
+    parent_comment_id INTEGER, content TEXT NOT NULL, is_supportive BOOLEAN, created_at DATETIME,
+    PRIMARY KEY (id), FOREIGN KEY(application_id) REFERENCES grant_application (id),
+    FOREIGN KEY(voter_id) REFERENCES voting_member (id), FOREIGN KEY(parent_comment_id) REFERENCES comment (id)
+);
+"""
+
+
+@pytest.fixture
+def legacy_app(tmp_path):
+    path = tmp_path / 'legacy.db'
+    created = datetime(2024, 5, 1, 12, 0)
+    deadline = datetime.utcnow() + timedelta(days=7)
+    with sqlite3.connect(path) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.executemany('INSERT INTO voting_member VALUES (?, ?, ?, ?, 1, ?)',
+                         [(i, f'Member {i}', 'MC Member', f'member{i}@example.com', created) for i in (1, 2)])
+        conn.execute("INSERT INTO grant_application VALUES (1, 'CA000001', 'Submitter', 'Candidate', 'STSM', "
+                     "'2024-06-01', 'Porto', 1200.0, 'EUR', 'Short term mission', ?, ?, 1)", (created, deadline))
+        conn.executemany('INSERT INTO vote VALUES (?, 1, ?, ?, ?, ?, ?)', [
+            (1, 1, 'ACCEPT', None, 'token-1', created),
+            (2, 2, 'REJECT', 'Out of scope', 'token-2', created),
+        ])
+        conn.execute("INSERT INTO comment VALUES (1, 1, 1, NULL, 'Looks good', 1, ?)", (created,))
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'DEADLINE_SCHEDULER_ENABLED': False,
+        'RATE_LIMIT_ENABLED': False,
+        'MAIL_DISPATCH_WORKERS': 0
+    })
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_upgrade_backfills_existing_rows(legacy_app):
+    result = legacy_app.test_cli_runner().invoke(args=['upgrade-db'])
+    assert result.exit_code == 0, result.output
+    assert 'added column vote.state' in result.output and 'vote.vote_type allows NULL' in result.output
+
+    with legacy_app.app_context():
+        votes = db.session.scalars(db.select(Vote).order_by(Vote.id)).all()
+        assert [vote.state for vote in votes] == [BallotState.CAST, BallotState.CAST]
+        assert [vote.version for vote in votes] == [0, 0]
+        assert [vote.delivery_status for vote in votes] == ['sent', 'sent']
+        application = db.session.get(GrantApplication, 1)
+        assert application.updated_at == application.created_at
+        assert application.reminders_sent == 0 and application.outcome is None
+
+    client = legacy_app.test_client()
+    assert client.get('/api/results/1').json['summary'] == {
+        'accept': 1, 'reject': 1, 'pending': 0, 'total_voters': 2, 'voted': 2
+    }
+    assert client.get('/api/search?q=scope').json['results'][0]['kind'] == 'rejection'
+    response = client.post('/api/applications', json={
+        'submitter_name': 'Submitter', 'candidate_full_name': 'New candidate', 'grant_type': 'STSM',
+        'date': '2025-06-01', 'place': 'Osijek', 'amount_requested': 900,
+        'voting_deadline': (datetime.utcnow() + timedelta(days=7)).strftime('%Y-%m-%d %H:%M')
+    })
+    assert response.status_code == 200, response.json
+    assert client.get(f"/api/applications/{response.json['id']}").json['vote_summary']['pending'] == 2
+
+
+def test_upgrade_twice_changes_nothing(legacy_app):
+    with legacy_app.app_context():
+        assert upgrade_schema()
+        assert upgrade_schema() == []
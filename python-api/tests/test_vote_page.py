@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta
+
+from app import db, GrantApplication
+
+
+def test_revalidation_sees_a_new_vote(app, client, application):
+    application_id, tokens = application
+    token = next(iter(tokens.values()))
+    with app.app_context():
+        earlier = datetime.utcnow() - timedelta(hours=1)
+        db.session.execute(db.update(GrantApplication).where(GrantApplication.id == application_id)
+                           .values(created_at=earlier, updated_at=earlier))
+        db.session.commit()
+
+    page = client.get(f'/vote/{token}')
+    by_date = {'If-Modified-Since': page.headers['Last-Modified']}
+    by_tag = {'If-None-Match': page.headers['ETag']}
+    assert client.get(f'/vote/{token}', headers=by_date).status_code == 304
+    assert client.get(f'/vote/{token}', headers=by_tag).status_code == 304
+
+    client.post(f'/api/vote/{token}', data={'vote_type': 'accept'})
+    assert client.get(f'/vote/{token}', headers=by_date).status_code == 200
+    assert client.get(f'/vote/{token}', headers=by_tag).status_code == 200
@@ -0,0 +1,83 @@
+import threading
+
+from app import db, check_tallies, VoteChange, VoteType
+
+
+def changes(app, application_id):
+    with app.app_context():
+        return db.session.scalars(db.select(VoteChange).where(VoteChange.application_id == application_id)
+                                  .order_by(VoteChange.id)).all()
+
+
+def test_stale_version_is_refused(app, client, application):
+    application_id, tokens = application
+    token = next(iter(tokens.values()))
+    assert client.post(f'/api/vote/{token}', data={'vote_type': 'accept'}).json['version'] == 1
+
+    first = client.post(f'/api/vote/{token}', data={'vote_type': 'reject', 'rejection_reason': 'Budget',
+                                                    'version': 1})
+    second = client.post(f'/api/vote/{token}', data={'vote_type': 'accept', 'version': 1})
+    assert (first.status_code, second.status_code) == (200, 409)
+    assert second.json['version'] == 2
+    assert [change.vote_type for change in changes(app, application_id)] == [VoteType.ACCEPT, VoteType.REJECT]
+
+
+def test_concurrent_stale_versions_apply_once(app, client, application):
+    application_id, tokens = application
+    token = next(iter(tokens.values()))
+    client.post(f'/api/vote/{token}', data={'vote_type': 'accept'})
+
+    barrier = threading.Barrier(2)
+    statuses = []
+
+    def submit(form):
+        barrier.wait()
+        statuses.append(app.test_client().post(f'/api/vote/{token}', data={**form, 'version': 1}).status_code)
+
+    threads = [threading.Thread(target=submit, args=(form,))
+               for form in ({'vote_type': 'reject', 'rejection_reason': 'Budget'}, {'vote_type': 'accept'})]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [200, 409]
+    assert [change.version for change in changes(app, application_id)] == [1, 2]
+    with app.app_context():
+        assert check_tallies() == []
+
+
+def test_replay_records_the_vote_once(app, client, application):
+    application_id, tokens = application
+    token = next(iter(tokens.values()))
+    headers = {'Idempotency-Key': 'submit-1'}
+    first = client.post(f'/api/vote/{token}', data={'vote_type': 'accept'}, headers=headers)
+    replay = client.post(f'/api/vote/{token}', data={'vote_type': 'accept'}, headers=headers)
+
+    assert 'Idempotent-Replayed' not in first.headers
+    assert replay.headers['Idempotent-Replayed'] == 'true'
+    assert replay.json == first.json
+    assert len(changes(app, application_id)) == 1
+    assert client.get(f'/api/results/{application_id}').json['summary']['accept'] == 1
+
+    reused = client.post(f'/api/vote/{token}', data={'vote_type': 'reject', 'rejection_reason': 'Budget'},
+                         headers=headers)
+    assert reused.status_code == 422
+
+
+def test_tally_follows_a_changed_vote(app, client, application):
+    application_id, tokens = application
+    first, second, _ = tokens.values()
+    client.post(f'/api/vote/{first}', data={'vote_type': 'accept'})
+    client.post(f'/api/vote/{second}', data={'vote_type': 'accept'})
+    assert client.post(f'/api/vote/{first}', data={'vote_type': 'reject', 'rejection_reason': 'Budget'}).json == {
+        'message': 'Vote submitted successfully', 'vote': VoteType.REJECT.value, 'version': 2
+    }
+
+    assert client.get(f'/api/results/{application_id}').json['summary'] == {
+        'accept': 1, 'reject': 1, 'pending': 1, 'total_voters': 3, 'voted': 2
+    }
+    change = changes(app, application_id)[-1]
+    assert (change.previous_vote_type, change.vote_type) == (VoteType.ACCEPT, VoteType.REJECT)
+    with app.app_context():
+        assert check_tallies() == []